@@ -0,0 +1,97 @@
+"""Benchmark do aplicador de correções em documentos densos em correções
+
+Compara a aplicação sequencial antiga (_apply_correction_ultra_precise, uma
+reescrita por correção) com o CorrectionApplier (uma reescrita por parágrafo).
+
+Uso: python benchmarks/bench_correction_applier.py [--paragraphs N] [--density D]
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from src.core.document_processor import DocumentProcessor
+from src.core.correction_applier import CorrectionApplier
+
+# Pares (correto, erro) usados para sujar o texto sintético
+ERROR_PAIRS = [
+    ('você', 'voce'), ('também', 'tambem'), ('não', 'nao'), ('para', 'pra'),
+    ('até', 'ate'), ('página', 'pagina'), ('exercício', 'exercicio'),
+    ('história', 'historia'), ('países', 'paises'), ('está', 'esta'),
+]
+FILLER = ('o aluno leu o texto com atenção e respondeu as perguntas sobre a '
+          'leitura feita em sala de aula junto com os colegas da turma').split()
+
+
+def make_paragraphs(count, density, seed=0):
+    """Gera parágrafos com `density` correções cada"""
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(60)]
+        corrections = []
+        for pos, (right, wrong) in zip(rng.sample(range(len(words)), density),
+                                       rng.sample(ERROR_PAIRS, density)):
+            words[pos] = wrong
+            corrections.append({'error': wrong, 'correction': right, 'type': 'ortografia'})
+        paragraphs.append((' '.join(words) + '.', corrections))
+    return paragraphs
+
+
+def bench_sequential(processor, paragraphs):
+    """Uma chamada (e uma reescrita do parágrafo) por correção"""
+    doc = Document()
+    items = [(doc.add_paragraph(text), corrections) for text, corrections in paragraphs]
+    applied = 0
+    start = time.perf_counter()
+    for number, (paragraph, corrections) in enumerate(items):
+        para_data = {'paragraph_obj': paragraph, 'paragraph_number': number}
+        for corr in corrections:
+            applied += processor._apply_correction_ultra_precise(para_data, corr)
+    return time.perf_counter() - start, applied
+
+
+def bench_batched(paragraphs):
+    """Uma varredura e uma reescrita por parágrafo"""
+    doc = Document()
+    items = [(doc.add_paragraph(text), corrections) for text, corrections in paragraphs]
+    applied = 0
+    start = time.perf_counter()
+    for paragraph, corrections in items:
+        new_text, done, _ = CorrectionApplier.apply(paragraph.text, corrections)
+        if done:
+            paragraph.text = new_text
+        applied += len(done)
+    return time.perf_counter() - start, applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=5000)
+    parser.add_argument('--density', type=int, default=8, help='correções por parágrafo (máx. 10)')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    paragraphs = make_paragraphs(args.paragraphs, min(args.density, len(ERROR_PAIRS)))
+    processor = DocumentProcessor('')
+
+    seq_time, seq_applied = bench_sequential(processor, paragraphs)
+    batch_time, batch_applied = bench_batched(paragraphs)
+
+    print(json.dumps({
+        'paragraphs': args.paragraphs,
+        'corrections_per_paragraph': args.density,
+        'sequential': {'seconds': round(seq_time, 4), 'applied': seq_applied},
+        'batched': {'seconds': round(batch_time, 4), 'applied': batch_applied},
+        'speedup': round(seq_time / batch_time, 2) if batch_time else None
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""Benchmark das etapas locais do pipeline em documentos sintéticos
+
+Mede, com a API simulada, process_document, _create_precise_blocks, a
+aplicação de correções (sequencial antiga e CorrectionApplier), doc.save e
+create_mirror_comparison. Cada etapa roda em um processo próprio para que o
+pico de memória (RSS) seja dela; o resultado é gravado em JSON para comparar
+commits.
+
+Uso: python benchmarks/bench_pipeline.py [--paragraphs N] [--tables T] [--images I]
+     [--density D] [--repeat R] [--stages a,b] [-o resultado.json]
+     python benchmarks/bench_pipeline.py --compare antes.json depois.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from docx import Document
+from src.core.document_processor import DocumentProcessor
+from src.core.document_comparer import DocumentComparer
+from src.core.correction_applier import CorrectionApplier
+
+from synthetic import write_document, find_errors
+
+
+def mock_identify_errors(block_text, block_idx):
+    """API simulada: devolve as correções conhecidas do texto sintético"""
+    corrections = []
+    for line in block_text.split('\n'):
+        if not line.startswith('#'):
+            continue
+        head, _, text = line.partition(' ')
+        for corr in find_errors(text):
+            corr['paragraph'] = int(head[1:-1])
+            corrections.append(corr)
+    return corrections
+
+
+def collect_paragraphs(doc):
+    """Estrutura de parágrafos no formato usado por process_document"""
+    all_paragraphs = []
+    paragraphs = [p for p in doc.paragraphs if p.text.strip()]
+    paragraphs += [p for table in doc.tables for row in table.rows
+                   for cell in row.cells for p in cell.paragraphs if p.text.strip()]
+    for number, para in enumerate(paragraphs, 1):
+        all_paragraphs.append({
+            'global_index': number - 1,
+            'paragraph_number': number,
+            'doc_index': number - 1,
+            'original_text': para.text,
+            'current_text': para.text,
+            'paragraph_obj': para,
+            'type': 'normal',
+            'location': f'Parágrafo {number}',
+            'page_estimate': number // 3
+        })
+    return all_paragraphs
+
+
+def new_processor():
+    processor = DocumentProcessor('')
+    processor.api_client.identify_errors_precise = mock_identify_errors
+    return processor
+
+
+def stage_process_document(paths):
+    processor = new_processor()
+    start = time.perf_counter()
+    processor.process_document(paths['original'], os.path.join(paths['workdir'], 'processado.docx'))
+    return time.perf_counter() - start
+
+
+def stage_create_blocks(paths):
+    processor = new_processor()
+    all_paragraphs = collect_paragraphs(Document(paths['original']))
+    start = time.perf_counter()
+    processor._create_precise_blocks(all_paragraphs)
+    return time.perf_counter() - start
+
+
+def stage_apply_sequential(paths):
+    processor = new_processor()
+    items = [(p, find_errors(p['current_text'])) for p in collect_paragraphs(Document(paths['original']))]
+    start = time.perf_counter()
+    for para_data, corrections in items:
+        for corr in corrections:
+            processor._apply_correction_ultra_precise(para_data, corr)
+    return time.perf_counter() - start
+
+
+def stage_apply_batched(paths):
+    items = [(p['paragraph_obj'], find_errors(p['current_text']))
+             for p in collect_paragraphs(Document(paths['original']))]
+    start = time.perf_counter()
+    for paragraph, corrections in items:
+        new_text, applied, _ = CorrectionApplier.apply(paragraph.text, corrections)
+        if applied:
+            paragraph.text = new_text
+    return time.perf_counter() - start
+
+
+def stage_save(paths):
+    doc = Document(paths['original'])
+    start = time.perf_counter()
+    doc.save(os.path.join(paths['workdir'], 'salvo.docx'))
+    return time.perf_counter() - start
+
+
+def stage_mirror_comparison(paths):
+    comparer = DocumentComparer()
+    start = time.perf_counter()
+    comparer.create_mirror_comparison(paths['original'], paths['revised'],
+                                      os.path.join(paths['workdir'], 'comparacao.docx'))
+    return time.perf_counter() - start
+
+
+STAGES = {
+    'process_document': stage_process_document,
+    'create_precise_blocks': stage_create_blocks,
+    'apply_sequential': stage_apply_sequential,
+    'apply_batched': stage_apply_batched,
+    'save': stage_save,
+    'mirror_comparison': stage_mirror_comparison,
+}
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo atual (None sem o módulo resource)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_stage(name, paths, repeat):
+    """Executa a etapa `repeat` vezes dentro do processo filho"""
+    logging.disable(logging.CRITICAL)
+    baseline = peak_rss_mb()
+    times = [STAGES[name](paths) for _ in range(repeat)]
+    return {
+        'seconds_min': round(min(times), 4),
+        'seconds_median': round(statistics.median(times), 4),
+        'runs': repeat,
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path):
+    """Imprime a variação de tempo e memória por etapa entre dois resultados"""
+    with open(before_path, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(after_path, encoding='utf-8') as f:
+        after = json.load(f)
+
+    print(f"{'etapa':<24}{'antes (s)':>12}{'depois (s)':>12}{'razão':>8}{'RSS antes':>12}{'RSS depois':>12}")
+    for name, result in after['stages'].items():
+        old = before['stages'].get(name)
+        if not old:
+            continue
+        ratio = result['seconds_min'] / old['seconds_min'] if old['seconds_min'] else float('nan')
+        print(f"{name:<24}{old['seconds_min']:>12.4f}{result['seconds_min']:>12.4f}{ratio:>8.2f}"
+              f"{str(old['peak_rss_mb']):>12}{str(result['peak_rss_mb']):>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=1000)
+    parser.add_argument('--tables', type=int, default=10)
+    parser.add_argument('--images', type=int, default=5)
+    parser.add_argument('--density', type=float, default=1.0, help='erros por parágrafo')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', help=f"etapas separadas por vírgula ({','.join(STAGES)})")
+    parser.add_argument('-o', '--output', help='arquivo JSON de resultado')
+    parser.add_argument('--compare', nargs=2, metavar=('ANTES', 'DEPOIS'))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    stages = args.stages.split(',') if args.stages else list(STAGES)
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"etapa(s) desconhecida(s): {', '.join(unknown)}")
+
+    params = {'paragraphs': args.paragraphs, 'tables': args.tables, 'images': args.images,
+              'density': args.density, 'seed': args.seed}
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = {
+            'workdir': workdir,
+            'original': write_document(os.path.join(workdir, 'original.docx'), **params),
+            'revised': write_document(os.path.join(workdir, 'revisado.docx'), with_errors=False, **params)
+        }
+        for name in stages:
+            # Processo novo por etapa: o pico de RSS não herda o das anteriores
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                results[name] = pool.submit(run_stage, name, paths, args.repeat).result()
+            print(f"{name}: {results[name]['seconds_min']:.4f}s "
+                  f"(pico {results[name]['peak_rss_mb']} MB)", file=sys.stderr)
+
+    output = json.dumps({
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': params,
+        'stages': results
+    }, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
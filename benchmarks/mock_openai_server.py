@@ -0,0 +1,249 @@
+"""Servidor local que imita o endpoint de chat completion da OpenAI
+
+Aceita o mesmo formato de requisição de /v1/chat/completions e responde no
+mesmo formato, com latência sorteada de uma distribuição configurável, taxas
+de erro 500 e 429 (com Retry-After) e respostas com JSON malformado. As
+correções são derivadas do texto enviado (erros conhecidos dos documentos
+sintéticos), então a mesma entrada sempre gera a mesma resposta.
+
+Para apontar o revisor para o servidor, use em config.json:
+    "api_base": "http://127.0.0.1:8765/v1"
+
+GET /stats devolve contadores (requisições, erros, concorrência máxima).
+
+Uso: python benchmarks/mock_openai_server.py [--port 8765] [--latency lognormal]
+     [--latency-mean 0.8] [--latency-sigma 0.5] [--error-rate 0.02]
+     [--rate-limit-rate 0.05] [--malformed-rate 0.01] [--seed 0]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import math
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.tokens import estimate_tokens
+
+from synthetic import find_errors
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal')
+
+
+class MockBehavior:
+    """Parâmetros de latência/falhas e contadores do servidor simulado"""
+
+    def __init__(self, latency: str = 'lognormal', latency_mean: float = 0.8, latency_sigma: float = 0.5,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, malformed_rate: float = 0.0,
+                 retry_after: float = 1.0, seed: int = 0):
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0, 'malformed': 0,
+                      'in_flight': 0, 'max_in_flight': 0, 'connections': 0}
+
+    def draw(self):
+        """Sorteia (latência, desfecho) de uma requisição"""
+        with self._lock:
+            if self.latency == 'fixed':
+                delay = self.latency_mean
+            elif self.latency == 'uniform':
+                delay = self._rng.uniform(0, 2 * self.latency_mean)
+            else:
+                # Média da lognormal igual a latency_mean
+                mu = math.log(max(self.latency_mean, 1e-6)) - self.latency_sigma ** 2 / 2
+                delay = self._rng.lognormvariate(mu, self.latency_sigma)
+
+            roll = self._rng.random()
+            if roll < self.rate_limit_rate:
+                outcome = 'rate_limited'
+            elif roll < self.rate_limit_rate + self.error_rate:
+                outcome = 'errors'
+            elif roll < self.rate_limit_rate + self.error_rate + self.malformed_rate:
+                outcome = 'malformed'
+            else:
+                outcome = 'ok'
+        return delay, outcome
+
+    def connected(self):
+        with self._lock:
+            self.stats['connections'] += 1
+
+    def enter(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['in_flight'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+
+    def leave(self, outcome: str):
+        with self._lock:
+            self.stats['in_flight'] -= 1
+            self.stats[outcome] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+def build_corrections(user_text: str):
+    """Correções determinísticas a partir do texto enviado
+
+    Entende o formato compacto dos blocos ("#<id><tipo> texto") e o numerado
+    ("<n>: texto"), respondendo com "paragraph" ou "line" conforme o caso.
+    """
+    corrections = []
+    for number, line in enumerate(user_text.split('\n'), 1):
+        key, ref, text = 'line', number, line
+        head, _, rest = line.partition(' ')
+        if head.startswith('#') and head[1:-1].isdigit():
+            key, ref, text = 'paragraph', int(head[1:-1]), rest
+        elif head.endswith(':') and head[:-1].isdigit():
+            ref, text = int(head[:-1]), rest
+        for corr in find_errors(text):
+            corr[key] = ref
+            corrections.append(corr)
+    return corrections
+
+
+def completion_body(request: dict, content: str) -> dict:
+    """Resposta no formato de chat.completion"""
+    prompt_tokens = sum(estimate_tokens(m.get('content') or '') for m in request.get('messages', []))
+    completion_tokens = estimate_tokens(content)
+    return {
+        'id': f'chatcmpl-mock-{uuid.uuid4().hex[:12]}',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': request.get('model', 'mock'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content},
+            'finish_reason': 'stop'
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Atende /v1/chat/completions e /stats"""
+
+    # Mantém a conexão aberta entre requisições, como a API real
+    protocol_version = 'HTTP/1.1'
+    behavior = MockBehavior()
+    quiet = False
+
+    def setup(self):
+        super().setup()
+        self.behavior.connected()
+
+    def _send_json(self, status: int, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str, error_type: str, headers=None):
+        self._send_json(status, {'error': {'message': message, 'type': error_type,
+                                           'param': None, 'code': None}}, headers)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.behavior.snapshot())
+        else:
+            self._send_error(404, f'Caminho desconhecido: {self.path}', 'invalid_request_error')
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_error(404, f'Caminho desconhecido: {self.path}', 'invalid_request_error')
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send_error(400, 'Corpo da requisição não é JSON', 'invalid_request_error')
+            return
+
+        behavior = self.behavior
+        delay, outcome = behavior.draw()
+        behavior.enter()
+        try:
+            time.sleep(delay)
+            if outcome == 'rate_limited':
+                self._send_error(429, 'Rate limit reached (simulado)', 'requests',
+                                 {'Retry-After': str(behavior.retry_after)})
+            elif outcome == 'errors':
+                self._send_error(500, 'Erro interno simulado', 'server_error')
+            else:
+                user_text = '\n'.join(m.get('content') or '' for m in request.get('messages', [])
+                                      if m.get('role') == 'user')
+                content = json.dumps({'corrections': build_corrections(user_text)}, ensure_ascii=False)
+                if outcome == 'malformed':
+                    content = content[:max(1, len(content) // 2)]  # JSON cortado ao meio
+                self._send_json(200, completion_body(request, content))
+        finally:
+            behavior.leave(outcome)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def create_server(host: str = '127.0.0.1', port: int = 8765, behavior: MockBehavior = None,
+                  quiet: bool = False) -> ThreadingHTTPServer:
+    """Cria o servidor (port=0 escolhe uma porta livre) sem iniciá-lo"""
+    handler = type('ConfiguredMockHandler', (MockHandler,),
+                   {'behavior': behavior or MockBehavior(), 'quiet': quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--latency-mean', type=float, default=0.8, help='segundos')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='desvio da lognormal')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fração de respostas 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fração de respostas 429')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='fração com JSON malformado')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='cabeçalho Retry-After dos 429')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args()
+
+    behavior = MockBehavior(args.latency, args.latency_mean, args.latency_sigma, args.error_rate,
+                            args.rate_limit_rate, args.malformed_rate, args.retry_after, args.seed)
+    server = create_server(args.host, args.port, behavior, args.quiet)
+    print(f"Servidor simulado em http://{args.host}:{server.server_address[1]}/v1", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(behavior.snapshot()), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
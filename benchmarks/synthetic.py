@@ -0,0 +1,116 @@
+"""Gerador de documentos .docx sintéticos para os benchmarks
+
+Gera N parágrafos, tabelas com células mescladas e imagens, com uma
+quantidade configurável de erros por parágrafo. Com a mesma semente, a versão
+sem erros (with_errors=False) tem exatamente a mesma estrutura e serve como
+"documento revisado" nas comparações.
+
+Uso: python benchmarks/synthetic.py saida.docx [--paragraphs N] [--tables T]
+     [--images I] [--density D] [--seed S] [--clean]
+"""
+import io
+import re
+import zlib
+import struct
+import random
+import argparse
+
+from docx import Document
+from docx.shared import Inches
+
+from bench_correction_applier import ERROR_PAIRS, FILLER
+
+WRONG_TO_RIGHT = {wrong: right for right, wrong in ERROR_PAIRS}
+ERROR_PATTERN = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(w) for w in WRONG_TO_RIGHT) + r')(?!\w)')
+
+
+def _png(width: int = 64, height: int = 48) -> bytes:
+    """PNG RGB de cor sólida, sem depender de bibliotecas de imagem"""
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    raw = b''.join(b'\x00' + b'\x30\x60\x90' * width for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(raw)) +
+            chunk(b'IEND', b''))
+
+
+def _sentence(rng: random.Random, words: int, errors: int, with_errors: bool) -> str:
+    """Texto de enchimento com `errors` palavras trocadas pela forma errada"""
+    text = [rng.choice(FILLER) for _ in range(words)]
+    for pos, (right, wrong) in zip(rng.sample(range(words), min(errors, words)),
+                                   rng.sample(ERROR_PAIRS, min(errors, len(ERROR_PAIRS)))):
+        text[pos] = wrong if with_errors else right
+    return ' '.join(text).capitalize() + '.'
+
+
+def _error_count(rng: random.Random, density: float) -> int:
+    """Parte inteira da densidade mais um sorteio para a parte fracionária"""
+    count = int(density)
+    return count + (rng.random() < density - count)
+
+
+def build_document(paragraphs: int = 200, tables: int = 5, images: int = 3,
+                   density: float = 1.0, seed: int = 0, with_errors: bool = True) -> Document:
+    """Monta o documento sintético
+
+    density: média de erros por parágrafo (ou célula de tabela).
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    image = _png()
+    slots = paragraphs + 1
+    table_at = {slots * (i + 1) // (tables + 1) for i in range(tables)}
+    image_at = {slots * (i + 1) // (images + 1) + 1 for i in range(images)}
+
+    for index in range(paragraphs):
+        if index in table_at:
+            table = doc.add_table(rows=4, cols=3)
+            table.style = 'Table Grid'
+            # Cabeçalho com as duas primeiras células mescladas
+            table.cell(0, 0).merge(table.cell(0, 1))
+            for row in table.rows:
+                for cell in row.cells:
+                    if not cell.text:
+                        cell.text = _sentence(rng, 8, _error_count(rng, density), with_errors)
+        if index in image_at:
+            doc.add_picture(io.BytesIO(image), width=Inches(2))
+        if index % 25 == 0:
+            doc.add_heading(f'Capítulo {index // 25 + 1}', level=1)
+        doc.add_paragraph(_sentence(rng, rng.randint(20, 80), _error_count(rng, density), with_errors))
+
+    return doc
+
+
+def write_document(path: str, **kwargs) -> str:
+    """Gera e salva o documento sintético"""
+    build_document(**kwargs).save(path)
+    return path
+
+
+def find_errors(text: str):
+    """Correções esperadas para um texto gerado (usadas pela API simulada)"""
+    return [{'error': match.group(0), 'correction': WRONG_TO_RIGHT[match.group(0)], 'type': 'ortografia'}
+            for match in ERROR_PATTERN.finditer(text)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output')
+    parser.add_argument('--paragraphs', type=int, default=200)
+    parser.add_argument('--tables', type=int, default=5)
+    parser.add_argument('--images', type=int, default=3)
+    parser.add_argument('--density', type=float, default=1.0, help='erros por parágrafo')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--clean', action='store_true', help='gera a versão sem erros')
+    args = parser.parse_args()
+
+    write_document(args.output, paragraphs=args.paragraphs, tables=args.tables, images=args.images,
+                   density=args.density, seed=args.seed, with_errors=not args.clean)
+    print(args.output)
+
+
+if __name__ == '__main__':
+    main()
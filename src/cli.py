@@ -0,0 +1,184 @@
+import sys
+import os
+import json
+import signal
+import argparse
+import logging
+from datetime import datetime
+
+# Adiciona diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.document_processor import DocumentProcessor
+from src.core.document_comparer import DocumentComparer
+from src.core.spell_filter import SpellPreFilter
+from src.utils.config import Config
+from src.utils.logging_setup import setup_logging
+from src.utils.profiling import setup_profiling
+from src.utils.processing_control import ProcessingControl
+from src.utils.history import RevisionHistory
+from src.core.planner import plan_documents, format_plan
+
+COMPARISON_CHOICES = ('docx', 'html', 'json')
+
+
+def parse_args(argv=None):
+    """Lê argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(
+        description="Revisor de Documentos Word (modo sem interface gráfica)"
+    )
+    parser.add_argument("input", nargs='+', help="Documento .docx a revisar (vários com --dry-run)")
+    parser.add_argument("-o", "--output", help="Caminho do documento revisado")
+    parser.add_argument(
+        "-c", "--comparison",
+        help="Formatos da comparação separados por vírgula (docx,html,json). "
+             "Padrão: comparison_formats do config.json"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Só simula: lê os documentos, monta os blocos e estima tokens, custo e tempo, sem chamar a API"
+    )
+    parser.add_argument("--plan-json", help="Grava o plano da simulação em JSON neste caminho")
+    parser.add_argument(
+        "--concurrency", type=int,
+        help="Documentos em paralelo na duração prevista. Padrão: max_concurrent_documents do config.json"
+    )
+    return parser.parse_args(argv)
+
+
+def parse_formats(value, default):
+    """Converte a lista de formatos recebida na linha de comando"""
+    if not value:
+        return list(default)
+    formats = [f.strip().lower() for f in value.split(',') if f.strip()]
+    invalid = [f for f in formats if f not in COMPARISON_CHOICES]
+    if invalid:
+        raise ValueError(f"Formato(s) de comparação inválido(s): {', '.join(invalid)}")
+    return formats
+
+
+def install_cancel_handler(control: ProcessingControl):
+    """Primeiro Ctrl+C cancela salvando o resultado parcial; o segundo interrompe"""
+    def handler(signum, frame):
+        logging.getLogger(__name__).warning("Cancelando... (Ctrl+C novamente para interromper)")
+        control.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGINT, handler)
+
+
+def create_processor(config: Config) -> DocumentProcessor:
+    return DocumentProcessor(config.API_KEY, config.MODEL,
+                             spell_filter=SpellPreFilter.from_config(config.PREFILTER),
+                             propagation=config.PROPAGATION,
+                             near_duplicates=config.NEAR_DUPLICATES,
+                             api_base=config.API_BASE,
+                             metrics=config.METRICS,
+                             cost=config.COST)
+
+
+def dry_run(args, config: Config) -> int:
+    """Plano da revisão sem chamadas à API"""
+    logger = logging.getLogger(__name__)
+    invalid = [path for path in args.input if not path.endswith('.docx') or not os.path.exists(path)]
+    if invalid:
+        logger.error(f"Arquivo(s) inválido(s): {', '.join(invalid)}")
+        return 1
+
+    history = RevisionHistory.from_config(config.HISTORY, config.OUTPUT_PATHS)
+    rates = history.usage_rates()
+    history.close()
+
+    processor = create_processor(config)
+    plan = plan_documents(
+        processor, args.input, rates,
+        args.concurrency or config.MAX_CONCURRENT_DOCUMENTS,
+        callback=lambda current, total, status: logger.info(f"Simulação {current}/{total}: {status}")
+    )
+    processor.close()
+    print(format_plan(plan))
+    if args.plan_json:
+        with open(args.plan_json, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, ensure_ascii=False, indent=2)
+        logger.info(f"Plano gravado em {args.plan_json}")
+    return 1 if any('error' in doc for doc in plan['documents']) else 0
+
+
+def main(argv=None):
+    """Função principal do modo linha de comando"""
+    args = parse_args(argv)
+    setup_logging()
+    setup_profiling()
+    config = Config()
+    logger = logging.getLogger(__name__)
+
+    if args.dry_run:
+        return dry_run(args, config)
+
+    if len(args.input) > 1:
+        logger.error("Vários documentos só com --dry-run; para revisar, informe um documento por vez")
+        return 1
+    args.input = args.input[0]
+
+    if not config.API_KEY:
+        logger.error("API Key não configurada em config.json")
+        return 1
+
+    if not args.input.endswith('.docx') or not os.path.exists(args.input):
+        logger.error(f"Arquivo inválido: {args.input}")
+        return 1
+
+    try:
+        formats = parse_formats(args.comparison, config.COMPARISON_FORMATS)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_name = os.path.splitext(os.path.basename(args.input))[0]
+    output_path = args.output or os.path.join(
+        config.OUTPUT_PATHS["revised"], f"{base_name}_revisado_{timestamp}.docx"
+    )
+
+    def callback(current, total, status):
+        live = processor.metrics.live()
+        eta = f", restante ~{int(live['eta'])}s" if live['eta'] is not None else ""
+        logger.info(f"{status} ({current}/{total}, {live['chars_per_second']:.0f} car/s, "
+                    f"{live['requests_per_minute']:.1f} req/min, {live['retries']} novas tentativas{eta})")
+
+    processor = create_processor(config)
+    # Aberto antes do processamento: na criação do banco, a importação da pasta
+    # de revisados não deve incluir o documento desta execução
+    history = RevisionHistory.from_config(config.HISTORY, config.OUTPUT_PATHS)
+    processor.rates = history.usage_rates()
+    control = ProcessingControl()
+    install_cancel_handler(control)
+    processor.process_document(
+        args.input, output_path, callback,
+        report_formats=[f for f in formats if f != 'docx'],
+        control=control
+    )
+
+    comparison_path = None
+    if 'docx' in formats and not control.cancelled:
+        comparison_path = os.path.join(
+            config.OUTPUT_PATHS["comparisons"], f"{base_name}_comparacao_{timestamp}.docx"
+        )
+        with processor.metrics.stage('compare'):
+            DocumentComparer().compare_documents(args.input, output_path, comparison_path)
+        processor.metrics.save()
+
+    history.add(output_path, os.path.abspath(args.input), comparison_path=comparison_path,
+                **(processor.last_run or {}))
+    history.close()
+    processor.close()
+
+    if control.cancelled:
+        logger.warning(f"Processamento cancelado; resultado parcial: {output_path}")
+        return 130
+
+    logger.info(f"Documento revisado: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
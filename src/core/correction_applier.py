@@ -0,0 +1,108 @@
+import re
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional
+
+
+@lru_cache(maxsize=4096)
+def _compile_error(error: str, strict: bool):
+    """Expressão para um trecho de erro (espaços internos flexíveis)"""
+    words = error.split()
+    body = r'\s+'.join(re.escape(w) for w in words)
+    if not strict:
+        return re.compile(body, re.IGNORECASE)
+    left = r'(?<!\w)' if re.match(r'\w', words[0]) else ''
+    right = r'(?!\w)' if re.search(r'\w$', words[-1]) else ''
+    return re.compile(f'{left}{body}{right}')
+
+
+class CorrectionApplier:
+    """Aplica todas as correções de um parágrafo em uma única reescrita
+
+    Cada trecho de erro é localizado primeiro por busca exata (str.find com
+    checagem de limite de palavra), depois por expressão com espaços flexíveis
+    e, por último, sem diferenciar maiúsculas. Os trechos são reservados em
+    ordem determinística (início, maior trecho, ordem da correção); uma
+    correção cujo trecho já foi reservado procura a próxima ocorrência. O texto
+    é reescrito uma só vez, então nenhuma correção desloca a posição de outra.
+    """
+
+    @staticmethod
+    def _is_word_boundary(text: str, start: int, end: int, error: str) -> bool:
+        """Verifica se o trecho não está colado em outra palavra"""
+        if error[0].isalnum() and start > 0 and text[start - 1].isalnum():
+            return False
+        if error[-1].isalnum() and end < len(text) and text[end].isalnum():
+            return False
+        return True
+
+    @staticmethod
+    def _find(text: str, error: str, start: int, strict: bool) -> Optional[Tuple[int, int]]:
+        """Próxima ocorrência do erro a partir de start"""
+        if strict:
+            pos = text.find(error, start)
+            while pos >= 0:
+                if CorrectionApplier._is_word_boundary(text, pos, pos + len(error), error):
+                    return pos, pos + len(error)
+                pos = text.find(error, pos + 1)
+        match = _compile_error(error, strict).search(text, start)
+        return match.span() if match else None
+
+    @staticmethod
+    def _locate(text: str, error: str) -> Tuple[Optional[Tuple[int, int]], bool]:
+        """Localiza o erro pela estratégia estrita e, sem sucesso, pela flexível"""
+        span = CorrectionApplier._find(text, error, 0, strict=True)
+        if span:
+            return span, True
+        return CorrectionApplier._find(text, error, 0, strict=False), False
+
+    @staticmethod
+    def _match_case(found: str, error: str, fix: str) -> str:
+        """Mantém a maiúscula inicial do texto quando o erro veio em minúscula"""
+        if found[:1].isupper() and error[:1].islower() and fix[:1].islower():
+            return fix[0].upper() + fix[1:]
+        return fix
+
+    @staticmethod
+    def apply(text: str, corrections: List[Dict]) -> Tuple[str, List[Dict], List[Dict]]:
+        """Aplica as correções ao texto
+
+        Retorna (novo_texto, aplicadas, não_aplicadas), preservando a ordem
+        original das correções nas listas.
+        """
+        candidates = []
+        for index, corr in enumerate(corrections):
+            error = corr.get('error', '').strip()
+            if not error or not corr.get('correction', ''):
+                continue
+            span, strict = CorrectionApplier._locate(text, error)
+            if span:
+                candidates.append((span, index, error, strict))
+
+        # Reserva trechos sem sobreposição em ordem determinística
+        candidates.sort(key=lambda c: (c[0][0], c[0][0] - c[0][1], c[1]))
+        chosen = []
+        for span, index, error, strict in candidates:
+            fix = corrections[index]['correction']
+            while span:
+                start, end = span
+                overlaps = any(start < c_end and c_start < end for c_start, c_end, _ in chosen)
+                if not overlaps and text[start:end] != fix:
+                    chosen.append((start, end, index))
+                    break
+                span = CorrectionApplier._find(text, error, start + 1, strict)
+
+        # Reescreve o texto uma única vez
+        chosen.sort()
+        pieces = []
+        pos = 0
+        for start, end, index in chosen:
+            pieces.append(text[pos:start])
+            pieces.append(CorrectionApplier._match_case(
+                text[start:end], corrections[index]['error'].strip(), corrections[index]['correction']))
+            pos = end
+        pieces.append(text[pos:])
+
+        applied_indexes = {index for _, _, index in chosen}
+        applied = [c for i, c in enumerate(corrections) if i in applied_indexes]
+        failed = [c for i, c in enumerate(corrections) if i not in applied_indexes]
+        return ''.join(pieces), applied, failed
@@ -0,0 +1,178 @@
+import os
+import json
+import html
+import logging
+import difflib
+from datetime import datetime
+from typing import List, Dict
+
+REPORT_FORMATS = ('html', 'json')
+
+_HTML_HEADER = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: "Segoe UI", Arial, sans-serif; background: #1e1e1e; color: #cccccc; margin: 24px; }}
+h1 {{ color: #ffffff; font-size: 18pt; }}
+.meta {{ color: #969696; margin-bottom: 16px; }}
+.change {{ border: 1px solid #3e3e42; border-radius: 4px; background: #252526; padding: 10px 14px; margin-bottom: 10px; }}
+.loc {{ color: #2196f3; font-weight: bold; }}
+.type {{ color: #ff9800; margin-left: 8px; }}
+.text {{ margin-top: 6px; line-height: 1.5; color: #ffffff; }}
+del {{ color: #f44336; }}
+ins {{ color: #4caf50; text-decoration: underline; }}
+.summary {{ border-top: 1px solid #3e3e42; margin-top: 24px; padding-top: 12px; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="meta">Original: {source}<br>Gerado em: {created}</div>
+<div class="legend"><del>texto removido</del> | <ins>texto adicionado</ins></div>
+"""
+
+_HTML_FOOTER = """<div class="summary">
+<strong>Total de parágrafos alterados: {total}</strong>
+<ul>
+{by_type}
+</ul>
+</div>
+</body>
+</html>
+"""
+
+
+def word_diff(original: str, revised: str) -> List[Dict]:
+    """Calcula diff palavra a palavra como lista de operações"""
+    orig_words = original.split()
+    rev_words = revised.split()
+
+    ops = []
+    s = difflib.SequenceMatcher(None, orig_words, rev_words, autojunk=False)
+    for tag, i1, i2, j1, j2 in s.get_opcodes():
+        if tag == 'equal':
+            ops.append({'op': 'equal', 'text': ' '.join(orig_words[i1:i2])})
+            continue
+        if i1 < i2:
+            ops.append({'op': 'delete', 'text': ' '.join(orig_words[i1:i2])})
+        if j1 < j2:
+            ops.append({'op': 'insert', 'text': ' '.join(rev_words[j1:j2])})
+    return ops
+
+
+def diff_to_html(ops: List[Dict]) -> str:
+    """Diff palavra a palavra em HTML (<del>/<ins>)"""
+    parts = []
+    for op in ops:
+        text = html.escape(op['text'])
+        if op['op'] == 'delete':
+            parts.append(f'<del>{text}</del>')
+        elif op['op'] == 'insert':
+            parts.append(f'<ins>{text}</ins>')
+        else:
+            parts.append(text)
+    return " ".join(parts)
+
+
+class DiffReportWriter:
+    """Grava relatório leve de alterações (HTML/JSON) de forma incremental
+
+    Cada parágrafo alterado é escrito no disco assim que é registrado; apenas
+    contadores ficam em memória, então o custo não cresce com o documento.
+    """
+
+    def __init__(self, base_path: str, formats=REPORT_FORMATS, source_path: str = ''):
+        self.logger = logging.getLogger(__name__)
+        self.formats = [f for f in formats if f in REPORT_FORMATS]
+        self.source_path = source_path
+        self.paths = {fmt: f"{base_path}_diff.{fmt}" for fmt in self.formats}
+        self.total = 0
+        self.by_type = {}
+        self._files = {}
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        """Abre os arquivos de saída e escreve os cabeçalhos"""
+        created = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        source = os.path.basename(self.source_path)
+
+        for fmt, path in self.paths.items():
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._files[fmt] = open(path, 'w', encoding='utf-8')
+
+        if 'html' in self._files:
+            self._files['html'].write(_HTML_HEADER.format(
+                title='Relatório de Alterações',
+                source=html.escape(source),
+                created=created
+            ))
+
+        if 'json' in self._files:
+            header = json.dumps({'source': source, 'created': created}, ensure_ascii=False)
+            # Abre o objeto sem fechá-lo para permitir escrita incremental
+            self._files['json'].write(header[:-1] + ', "changes": [\n')
+
+    def add_change(self, location: str, paragraph_number, page: int,
+                   original: str, revised: str, change_type: str = 'outros'):
+        """Registra um parágrafo alterado"""
+        if not self._files or original == revised:
+            return
+
+        ops = word_diff(original, revised)
+
+        if 'html' in self._files:
+            self._files['html'].write(self._render_html(location, page, change_type, ops))
+
+        if 'json' in self._files:
+            entry = {
+                'paragraph_number': paragraph_number,
+                'location': location,
+                'page': page,
+                'type': change_type,
+                'original_text': original,
+                'corrected_text': revised,
+                'diff': ops
+            }
+            separator = ',\n' if self.total else ''
+            self._files['json'].write(separator + json.dumps(entry, ensure_ascii=False))
+
+        self.total += 1
+        self.by_type[change_type] = self.by_type.get(change_type, 0) + 1
+
+    def close(self) -> Dict[str, str]:
+        """Escreve rodapés, fecha os arquivos e retorna os caminhos gerados"""
+        if not self._files:
+            return {}
+
+        if 'html' in self._files:
+            items = '\n'.join(
+                f'<li>{html.escape(tipo.capitalize())}: {count}</li>'
+                for tipo, count in sorted(self.by_type.items(), key=lambda x: x[1], reverse=True)
+            )
+            self._files['html'].write(_HTML_FOOTER.format(total=self.total, by_type=items))
+
+        if 'json' in self._files:
+            summary = json.dumps({'total_changes': self.total, 'by_type': self.by_type},
+                                 ensure_ascii=False)
+            self._files['json'].write(f'\n], "summary": {summary}}}\n')
+
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+        for path in self.paths.values():
+            self.logger.info(f"Relatório de alterações salvo: {path}")
+        return dict(self.paths)
+
+    def _render_html(self, location: str, page: int, change_type: str, ops: List[Dict]) -> str:
+        """Renderiza um parágrafo alterado com diff inline"""
+        return (f'<div class="change"><span class="loc">{html.escape(location)} '
+                f'(página {page})</span><span class="type">[{html.escape(change_type)}]</span>'
+                f'<div class="text">{diff_to_html(ops)}</div></div>\n')
@@ -1,11 +1,14 @@
 import os
 import json
 import shutil
+import bisect
 import logging
-from typing import List, Dict
+from collections import Counter
+from typing import List, Dict, Tuple, Optional
 from docx import Document
 from docx.shared import RGBColor
 import difflib
+from ..utils.profiling import profiled
 
 class DocumentComparer:
     """Compara documentos preservando TODA formatação"""
@@ -13,6 +16,7 @@ class DocumentComparer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
+    @profiled('compare_documents')
     def compare_documents(self, original_path: str, revised_path: str, 
                          output_path: str, log_path: str = None) -> str:
         """Compara documentos usando comparação real de espelhamento"""
@@ -38,31 +42,47 @@ class DocumentComparer:
             all_corrections = []
             para_num = 0
             
-            # 4. Compara e marca diferenças em CADA parágrafo
-            for orig_para, rev_para, comp_para in zip(original_doc.paragraphs, 
-                                                      revised_doc.paragraphs, 
-                                                      comparison_doc.paragraphs):
+            orig_paras = original_doc.paragraphs
+            rev_paras = revised_doc.paragraphs
+            comp_paras = comparison_doc.paragraphs
+            orig_texts = [p.text for p in orig_paras]
+            rev_texts = [p.text for p in rev_paras]
+            
+            # 4. Alinha parágrafos por conteúdo e marca diferenças apenas nos pares alterados
+            # (a comparação é cópia do revisado, então compartilha seus índices)
+            for o_idx, r_idx in self._align_paragraphs(orig_texts, rev_texts):
+                orig_text = orig_texts[o_idx] if o_idx is not None else ''
+                rev_text = rev_texts[r_idx] if r_idx is not None else ''
                 
-                if orig_para.text.strip():
-                    para_num += 1
-                    
-                    if orig_para.text != rev_para.text:
-                        # Houve mudança - analisa e registra
-                        diff = self._analyze_paragraph_changes(orig_para.text, rev_para.text)
-                        if diff:
-                            all_corrections.append({
-                                'paragraph_number': para_num,
-                                'location': f'Parágrafo {para_num}',
-                                'page': (para_num // 3) + 1,  # Estimativa ~3 parágrafos por página
-                                'error': diff['error'],
-                                'correction': diff['correction'],
-                                'type': diff['type'],
-                                'original_text': orig_para.text,
-                                'corrected_text': rev_para.text
-                            })
-                        
-                        # Marca no parágrafo do comparador
-                        self._mark_paragraph_changes(comp_para, orig_para.text, rev_para.text)
+                if not (orig_text.strip() or rev_text.strip()):
+                    continue
+                
+                para_num += 1
+                if orig_text == rev_text:
+                    continue
+                
+                if o_idx is None:
+                    diff = {'error': '[faltando]', 'correction': rev_text, 'type': 'adição'}
+                elif r_idx is None:
+                    diff = {'error': orig_text, 'correction': '[removido]', 'type': 'remoção'}
+                else:
+                    diff = self._analyze_paragraph_changes(orig_text, rev_text)
+                
+                if diff:
+                    all_corrections.append({
+                        'paragraph_number': para_num,
+                        'location': f'Parágrafo {para_num}',
+                        'page': (para_num // 3) + 1,  # Estimativa ~3 parágrafos por página
+                        'error': diff['error'],
+                        'correction': diff['correction'],
+                        'type': diff['type'],
+                        'original_text': orig_text,
+                        'corrected_text': rev_text
+                    })
+                
+                # Marca no parágrafo do comparador (parágrafos removidos não existem nele)
+                if r_idx is not None:
+                    self._mark_paragraph_changes(comp_paras[r_idx], orig_text, rev_text)
             
             # 5. Compara e marca diferenças em TABELAS
             table_corrections = []
@@ -112,6 +132,87 @@ class DocumentComparer:
             self.logger.error(f"Erro ao criar comparação: {str(e)}")
             raise
     
+    @staticmethod
+    def _fingerprint(text: str) -> int:
+        """Impressão digital do conteúdo do parágrafo (ignora variações de espaço)"""
+        return hash(' '.join(text.split()))
+    
+    def _align_paragraphs(self, orig_texts: List[str],
+                          rev_texts: List[str]) -> List[Tuple[Optional[int], Optional[int]]]:
+        """Alinha parágrafos dos dois documentos pelo conteúdo
+        
+        Retorna pares (índice_original, índice_revisado) em ordem; um dos lados é
+        None quando o parágrafo só existe em um documento. Primeiro ancora os
+        parágrafos cujo conteúdo é único nos dois lados, depois alinha as regiões
+        entre âncoras com SequenceMatcher sobre as impressões digitais.
+        """
+        orig_fps = [self._fingerprint(t) for t in orig_texts]
+        rev_fps = [self._fingerprint(t) for t in rev_texts]
+        
+        # 1. Âncoras: conteúdo que aparece exatamente uma vez em cada documento
+        orig_count = Counter(orig_fps)
+        rev_count = Counter(rev_fps)
+        rev_pos = {fp: j for j, fp in enumerate(rev_fps) if rev_count[fp] == 1}
+        candidates = [(i, rev_pos[fp]) for i, fp in enumerate(orig_fps)
+                      if orig_count[fp] == 1 and fp in rev_pos]
+        anchors = self._longest_increasing_pairs(candidates)
+        
+        # 2. Regiões entre âncoras: alinhamento de sequência sobre hashes
+        pairs = []
+        prev_i, prev_j = 0, 0
+        for anchor_i, anchor_j in anchors + [(len(orig_fps), len(rev_fps))]:
+            pairs.extend(self._align_region(orig_fps, rev_fps, prev_i, anchor_i, prev_j, anchor_j))
+            if anchor_i < len(orig_fps):
+                pairs.append((anchor_i, anchor_j))
+            prev_i, prev_j = anchor_i + 1, anchor_j + 1
+        
+        return pairs
+    
+    @staticmethod
+    def _longest_increasing_pairs(candidates: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Maior subsequência de pares crescente nos dois índices (patience sorting)"""
+        tails = []      # índice em candidates do menor final para cada comprimento
+        tail_js = []    # j correspondente, para busca binária
+        previous = [-1] * len(candidates)
+        
+        for k, (_, j) in enumerate(candidates):
+            pos = bisect.bisect_left(tail_js, j)
+            if pos > 0:
+                previous[k] = tails[pos - 1]
+            if pos == len(tails):
+                tails.append(k)
+                tail_js.append(j)
+            else:
+                tails[pos] = k
+                tail_js[pos] = j
+        
+        result = []
+        k = tails[-1] if tails else -1
+        while k >= 0:
+            result.append(candidates[k])
+            k = previous[k]
+        result.reverse()
+        return result
+    
+    @staticmethod
+    def _align_region(orig_fps: List[int], rev_fps: List[int],
+                      i1: int, i2: int, j1: int, j2: int) -> List[Tuple[Optional[int], Optional[int]]]:
+        """Alinha uma região sem âncoras; trechos substituídos são pareados em ordem"""
+        if i1 >= i2 and j1 >= j2:
+            return []
+        
+        pairs = []
+        s = difflib.SequenceMatcher(None, orig_fps[i1:i2], rev_fps[j1:j2], autojunk=False)
+        for tag, a1, a2, b1, b2 in s.get_opcodes():
+            common = min(a2 - a1, b2 - b1) if tag in ('equal', 'replace') else 0
+            for k in range(common):
+                pairs.append((i1 + a1 + k, j1 + b1 + k))
+            for k in range(a1 + common, a2):
+                pairs.append((i1 + k, None))
+            for k in range(b1 + common, b2):
+                pairs.append((None, j1 + k))
+        return pairs
+    
     def _analyze_paragraph_changes(self, original: str, revised: str) -> Dict:
         """Analisa mudanças em um parágrafo e retorna diferença principal"""
         
@@ -1,4 +1,5 @@
 import os
+import time
 import shutil
 import logging
 import json
@@ -6,17 +7,56 @@ import re
 from typing import List, Dict, Tuple
 from docx import Document
 from ..utils.word_utils import WordDocumentHandler
-from ..utils.api_client import OpenAIClient
+from ..utils.api_client import OpenAIClient, ApiSession
+from ..utils.tokens import estimate_tokens
+from ..utils.metrics import RunMetrics
+from ..utils.cost_ledger import CostLedger
+from ..utils.profiling import profiled, record_stage
+from ..utils.logging_setup import DETAIL_LOGGER
+from ..utils.processing_control import ProcessingControl, ProcessingCancelled
+from .diff_report import DiffReportWriter
+from .spell_filter import SpellPreFilter, load_lexicon
+from .text_revisor import TextRevisor
+from .correction_applier import CorrectionApplier
+from .propagation import CorrectionPropagator
+from .near_duplicates import NearDuplicateIndex
+from .preflight import PreparedDocument, DEFAULT_RATES
+from .events import (EVENT_BLOCK_STARTED, EVENT_BLOCK_FINISHED, EVENT_CORRECTION_APPLIED,
+                     EVENT_CORRECTION_REJECTED, EVENT_CORRECTION_FIELDS)
 
 class DocumentProcessor:
     """Processa documentos Word identificando e corrigindo apenas erros"""
     
-    def __init__(self, api_key: str, model: str = "gpt-4.1"):
-        self.api_client = OpenAIClient(api_key, model)
+    def __init__(self, api_key: str, model: str = "gpt-4.1",
+                 spell_filter: SpellPreFilter = None,
+                 propagation: Dict = None, near_duplicates: Dict = None,
+                 api_base: str = None, metrics: Dict = None, cost: Dict = None,
+                 api_session: ApiSession = None):
+        # api_session: sessão HTTP compartilhada entre processadores (None = própria)
+        self.api_client = OpenAIClient(api_key, model, api_base, api_session)
         self.api_key = api_key
         self.model = model
         self.word_handler = WordDocumentHandler()
+        self.spell_filter = spell_filter
+        # Configuração da propagação de correções recorrentes (seção "propagation")
+        self.propagation = propagation
+        # Reaproveitamento de correções entre parágrafos quase idênticos (seção "near_duplicates")
+        self.near_duplicates = near_duplicates
+        # Exportação das métricas da execução (seção "metrics")
+        self.metrics_settings = metrics or {}
+        self.metrics = None
+        # Tabela de preços e orçamento (seção "cost"); totais acumulados entre documentos
+        self.cost_settings = cost or {}
+        self.ledger = None
+        # Taxas observadas no histórico (RevisionHistory.usage_rates) para projeções de tokens
+        self.rates = None
+        self.run_totals = {'documents': 0, 'requests': 0, 'prompt_tokens': 0,
+                           'completion_tokens': 0, 'cost': 0.0, 'corrections': 0}
+        # Resumo do último documento (relatório, tempo, custo, correções) para o histórico
+        self.last_run = None
         self.logger = logging.getLogger(__name__)
+        # Detalhe por correção: só vai para o log de depuração (formatação preguiçosa)
+        self.detail_logger = logging.getLogger(DETAIL_LOGGER)
         
         # Define tamanho de chunk baseado no modelo
         if model == "gpt-4.1":
@@ -26,67 +66,216 @@ class DocumentProcessor:
     
     
     
-    def process_document(self, input_path: str, output_path: str, callback=None):
-        """Processa documento com precisão MÁXIMA"""
+    def close(self):
+        """Libera as conexões e threads do cliente da API"""
+        self.api_client.close()
+    
+    def prepare(self, input_path: str) -> PreparedDocument:
+        """Lê o documento, mapeia os parágrafos e monta os blocos, sem chamar a API
+        
+        O resultado pode ser passado a process_document(prepared=...) para que o
+        processamento comece direto pela análise (pré-análise ao soltar o arquivo).
+        """
+        timings = {}
+        mark = [time.perf_counter()]
+        
+        def lap(name):
+            now = time.perf_counter()
+            timings[name] = now - mark[0]
+            mark[0] = now
+            record_stage(name)
+        
+        # O documento de trabalho é lido do original e gravado na saída ao final
+        original_doc = Document(input_path)
+        doc = Document(input_path)
+        lap('load')
+        
+        # 3. Mapeia TODOS os textos com índices CORRETOS
+        all_paragraphs = []
+        paragraph_counter = 0
+        
+        # Parágrafos normais
+        for i, (orig_para, para) in enumerate(zip(original_doc.paragraphs, doc.paragraphs)):
+            if para.text.strip():
+                paragraph_counter += 1
+                all_paragraphs.append({
+                    'global_index': len(all_paragraphs),
+                    'paragraph_number': paragraph_counter,
+                    'doc_index': i,
+                    'original_text': orig_para.text,
+                    'current_text': para.text,
+                    'paragraph_obj': para,
+                    'type': 'normal',
+                    'location': f'Parágrafo {paragraph_counter}',
+                    'page_estimate': paragraph_counter // 3  # ~3 parágrafos por página
+                })
+        
+        # Tabelas
+        for t_idx, (orig_table, table) in enumerate(zip(original_doc.tables, doc.tables)):
+            for r_idx, (orig_row, row) in enumerate(zip(orig_table.rows, table.rows)):
+                for c_idx, (orig_cell, cell) in enumerate(zip(orig_row.cells, row.cells)):
+                    for p_idx, (orig_para, para) in enumerate(zip(orig_cell.paragraphs, cell.paragraphs)):
+                        if para.text.strip():
+                            paragraph_counter += 1
+                            key = f"table_{t_idx}_{r_idx}_{c_idx}_{p_idx}"
+                            all_paragraphs.append({
+                                'global_index': len(all_paragraphs),
+                                'paragraph_number': paragraph_counter,
+                                'doc_index': key,
+                                'original_text': orig_para.text,
+                                'current_text': para.text,
+                                'paragraph_obj': para,
+                                'type': 'table',
+                                'location': f'Tabela {t_idx+1}, Célula ({r_idx+1},{c_idx+1})',
+                                'page_estimate': paragraph_counter // 3
+                            })
+        
+        self.logger.info(f"Total de {len(all_paragraphs)} parágrafos para análise DETALHADA")
+        run_summary = {}
+        
+        # Alternativas de questões objetivas nunca são enviadas à API
+        paragraphs_to_analyze, run_summary['multiple_choice'] = self._exclude_alternatives(all_paragraphs)
+        
+        # Pré-filtro local: parágrafos sem indício de erro não vão para a API
+        if self.spell_filter:
+            paragraphs_to_analyze, skipped = self.spell_filter.filter_paragraphs(paragraphs_to_analyze)
+            run_summary['prefilter'] = {
+                'paragraphs_sent': len(paragraphs_to_analyze),
+                'paragraphs_skipped': len(skipped),
+                'sample_rate': self.spell_filter.sample_rate
+            }
+        
+        # Parágrafos quase idênticos: só o representante de cada grupo vai à API
+        paragraphs_to_analyze, duplicates = self._group_near_duplicates(paragraphs_to_analyze)
+        if duplicates:
+            run_summary['near_duplicates'] = {
+                'clusters': len(duplicates),
+                'paragraphs_skipped': sum(len(m) for m in duplicates.values()),
+                'tokens_saved': sum(estimate_tokens(m['current_text'])
+                                    for members in duplicates.values() for m in members)
+            }
+        
+        lap('collect')
+        
+        # 4. Cria blocos PEQUENOS para máxima precisão
+        blocks = self._create_precise_blocks(paragraphs_to_analyze)
+        lap('blocks')
+        self.logger.info(f"Dividido em {len(blocks)} blocos pequenos para análise minuciosa")
+        
+        return PreparedDocument(input_path, doc, all_paragraphs, paragraphs_to_analyze, duplicates,
+                                blocks, run_summary, timings)
+    
+    def estimate(self, prepared: PreparedDocument, rates: Dict = None) -> Dict:
+        """Estimativa de requisições, tokens, custo e tempo do documento preparado
+        
+        rates: 'completion_ratio' (tokens de resposta por token enviado) e
+        'seconds_per_1k_tokens'; calibrados pelo histórico quando disponível
+        (None = self.rates).
+        """
+        rates = {**DEFAULT_RATES, **(rates or self.rates or {})}
+        system_tokens = self._system_prompt_tokens()
+        projections = [self._project_request(self._prepare_block_for_analysis(block)[0], system_tokens, rates)
+                       for block in prepared.blocks]
+        requests = len(prepared.blocks)
+        prompt_tokens = sum(prompt for prompt, _ in projections)
+        completion_tokens = sum(completion for _, completion in projections)
+        ledger = CostLedger.from_config(self.model, self.cost_settings)
+        summary = prepared.run_summary
+        # Parágrafos resolvidos sem requisição própria
+        skipped = {
+            'alternatives': summary['multiple_choice']['alternatives_skipped'],
+            'prefilter': summary.get('prefilter', {}).get('paragraphs_skipped', 0),
+            'near_duplicates': summary.get('near_duplicates', {}).get('paragraphs_skipped', 0)
+        }
+        return {
+            'paragraphs': len(prepared.all_paragraphs),
+            'paragraphs_to_analyze': len(prepared.paragraphs_to_analyze),
+            'blocks': requests,
+            'requests': requests,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'cost': round(ledger.cost_of(prompt_tokens, completion_tokens), 6),
+            'currency': ledger.currency,
+            'seconds': round((prompt_tokens + completion_tokens) / 1000 * rates['seconds_per_1k_tokens'], 1),
+            'skipped': skipped,
+            'tokens_saved': summary.get('near_duplicates', {}).get('tokens_saved', 0)
+        }
+    
+    def _system_prompt_tokens(self) -> int:
+        """Tokens do prompt do sistema enviado com cada bloco"""
+        return estimate_tokens(self.api_client.create_precise_prompt())
+    
+    def _project_request(self, block_text: str, system_tokens: int, rates: Dict = None) -> Tuple[int, int]:
+        """Tokens previstos do envio de um bloco: (prompt com o do sistema, resposta)"""
+        rates = {**DEFAULT_RATES, **(rates or self.rates or {})}
+        prompt = estimate_tokens(block_text) + system_tokens
+        return prompt, int(prompt * rates['completion_ratio'])
+    
+    @profiled('process_document')
+    def process_document(self, input_path: str, output_path: str, callback=None,
+                         report_formats=None, control: ProcessingControl = None, events=None,
+                         prepared: PreparedDocument = None):
+        """Processa documento com precisão MÁXIMA
+
+        report_formats: formatos do relatório leve de alterações ('html', 'json'),
+        gravado incrementalmente à medida que as correções são aplicadas.
+        control: pausa/cancelamento cooperativo; ao cancelar, o documento e o
+        relatório são gravados com as correções aplicadas até ali.
+        events: função que recebe os eventos do processamento (dicts com a chave
+        'event': block_started, correction_rejected, correction_applied,
+        block_finished), chamada na thread do processamento.
+        prepared: resultado de prepare() para o mesmo arquivo (usado uma única vez).
+        """
+        diff_writer = None
+        self.api_client.control = control
+        self.last_run = None
+        self.metrics = metrics = RunMetrics(input_path)
+        self.api_client.metrics = metrics
+        self.ledger = ledger = CostLedger.from_config(self.model, self.cost_settings)
+        self.api_client.ledger = ledger
         try:
             # 1. Copia o arquivo original
             self.logger.info(f"Iniciando processamento ULTRA-PRECISO")
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             shutil.copy2(input_path, output_path)
             
-            # 2. Abre AMBOS os documentos
-            original_doc = Document(input_path)
-            doc = Document(output_path)
-            
-            # 3. Mapeia TODOS os textos com índices CORRETOS
-            all_paragraphs = []
-            paragraph_counter = 0
-            
-            # Parágrafos normais
-            for i, (orig_para, para) in enumerate(zip(original_doc.paragraphs, doc.paragraphs)):
-                if para.text.strip():
-                    paragraph_counter += 1
-                    all_paragraphs.append({
-                        'global_index': len(all_paragraphs),
-                        'paragraph_number': paragraph_counter,
-                        'doc_index': i,
-                        'original_text': orig_para.text,
-                        'current_text': para.text,
-                        'paragraph_obj': para,
-                        'type': 'normal',
-                        'location': f'Parágrafo {paragraph_counter}',
-                        'page_estimate': paragraph_counter // 3  # ~3 parágrafos por página
-                    })
-            
-            # Tabelas
-            for t_idx, (orig_table, table) in enumerate(zip(original_doc.tables, doc.tables)):
-                for r_idx, (orig_row, row) in enumerate(zip(orig_table.rows, table.rows)):
-                    for c_idx, (orig_cell, cell) in enumerate(zip(orig_row.cells, row.cells)):
-                        for p_idx, (orig_para, para) in enumerate(zip(orig_cell.paragraphs, cell.paragraphs)):
-                            if para.text.strip():
-                                paragraph_counter += 1
-                                key = f"table_{t_idx}_{r_idx}_{c_idx}_{p_idx}"
-                                all_paragraphs.append({
-                                    'global_index': len(all_paragraphs),
-                                    'paragraph_number': paragraph_counter,
-                                    'doc_index': key,
-                                    'original_text': orig_para.text,
-                                    'current_text': para.text,
-                                    'paragraph_obj': para,
-                                    'type': 'table',
-                                    'location': f'Tabela {t_idx+1}, Célula ({r_idx+1},{c_idx+1})',
-                                    'page_estimate': paragraph_counter // 3
-                                })
-            
-            self.logger.info(f"Total de {len(all_paragraphs)} parágrafos para análise DETALHADA")
-            
-            # 4. Cria blocos PEQUENOS para máxima precisão
-            blocks = self._create_precise_blocks(all_paragraphs)
-            self.logger.info(f"Dividido em {len(blocks)} blocos pequenos para análise minuciosa")
+            # 2-4. Lê, mapeia os parágrafos e monta os blocos (ou usa a pré-análise)
+            if prepared is None or not prepared.is_fresh(input_path):
+                prepared = self.prepare(input_path)
+            else:
+                self.logger.info("Usando pré-análise já carregada")
+                metrics.increment('preflight_reused')
+            prepared.used = True
+            for name, seconds in prepared.timings.items():
+                metrics.add_stage(name, seconds)
+            metrics.mark()
+            doc = prepared.doc
+            all_paragraphs = prepared.all_paragraphs
+            duplicates = prepared.duplicates
+            blocks = prepared.blocks
+            run_summary = dict(prepared.run_summary)
+            # Progresso/ETA em caracteres: os blocos variam muito de tamanho
+            metrics.throughput.start(sum(len(p['current_text']) for block in blocks for p in block))
+            
+            if report_formats:
+                diff_writer = DiffReportWriter(os.path.splitext(output_path)[0],
+                                               report_formats, input_path)
+                diff_writer.open()
             
             # 5. Processa CADA bloco com atenção total
             all_corrections = []
             total_corrections_applied = 0
+            overhead = {'legacy_tokens': 0, 'compact_tokens': 0, 'text_tokens': 0}
+            rejected_corrections = []
+            flagged = []
+            
+            # Dicionário de correções recorrentes, aprendido ao longo do documento
+            propagator = CorrectionPropagator.from_config(
+                self.propagation, self.spell_filter.lexicon if self.spell_filter else load_lexicon()
+            ) if self.propagation and self.propagation.get("enabled") else None
+            emitted = 0  # Correções de all_corrections já enviadas como evento
+            # Projeção do orçamento só com limite configurado
+            system_tokens = self._system_prompt_tokens() if ledger.limited else 0
             
             for block_idx, block in enumerate(blocks):
                 # Informação clara sobre o bloco
@@ -101,42 +290,144 @@ class DocumentProcessor:
                 self.logger.info(f"Bloco {block_idx+1}/{len(blocks)}: "
                             f"Parágrafos {first_para}-{last_para} ({len(block)} textos)")
                 
-                # Prepara texto para análise MINUCIOSA
-                block_text = self._prepare_block_for_analysis(block)
+                # Pausa/cancelamento: verificados entre blocos
+                if control and not control.wait_if_paused():
+                    run_summary['cancelled'] = self._cancel_summary(block_idx, len(blocks), first_para, callback)
+                    break
+                
+                block_start = time.perf_counter()
+                self._emit(events, EVENT_BLOCK_STARTED, block=block_idx + 1, blocks_total=len(blocks),
+                           first_paragraph=first_para, last_paragraph=last_para, paragraphs=len(block))
                 
-                # Envia para análise
-                corrections = self.api_client.identify_errors_precise(block_text, block_idx)
+                # Aplica trocas já aprendidas antes de enviar o bloco
+                changed_types = {}
+                if propagator and propagator.mode == 'apply':
+                    for para_data in self._propagate_corrections(propagator, block, all_corrections, flagged):
+                        changed_types[para_data['global_index']] = 'propagada'
                 
+                # Prepara texto para análise MINUCIOSA (URLs, e-mails e marcações mascarados)
+                block_text, preserved = self._prepare_block_for_analysis(block)
+                
+                # Orçamento: interrompe antes de enviar um bloco que ultrapassaria o limite
+                # (projeção do texto que seria enviado, já com as trocas propagadas)
+                stop_reason = (ledger.exceeded(*self._project_request(block_text, system_tokens))
+                               if ledger.limited else '')
+                if stop_reason:
+                    self.logger.warning(f"Orçamento atingido ({stop_reason}): processamento "
+                                        f"interrompido antes do bloco {block_idx+1}/{len(blocks)}")
+                    self._write_block_changes(diff_writer, block, changed_types)
+                    run_summary['budget_stop'] = {
+                        'reason': stop_reason,
+                        'blocks_processed': block_idx,
+                        'blocks_total': len(blocks),
+                        'next_paragraph': first_para
+                    }
+                    if callback:
+                        callback(block_idx, len(blocks), f"Orçamento atingido ({stop_reason})")
+                    break
+                
+                for key, value in self._scaffolding_tokens(block, block_text).items():
+                    overhead[key] += value
+                
+                # Envia para análise (o cancelamento abandona a espera pela resposta)
+                try:
+                    corrections = self.api_client.identify_errors_precise(block_text, block_idx)
+                except ProcessingCancelled:
+                    self._write_block_changes(diff_writer, block, changed_types)
+                    run_summary['cancelled'] = self._cancel_summary(block_idx, len(blocks), first_para, callback)
+                    break
+                self._map_block_ids(corrections, block)
+                self._restore_corrections(corrections, preserved)
+                
+                applied_before = total_corrections_applied
                 if corrections:
+                    apply_start = time.perf_counter()
                     self.logger.info(f"Bloco {block_idx+1}: {len(corrections)} erros encontrados")
                     
-                    # Aplica CADA correção
-                    for corr in corrections:
-                        # Encontra o parágrafo correto
-                        para_data = self._find_paragraph_in_block(block, corr)
+                    # Valida TODAS as correções do bloco antes de tocar no documento
+                    accepted, rejected = self._validate_block_corrections(block, corrections)
+                    for item in rejected:
+                        item['block'] = block_idx + 1
+                        self._emit(events, EVENT_CORRECTION_REJECTED, **item)
+                    rejected_corrections.extend(rejected)
+                    
+                    # Aplica as correções aceitas, uma única reescrita por parágrafo
+                    for para_data, applied in self._apply_block_corrections(accepted):
+                        total_corrections_applied += len(applied)
+                        changed_types[para_data['global_index']] = applied[-1].get('type', 'outros')
+                        
+                        # Registra correção completa
+                        for corr in applied:
+                            all_corrections.append({
+                                'block': block_idx + 1,
+                                'paragraph_number': para_data['paragraph_number'],
+                                'location': para_data['location'],
+                                'page': para_data['page_estimate'] + 1,
+                                'error': corr.get('error', ''),
+                                'correction': corr.get('correction', ''),
+                                'type': corr.get('type', 'outros'),
+                                'original_text': para_data['original_text'],
+                                'corrected_text': para_data['paragraph_obj'].text,
+                                'source': 'api',
+                                'applied': True
+                            })
                         
-                        if para_data:
-                            # Aplica a correção
-                            success = self._apply_correction_ultra_precise(para_data, corr)
-                            
-                            if success:
-                                total_corrections_applied += 1
-                                
-                                # Registra correção completa
-                                all_corrections.append({
-                                    'block': block_idx + 1,
-                                    'paragraph_number': para_data['paragraph_number'],
-                                    'location': para_data['location'],
-                                    'page': para_data['page_estimate'] + 1,
-                                    'error': corr.get('error', ''),
-                                    'correction': corr.get('correction', ''),
-                                    'type': corr.get('type', 'outros'),
-                                    'original_text': para_data['original_text'],
-                                    'corrected_text': para_data['paragraph_obj'].text,
-                                    'applied': True
-                                })
-                            else:
-                                self.logger.warning(f"Falha ao aplicar: {corr}")
+                        if propagator:
+                            propagator.learn(applied)
+                        
+                        # Repete as correções nos parágrafos quase idênticos ao representante
+                        for member in self._reuse_for_duplicates(para_data, applied,
+                                                                 duplicates.get(para_data['global_index'], []),
+                                                                 block_idx, all_corrections):
+                            if diff_writer:
+                                diff_writer.add_change(member['location'], member['paragraph_number'],
+                                                       member['page_estimate'] + 1, member['original_text'],
+                                                       member['paragraph_obj'].text, 'quase idêntico')
+                    
+                    metrics.add_stage('apply', time.perf_counter() - apply_start)
+                ledger.add_corrections(block_idx, total_corrections_applied - applied_before)
+                
+                # Grava no relatório leve os parágrafos alterados neste bloco
+                self._write_block_changes(diff_writer, block, changed_types)
+                metrics.throughput.advance(sum(len(p['current_text']) for p in block))
+                
+                emitted = self._emit_corrections(events, all_corrections, emitted)
+                self._emit(events, EVENT_BLOCK_FINISHED, block=block_idx + 1, blocks_total=len(blocks),
+                           applied=total_corrections_applied - applied_before,
+                           seconds=round(time.perf_counter() - block_start, 3))
+            
+            metrics.lap('analysis')
+            
+            # Propagação final: trechos anteriores ao aprendizado e parágrafos fora dos blocos
+            # (cancelado, o resultado parcial traz só o que já foi aplicado)
+            if propagator and 'cancelled' not in run_summary:
+                changed = self._propagate_corrections(propagator, all_paragraphs, all_corrections, flagged)
+                if diff_writer:
+                    for para_data in changed:
+                        diff_writer.add_change(para_data['location'], para_data['paragraph_number'],
+                                               para_data['page_estimate'] + 1, para_data['original_text'],
+                                               para_data['paragraph_obj'].text, 'propagada')
+                run_summary['propagation'] = {
+                    'mode': propagator.mode,
+                    'dictionary': propagator.dictionary,
+                    'applied': sum(1 for c in all_corrections if c.get('source') == 'propagated'),
+                    'flagged': flagged
+                }
+            
+            if duplicates:
+                run_summary['near_duplicates']['corrections_reused'] = sum(
+                    1 for c in all_corrections if c.get('source') == 'near_duplicate')
+            
+            run_summary['rejected_corrections'] = {
+                'count': len(rejected_corrections),
+                'corrections': rejected_corrections
+            }
+            
+            overhead['saved_tokens'] = overhead['legacy_tokens'] - overhead['compact_tokens']
+            run_summary['prompt_overhead'] = overhead
+            self.logger.info(f"Marcação dos blocos: {overhead['compact_tokens']} tokens "
+                             f"(formato antigo: {overhead['legacy_tokens']}; "
+                             f"texto: {overhead['text_tokens']})")
             
             # 6. Verifica se TODAS as mudanças foram detectadas
             self.logger.info("Verificação final de integridade...")
@@ -165,23 +456,243 @@ class DocumentProcessor:
                             'type': 'auto-detectado',
                             'original_text': original,
                             'corrected_text': current,
+                            'source': 'auto_detected',
                             'applied': True
                         })
+                        
+                        if diff_writer:
+                            diff_writer.add_change(para_data['location'],
+                                                   para_data['paragraph_number'],
+                                                   para_data['page_estimate'] + 1,
+                                                   original, current, 'auto-detectado')
+            
+            # Propagação final e mudanças auto-detectadas
+            self._emit_corrections(events, all_corrections, emitted)
+            metrics.lap('finalize')
             
             # 7. Salva documento
             doc.save(output_path)
             self.logger.info(f"Documento salvo com {len(all_corrections)} correções totais")
             
+            run_summary['cost'] = ledger.summary()
+            
             # 8. Salva relatório detalhado
-            report_path = self._save_detailed_report(output_path, all_corrections)
+            api_corrections = [c for c in all_corrections if c.get('source') == 'api']
+            report_path = self._save_complete_report(output_path, all_corrections, api_corrections,
+                                                     run_summary)
+            metrics.lap('save')
+            
+            metrics.paragraphs = len(all_paragraphs)
+            self._save_metrics(output_path)
+            self._save_ledger(output_path)
+            
+            if 'cancelled' in run_summary:
+                status = "Cancelado"
+            elif 'budget_stop' in run_summary:
+                status = "Orçamento atingido"
+            else:
+                status = "Concluído"
+            self.last_run = {
+                'report_path': report_path,
+                'status': status,
+                'seconds': round(metrics.summary()['total_seconds'], 2),
+                'prompt_tokens': ledger.document['prompt_tokens'],
+                'completion_tokens': ledger.document['completion_tokens'],
+                'cost': round(ledger.document['cost'], 6),
+                'currency': ledger.currency,
+                'corrections': len(all_corrections),
+                'api_corrections': len(api_corrections)
+            }
             
             return output_path
             
         except Exception as e:
             self.logger.error(f"Erro: {str(e)}")
             raise
+        
+        finally:
+            if diff_writer:
+                diff_writer.close()
 
 
+    def _exclude_alternatives(self, all_paragraphs: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """Remove da análise as alternativas de questões de múltipla escolha
+        
+        Retorna os parágrafos a analisar e o resumo do que foi ignorado.
+        """
+        runs = TextRevisor.find_alternative_runs([p['current_text'] for p in all_paragraphs])
+        
+        skipped = []
+        for stem_idx, start, end in runs:
+            for para_data in all_paragraphs[start:end]:
+                para_data['is_alternative'] = True
+                skipped.append({
+                    'paragraph_number': para_data['paragraph_number'],
+                    'location': para_data['location'],
+                    'question_paragraph': all_paragraphs[stem_idx]['paragraph_number'],
+                    'text': para_data['current_text']
+                })
+        
+        if skipped:
+            self.logger.info(f"{len(runs)} questões de múltipla escolha: "
+                             f"{len(skipped)} alternativas fora da análise")
+        
+        to_analyze = [p for p in all_paragraphs if not p.get('is_alternative')]
+        summary = {
+            'questions': len(runs),
+            'alternatives_skipped': len(skipped),
+            'skipped': skipped
+        }
+        return to_analyze, summary
+    
+    @staticmethod
+    def _emit(events, kind: str, **data):
+        """Envia um evento do processamento (sem efeito se não houver destino)"""
+        if events:
+            events({'event': kind, 'time': time.time(), **data})
+    
+    def _emit_corrections(self, events, all_corrections: List[Dict], start: int) -> int:
+        """Envia como eventos as correções registradas a partir de start; retorna o novo início"""
+        if events:
+            for corr in all_corrections[start:]:
+                self._emit(events, EVENT_CORRECTION_APPLIED,
+                           **{key: corr.get(key) for key in EVENT_CORRECTION_FIELDS})
+        return len(all_corrections)
+    
+    def _cancel_summary(self, block_idx: int, total_blocks: int, next_paragraph: int, callback=None) -> Dict:
+        """Registra o cancelamento antes do bloco block_idx (resultado parcial)"""
+        self.logger.warning(f"Processamento cancelado no bloco {block_idx+1}/{total_blocks}: "
+                            f"salvando resultado parcial")
+        if callback:
+            callback(block_idx, total_blocks, "Cancelado: salvando resultado parcial")
+        return {
+            'blocks_processed': block_idx,
+            'blocks_total': total_blocks,
+            'next_paragraph': next_paragraph
+        }
+    
+    def _write_block_changes(self, diff_writer: DiffReportWriter, block: List[Dict], changed_types: Dict):
+        """Grava no relatório leve os parágrafos do bloco que foram alterados"""
+        if not diff_writer:
+            return
+        for para_data in block:
+            if para_data['global_index'] in changed_types:
+                diff_writer.add_change(
+                    para_data['location'],
+                    para_data['paragraph_number'],
+                    para_data['page_estimate'] + 1,
+                    para_data['original_text'],
+                    para_data['paragraph_obj'].text,
+                    changed_types[para_data['global_index']]
+                )
+    
+    def _save_metrics(self, output_path: str):
+        """Grava as métricas da execução ao lado do relatório (se habilitado)"""
+        if not self.metrics_settings.get("enabled"):
+            return
+        json_path = f"{os.path.splitext(output_path)[0]}_metrics.json"
+        self.metrics.save(json_path, self.metrics_settings.get("prometheus_path") or None)
+        summary = self.metrics.summary()
+        self.logger.info(f"Métricas: {summary['total_seconds']:.1f}s, "
+                         f"{summary['paragraphs_per_second']} parágrafos/s, "
+                         f"latência p50 {summary['requests']['latency_p50']:.2f}s / "
+                         f"p95 {summary['requests']['latency_p95']:.2f}s, "
+                         f"{summary['tokens']['total']} tokens")
+    
+    def _save_ledger(self, output_path: str):
+        """Grava o registro de custo ao lado do relatório e acumula os totais da execução"""
+        document = self.ledger.document
+        self.run_totals['documents'] += 1
+        for key in ('requests', 'prompt_tokens', 'completion_tokens', 'cost', 'corrections'):
+            self.run_totals[key] += document[key]
+        self.run_totals['cost'] = round(self.run_totals['cost'], 6)
+        
+        path = self.ledger.save(f"{os.path.splitext(output_path)[0]}_ledger.json", dict(self.run_totals))
+        self.logger.info(f"Custo estimado: {document['cost']:.4f} {self.ledger.currency} "
+                         f"({document['prompt_tokens']} + {document['completion_tokens']} tokens) - {path}")
+    
+    def _group_near_duplicates(self, paragraphs: List[Dict]) -> Tuple[List[Dict], Dict[int, List[Dict]]]:
+        """Agrupa parágrafos quase idênticos (MinHash/LSH)
+        
+        Retorna os parágrafos a analisar (sem os membros dos grupos) e o mapa
+        global_index do representante → parágrafos que reaproveitam suas correções.
+        """
+        index = NearDuplicateIndex.from_config(self.near_duplicates)
+        if not index:
+            return paragraphs, {}
+        
+        by_index = {}
+        for para_data in paragraphs:
+            by_index[para_data['global_index']] = para_data
+            index.add(para_data['global_index'], para_data['current_text'])
+        
+        duplicates = {}
+        for representative, members in index.clusters().items():
+            duplicates[representative] = [by_index[key] for key in members]
+            for key in members:
+                by_index[key]['near_duplicate_of'] = by_index[representative]['paragraph_number']
+        
+        if duplicates:
+            self.logger.info(f"Quase idênticos: {len(duplicates)} grupos, "
+                             f"{sum(len(m) for m in duplicates.values())} parágrafos fora da API")
+        return [p for p in paragraphs if 'near_duplicate_of' not in p], duplicates
+    
+    def _reuse_for_duplicates(self, representative: Dict, applied: List[Dict], members: List[Dict],
+                              block_idx: int, all_corrections: List[Dict]) -> List[Dict]:
+        """Aplica nos membros do grupo as correções do representante
+        
+        Só são reaproveitadas as correções cujo trecho de erro aparece
+        literalmente no membro e que passam na mesma validação das correções da
+        API. Retorna os membros alterados.
+        """
+        changed = []
+        for member in members:
+            paragraph = member['paragraph_obj']
+            text = paragraph.text
+            candidates = [corr for corr in applied
+                          if corr.get('error', '').strip() in text
+                          and not TextRevisor.check_correction(text, corr.get('error', ''),
+                                                               corr.get('correction', ''))]
+            if not candidates:
+                continue
+            
+            new_text, reused, _ = CorrectionApplier.apply(text, candidates)
+            if not reused:
+                continue
+            
+            paragraph.text = new_text
+            member['current_text'] = new_text
+            changed.append(member)
+            for corr in reused:
+                all_corrections.append({
+                    'block': block_idx + 1,
+                    'paragraph_number': member['paragraph_number'],
+                    'location': member['location'],
+                    'page': member['page_estimate'] + 1,
+                    'error': corr.get('error', ''),
+                    'correction': corr.get('correction', ''),
+                    'type': corr.get('type', 'outros'),
+                    'original_text': member['original_text'],
+                    'corrected_text': new_text,
+                    'source': 'near_duplicate',
+                    'duplicate_of': representative['paragraph_number'],
+                    'applied': True
+                })
+        
+        if changed:
+            self.detail_logger.debug("✓ Correções do parágrafo %s repetidas em %d parágrafo(s) quase idêntico(s)",
+                                     representative['paragraph_number'], len(changed))
+        return changed
+    
+    def _strip_inline_alternatives(self, text: str) -> str:
+        """Remove alternativas em linhas do próprio parágrafo (quebras de linha)"""
+        if '\n' not in text:
+            return text
+        question, options = TextRevisor.handle_multiple_choice_questions(text)
+        if len(options) >= 2 and question and all(TextRevisor.alternative_letter(o) for o in options):
+            return question
+        return text
+    
     def _create_precise_blocks(self, all_paragraphs: List[Dict]) -> List[List[Dict]]:
         """Cria blocos PEQUENOS para análise precisa"""
         blocks = []
@@ -208,31 +719,204 @@ class DocumentProcessor:
         
         return blocks
 
-    def _prepare_block_for_analysis(self, block: List[Dict]) -> str:
-        """Prepara bloco com contexto MÁXIMO para análise"""
-        block_text = f"BLOCO DE PARÁGRAFOS {block[0]['paragraph_number']} a {block[-1]['paragraph_number']}:\n\n"
+    def _classify_paragraph(self, para_data: Dict) -> str:
+        """Código de uma letra do tipo de conteúdo (legenda no prompt do revisor)"""
+        text = para_data['current_text']
+        if len(text) < 100 and not text.endswith(('.', '!', '?', ':')):
+            return 'T'  # Título/cabeçalho
+        elif text.strip().startswith(('•', '-', '1.', '2.', 'a)', 'b)')):
+            return 'L'  # Item de lista
+        elif para_data['type'] == 'table':
+            return 'C'  # Célula de tabela
+        return 'N'  # Parágrafo normal
+    
+    def _prepare_block_for_analysis(self, block: List[Dict]) -> Tuple[str, Dict]:
+        """Prepara bloco em formato compacto para análise
         
-        for para_data in block:
-            # Adiciona contexto completo
-            block_text += f"[PARÁGRAFO {para_data['paragraph_number']}]\n"
-            block_text += f"[LOCALIZAÇÃO: {para_data['location']}]\n"
-            
-            # Marca tipo de conteúdo
-            text = para_data['current_text']
-            if len(text) < 100 and not text.endswith(('.', '!', '?', ':')):
-                block_text += "[TIPO: TÍTULO/CABEÇALHO]\n"
-            elif text.strip().startswith(('•', '-', '1.', '2.', 'a)', 'b)')):
-                block_text += "[TIPO: ITEM DE LISTA]\n"
-            elif para_data['type'] == 'table':
-                block_text += "[TIPO: CÉLULA DE TABELA]\n"
-            else:
-                block_text += "[TIPO: PARÁGRAFO NORMAL]\n"
+        Cada parágrafo vira uma linha "#<id><tipo> texto", com id local ao bloco
+        (1, 2, ...) e tipo em uma letra. Retorna o texto do bloco e o mapa de
+        marcadores usados para mascarar URLs, e-mails e marcações.
+        """
+        lines = []
+        preserved = {}
+        
+        for local_id, para_data in enumerate(block, 1):
+            analysis_text = self._strip_inline_alternatives(para_data['current_text'])
+            masked_text, elements = TextRevisor.prepare_text_for_revision(analysis_text, len(preserved))
+            preserved.update(elements)
             
-            block_text += f"{text}\n"
-            block_text += f"[FIM_PARÁGRAFO_{para_data['paragraph_number']}]\n\n"
+            lines.append(f"#{local_id}{self._classify_paragraph(para_data)} {masked_text}")
+        
+        return '\n'.join(lines), preserved
+    
+    def _map_block_ids(self, corrections: List[Dict], block: List[Dict]):
+        """Converte o id local do bloco retornado pela API no número do parágrafo"""
+        for corr in corrections:
+            try:
+                local_id = int(corr.get('paragraph', 0))
+            except (TypeError, ValueError):
+                local_id = 0
+            # Id inválido: _find_paragraph_in_block recorre ao texto do erro
+            corr['paragraph'] = block[local_id - 1]['paragraph_number'] if 1 <= local_id <= len(block) else 0
+    
+    def _scaffolding_tokens(self, block: List[Dict], block_text: str) -> Dict:
+        """Tokens gastos com marcação do bloco: formato antigo x compacto"""
+        legacy = f"BLOCO DE PARÁGRAFOS {block[0]['paragraph_number']} a {block[-1]['paragraph_number']}:\n\n"
+        compact = ''
+        legacy_types = {'T': 'TÍTULO/CABEÇALHO', 'L': 'ITEM DE LISTA',
+                        'C': 'CÉLULA DE TABELA', 'N': 'PARÁGRAFO NORMAL'}
+        
+        for local_id, para_data in enumerate(block, 1):
+            code = self._classify_paragraph(para_data)
+            number = para_data['paragraph_number']
+            legacy += (f"[PARÁGRAFO {number}]\n[LOCALIZAÇÃO: {para_data['location']}]\n"
+                       f"[TIPO: {legacy_types[code]}]\n\n[FIM_PARÁGRAFO_{number}]\n\n")
+            compact += f"#{local_id}{code} \n"
         
-        return block_text
+        compact_tokens = estimate_tokens(compact)
+        return {
+            'legacy_tokens': estimate_tokens(legacy),
+            'compact_tokens': compact_tokens,
+            'text_tokens': max(0, estimate_tokens(block_text) - compact_tokens)
+        }
+    
+    def _restore_corrections(self, corrections: List[Dict], preserved: Dict):
+        """Troca os marcadores das correções retornadas pelos elementos originais"""
+        if not preserved:
+            return
+        for corr in corrections:
+            for key in ('error', 'correction'):
+                if isinstance(corr.get(key), str):
+                    corr[key] = TextRevisor.restore_preserved_elements(corr[key], preserved)
 
+    def _validate_block_corrections(self, block: List[Dict],
+                                    corrections: List[Dict]) -> Tuple[List[Tuple[Dict, Dict]], List[Dict]]:
+        """Valida em lote as correções de um bloco antes de aplicá-las
+        
+        Retorna pares (parágrafo, correção) aceitos e a lista de rejeitadas com
+        o motivo. Todas são checadas contra o texto atual, antes de qualquer
+        alteração no documento.
+        """
+        accepted = []
+        rejected = []
+        
+        for corr in corrections:
+            para_data = self._find_paragraph_in_block(block, corr)
+            error = corr.get('error', '')
+            fix = corr.get('correction', '')
+            
+            if para_data is None:
+                reason = ''  # Sem parágrafo: a falha é registrada ao aplicar
+            elif para_data.get('is_alternative'):
+                reason = 'alteração dentro de alternativa'
+            else:
+                reason = TextRevisor.check_correction(para_data['current_text'], error, fix)
+            
+            if reason:
+                self.detail_logger.debug("✗ Correção rejeitada no parágrafo %s (%s): '%s' → '%s'",
+                                         para_data['paragraph_number'], reason, error, fix)
+                rejected.append({
+                    'paragraph_number': para_data['paragraph_number'],
+                    'location': para_data['location'],
+                    'error': error,
+                    'correction': fix,
+                    'type': corr.get('type', 'outros'),
+                    'reason': reason
+                })
+            else:
+                accepted.append((para_data, corr))
+        
+        return accepted, rejected
+    
+    def _apply_block_corrections(self, accepted: List[Tuple[Dict, Dict]]) -> List[Tuple[Dict, List[Dict]]]:
+        """Agrupa as correções por parágrafo e aplica cada grupo de uma vez
+        
+        Retorna (parágrafo, correções aplicadas) para os parágrafos alterados.
+        """
+        groups = {}
+        for para_data, corr in accepted:
+            if para_data is None:
+                self.logger.warning(f"Falha ao aplicar (parágrafo não encontrado): {corr}")
+                continue
+            groups.setdefault(para_data['global_index'], (para_data, []))[1].append(corr)
+        
+        results = []
+        total_applied = total_failed = 0
+        for para_data, corrections in groups.values():
+            paragraph = para_data['paragraph_obj']
+            new_text, applied, failed = CorrectionApplier.apply(paragraph.text, corrections)
+            total_applied += len(applied)
+            total_failed += len(failed)
+            
+            for corr in failed:
+                self.detail_logger.debug("✗ Não conseguiu aplicar no parágrafo %s: '%s'",
+                                         para_data['paragraph_number'], corr.get('error', ''))
+            
+            if applied:
+                paragraph.text = new_text
+                self.detail_logger.debug("✓ %d correção(ões) aplicada(s) no parágrafo %s",
+                                         len(applied), para_data['paragraph_number'])
+                results.append((para_data, applied))
+        
+        # Uma linha por bloco no log principal; o detalhe fica no log de depuração
+        self.logger.info(f"{total_applied} correção(ões) aplicada(s) em {len(results)} parágrafo(s)"
+                         + (f", {total_failed} não localizada(s)" if total_failed else ""))
+        return results
+    
+    def _propagate_corrections(self, propagator: CorrectionPropagator, paragraphs: List[Dict],
+                               all_corrections: List[Dict], flagged: List[Dict]) -> List[Dict]:
+        """Aplica (ou sinaliza) nos parágrafos as correções recorrentes já aprendidas
+        
+        Retorna os parágrafos alterados.
+        """
+        changed = []
+        flagged_keys = {(f['paragraph_number'], f['error']) for f in flagged}
+        
+        for para_data in paragraphs:
+            if para_data.get('is_alternative'):
+                continue
+            paragraph = para_data['paragraph_obj']
+            found = propagator.corrections_for(paragraph.text)
+            if not found:
+                continue
+            
+            if propagator.mode == 'flag':
+                for corr in found:
+                    key = (para_data['paragraph_number'], corr['error'])
+                    if key not in flagged_keys:
+                        flagged_keys.add(key)
+                        flagged.append({'paragraph_number': para_data['paragraph_number'],
+                                        'location': para_data['location'],
+                                        'error': corr['error'],
+                                        'correction': corr['correction']})
+                continue
+            
+            new_text, applied, _ = CorrectionApplier.apply(paragraph.text, found)
+            if not applied:
+                continue
+            
+            paragraph.text = new_text
+            para_data['current_text'] = new_text
+            changed.append(para_data)
+            for corr in applied:
+                all_corrections.append({
+                    'block': 'propagação',
+                    'paragraph_number': para_data['paragraph_number'],
+                    'location': para_data['location'],
+                    'page': para_data['page_estimate'] + 1,
+                    'error': corr['error'],
+                    'correction': corr['correction'],
+                    'type': corr['type'],
+                    'original_text': para_data['original_text'],
+                    'corrected_text': new_text,
+                    'source': 'propagated',
+                    'applied': True
+                })
+        
+        if changed:
+            self.logger.info(f"Propagação: {len(changed)} parágrafos corrigidos sem nova chamada")
+        return changed
+    
     def _find_paragraph_in_block(self, block: List[Dict], correction: Dict) -> Dict:
         """Encontra parágrafo exato da correção"""
         error_text = correction.get('error', '')
@@ -295,10 +979,11 @@ class DocumentProcessor:
             # Verifica se conseguiu aplicar
             if new_text != original_text:
                 paragraph.text = new_text
-                self.logger.info(f"✓ Correção aplicada no parágrafo {para_data['paragraph_number']}")
+                self.detail_logger.debug("✓ Correção aplicada no parágrafo %s", para_data['paragraph_number'])
                 return True
             else:
-                self.logger.warning(f"✗ Não conseguiu aplicar no parágrafo {para_data['paragraph_number']}: '{error}'")
+                self.detail_logger.debug("✗ Não conseguiu aplicar no parágrafo %s: '%s'",
+                                         para_data['paragraph_number'], error)
                 return False
                 
         except Exception as e:
@@ -374,7 +1059,8 @@ class DocumentProcessor:
             'type': 'outros'
         }
 
-    def _save_complete_report(self, output_path: str, all_corrections: List[Dict], api_corrections: List[Dict]):
+    def _save_complete_report(self, output_path: str, all_corrections: List[Dict], api_corrections: List[Dict],
+                              run_summary: Dict = None):
         """Salva relatório COMPLETO com todas as correções"""
         report_path = output_path.replace('.docx', '_complete_report.json')
         
@@ -397,7 +1083,8 @@ class DocumentProcessor:
                 'reported_by_api': len(api_corrections),
                 'auto_detected': stats_by_source.get('auto_detected', 0),
                 'by_type': stats_by_type,
-                'by_source': stats_by_source
+                'by_source': stats_by_source,
+                **(run_summary or {})
             },
             'all_corrections': all_corrections
         }
@@ -0,0 +1,14 @@
+# Eventos enviados por DocumentProcessor.process_document(events=...)
+# Cada evento é um dict com 'event' (um dos tipos abaixo), 'time' e os dados.
+
+# block, blocks_total, first_paragraph, last_paragraph, paragraphs
+EVENT_BLOCK_STARTED = 'block_started'
+# block, paragraph_number, location, error, correction, type, reason
+EVENT_CORRECTION_REJECTED = 'correction_rejected'
+# Campos de EVENT_CORRECTION_FIELDS (block é 'auto' nas mudanças auto-detectadas)
+EVENT_CORRECTION_APPLIED = 'correction_applied'
+# block, blocks_total, applied, seconds
+EVENT_BLOCK_FINISHED = 'block_finished'
+
+EVENT_CORRECTION_FIELDS = ('block', 'paragraph_number', 'location', 'page', 'error', 'correction',
+                           'type', 'source', 'corrected_text')
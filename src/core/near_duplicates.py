@@ -0,0 +1,103 @@
+import re
+import zlib
+import random
+import logging
+from typing import List, Dict
+
+TOKEN_PATTERN = re.compile(r"\w+")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+class NearDuplicateIndex:
+    """Índice MinHash/LSH para agrupar parágrafos quase idênticos
+
+    Cada parágrafo vira um conjunto de trigramas de palavras (números
+    normalizados, para que "Exercício 3" e "Exercício 4" coincidam). A
+    assinatura MinHash é dividida em faixas; parágrafos que colidem em alguma
+    faixa são candidatos e só entram no mesmo grupo se a similaridade estimada
+    com o representante do grupo atingir o limiar. Cada faixa guarda só os
+    representantes, então um grupo grande (cabeçalhos repetidos) custa uma
+    comparação por parágrafo.
+
+    Desativado por padrão: os membros de um grupo não vão à API, e uma palavra
+    errada em um parágrafo longo quase não muda a similaridade.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 8,
+                 min_words: int = 6, seed: int = 1):
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_words = min_words
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(64) for _ in range(num_perm)]
+        self._buckets = {}
+        self._signatures = {}
+        self._parent = {}
+
+    @classmethod
+    def from_config(cls, settings: Dict):
+        """Cria o índice a partir da seção "near_duplicates" do config"""
+        if not settings or not settings.get("enabled"):
+            return None
+        return cls(settings.get("threshold", 0.9))
+
+    def _shingles(self, text: str) -> set:
+        """Trigramas de palavras do texto normalizado"""
+        words = TOKEN_PATTERN.findall(NUMBER_PATTERN.sub('0', text.lower()))
+        if len(words) < self.min_words:
+            return set()
+        return {' '.join(words[i:i + 3]) for i in range(len(words) - 2)}
+
+    def _signature(self, shingles: set) -> tuple:
+        """Assinatura MinHash (hash base combinado com uma máscara por permutação)"""
+        # crc32/adler32 em vez de hash(): estável entre execuções
+        hashes = [zlib.crc32(data) << 32 | zlib.adler32(data)
+                  for data in (s.encode('utf-8') for s in shingles)]
+        return tuple(min(map(mask.__xor__, hashes)) for mask in self._masks)
+
+    def _find(self, key):
+        while self._parent[key] != key:
+            self._parent[key] = self._parent[self._parent[key]]
+            key = self._parent[key]
+        return key
+
+    def add(self, key, text: str):
+        """Indexa um parágrafo e o une aos quase idênticos já indexados"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return
+        signature = self._signature(shingles)
+        self._signatures[key] = signature
+        self._parent[key] = key
+
+        for band in range(self.bands):
+            band_key = (band, signature[band * self.rows:(band + 1) * self.rows])
+            bucket = self._buckets.setdefault(band_key, [])
+            # Grupos unidos depois de entrarem na faixa passam a ter um só representante
+            roots = list(dict.fromkeys(self._find(other) for other in bucket))
+            for root in roots:
+                own_root = self._find(key)
+                if root != own_root and self.similarity(key, root) >= self.threshold:
+                    # O representante do grupo é sempre o primeiro indexado
+                    self._parent[max(root, own_root)] = min(root, own_root)
+            own_root = self._find(key)
+            bucket[:] = [root for root in roots if self._find(root) == root and root != own_root]
+            bucket.append(own_root)
+
+    def similarity(self, key_a, key_b) -> float:
+        """Similaridade de Jaccard estimada pelas assinaturas"""
+        sig_a = self._signatures[key_a]
+        sig_b = self._signatures[key_b]
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / self.num_perm
+
+    def clusters(self) -> Dict[object, List]:
+        """Grupos com mais de um membro: representante → demais membros (em ordem)"""
+        groups = {}
+        for key in self._parent:
+            root = self._find(key)
+            if root != key:
+                groups.setdefault(root, []).append(key)
+        return groups
@@ -0,0 +1,104 @@
+import os
+import heapq
+import logging
+from typing import Dict, List
+
+from ..utils.metrics import format_seconds
+
+logger = logging.getLogger(__name__)
+
+# Somados entre os documentos no total do plano
+TOTAL_FIELDS = ('paragraphs', 'paragraphs_to_analyze', 'blocks', 'requests', 'prompt_tokens',
+                'completion_tokens', 'cost', 'tokens_saved')
+
+
+def projected_duration(durations: List[float], workers: int) -> float:
+    """Tempo total da fila com `workers` documentos em paralelo
+
+    Cada documento ocupa uma vaga do início ao fim (os blocos de um documento
+    são sequenciais); a fila entrega o próximo à primeira vaga livre.
+    """
+    slots = [0.0] * max(1, workers)
+    for seconds in durations:
+        heapq.heapreplace(slots, slots[0] + seconds)
+    return max(slots)
+
+
+def build_plan(estimates: List[Dict], concurrency: int = 1) -> Dict:
+    """Junta as estimativas por documento em um plano com totais e duração prevista
+
+    estimates: resultados de DocumentProcessor.estimate() com 'name' e 'path';
+    itens com 'error' entram no plano sem somar nos totais.
+    """
+    valid = [e for e in estimates if 'error' not in e]
+    totals = {field: sum(e[field] for e in valid) for field in TOTAL_FIELDS}
+    totals['cost'] = round(totals['cost'], 6)
+    totals['skipped'] = {}
+    for estimate in valid:
+        for reason, count in estimate['skipped'].items():
+            totals['skipped'][reason] = totals['skipped'].get(reason, 0) + count
+    totals['seconds'] = round(sum(e['seconds'] for e in valid), 1)
+    return {
+        'documents': estimates,
+        'concurrency': concurrency,
+        'currency': valid[0]['currency'] if valid else '',
+        'totals': totals,
+        # Na ordem da fila, como o processamento faria
+        'projected_seconds': round(projected_duration([e['seconds'] for e in valid], concurrency), 1)
+    }
+
+
+def plan_documents(processor, paths: List[str], rates: Dict = None, concurrency: int = 1,
+                   known: Dict[str, Dict] = None, callback=None) -> Dict:
+    """Simulação sem chamadas à API: lê cada documento, monta os blocos e estima o custo
+
+    known: estimativas já calculadas (caminho -> estimate), reaproveitadas sem
+    reler o documento. Um documento que não pode ser lido fica no plano com
+    'error' e não interrompe os demais.
+    """
+    known = known or {}
+    estimates = []
+    for i, path in enumerate(paths):
+        if callback:
+            callback(i, len(paths), os.path.basename(path))
+        estimate = known.get(path)
+        if estimate is None:
+            try:
+                estimate = processor.estimate(processor.prepare(path), rates)
+            except Exception as e:
+                logger.error(f"Simulação: não foi possível ler {path}: {e}")
+                estimate = {'error': str(e)}
+        estimates.append({'name': os.path.basename(path), 'path': path, **estimate})
+    if callback:
+        callback(len(paths), len(paths), "Simulação concluída")
+    return build_plan(estimates, concurrency)
+
+
+def format_plan(plan: Dict) -> str:
+    """Plano em texto (modo linha de comando)"""
+    currency = plan['currency']
+    lines = [f"{'Documento':<40} {'Blocos':>6} {'Req.':>6} {'Tokens env.':>12} {'Tokens resp.':>12} "
+             f"{'Sem API':>8} {'Custo':>10} {'Tempo':>9}"]
+    for doc in plan['documents']:
+        if 'error' in doc:
+            lines.append(f"{doc['name'][:40]:<40} erro: {doc['error']}")
+            continue
+        lines.append(
+            f"{doc['name'][:40]:<40} {doc['blocks']:>6} {doc['requests']:>6} {doc['prompt_tokens']:>12} "
+            f"{doc['completion_tokens']:>12} {sum(doc['skipped'].values()):>8} "
+            f"{doc['cost']:>10.4f} {format_seconds(doc['seconds']):>9}"
+        )
+    totals = plan['totals']
+    skipped = totals['skipped']
+    lines += [
+        "",
+        f"Total: {len(plan['documents'])} documento(s), {totals['blocks']} blocos, "
+        f"{totals['requests']} requisições, {totals['prompt_tokens']} tokens enviados, "
+        f"~{totals['completion_tokens']} de resposta, {totals['cost']:.4f} {currency}",
+        f"Parágrafos sem requisição própria: {skipped.get('prefilter', 0)} pelo pré-filtro, "
+        f"{skipped.get('near_duplicates', 0)} quase duplicados (reaproveitam a correção do "
+        f"representante, ~{totals['tokens_saved']} tokens), {skipped.get('alternatives', 0)} alternativas",
+        f"Duração prevista: ~{format_seconds(plan['projected_seconds'])} com {plan['concurrency']} "
+        f"documento(s) em paralelo (~{format_seconds(totals['seconds'])} em sequência)"
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,44 @@
+import os
+from typing import Dict, List
+
+# Taxas usadas nas estimativas quando o histórico ainda não tem revisões com uso registrado
+DEFAULT_RATES = {
+    'completion_ratio': 0.1,       # Tokens de resposta por token enviado
+    'seconds_per_1k_tokens': 3.0   # Tempo de processamento por mil tokens (entrada + saída)
+}
+
+
+class PreparedDocument:
+    """Documento já lido, com parágrafos mapeados e blocos montados
+
+    Produzido por DocumentProcessor.prepare() e consumido uma única vez por
+    process_document(): os parágrafos apontam para o documento de trabalho,
+    que é alterado durante o processamento.
+    """
+
+    def __init__(self, input_path: str, doc, all_paragraphs: List[Dict], paragraphs_to_analyze: List[Dict],
+                 duplicates: Dict[int, List[Dict]], blocks: List[List[Dict]], run_summary: Dict,
+                 timings: Dict[str, float]):
+        self.input_path = input_path
+        self.doc = doc
+        self.all_paragraphs = all_paragraphs
+        self.paragraphs_to_analyze = paragraphs_to_analyze
+        self.duplicates = duplicates
+        self.blocks = blocks
+        self.run_summary = run_summary
+        self.timings = timings
+        self.used = False
+        self._stat = self._file_stat(input_path)
+
+    @staticmethod
+    def _file_stat(path: str):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def is_fresh(self, input_path: str) -> bool:
+        """Ainda não usado e o arquivo não mudou desde a leitura"""
+        try:
+            return (not self.used and os.path.abspath(input_path) == os.path.abspath(self.input_path)
+                    and self._file_stat(input_path) == self._stat)
+        except OSError:
+            return False
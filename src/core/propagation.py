@@ -0,0 +1,125 @@
+import re
+import logging
+from typing import List, Dict
+
+from .text_revisor import TextRevisor
+
+WORD_PATTERN = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ]+(?:-[A-Za-zÀ-ÖØ-öø-ÿ]+)*")
+
+# Tipos de correção que não dependem do contexto da frase
+CONTEXT_FREE_TYPES = ('ortograf', 'acent', 'grafia', 'digitação')
+
+
+class CorrectionPropagator:
+    """Propaga correções recorrentes para o resto do documento sem novas chamadas
+
+    Aprende, a partir das correções já aplicadas, um dicionário de trocas de
+    palavra inteira que não dependem do contexto (ex.: "voce" → "você") e o
+    usa para localizar a mesma ocorrência nos demais parágrafos.
+    """
+
+    def __init__(self, lexicon=None, min_occurrences: int = 2, max_distance: int = 2,
+                 mode: str = 'apply'):
+        self.logger = logging.getLogger(__name__)
+        self.lexicon = lexicon
+        # 'apply' aplica as trocas; 'flag' apenas as lista no relatório
+        self.mode = mode if mode in ('apply', 'flag') else 'apply'
+        # A mesma troca precisa ter sido feita pela API mais de uma vez
+        self.min_occurrences = max(1, min_occurrences)
+        self.max_distance = max_distance
+        self.candidates = {}   # erro -> {'correction', 'type', 'count'}
+        self.conflicts = set()
+        self._pattern = None
+        self._dictionary = {}
+
+    @classmethod
+    def from_config(cls, settings: Dict, lexicon=None):
+        """Cria o propagador a partir da seção "propagation" do config"""
+        if not settings or not settings.get("enabled"):
+            return None
+        return cls(lexicon, settings.get("min_occurrences", 2), settings.get("max_distance", 2),
+                   settings.get("mode", "apply"))
+
+    def _is_context_free(self, error: str, fix: str, corr_type: str) -> bool:
+        """Verifica se a troca pode ser aplicada em qualquer contexto"""
+        if not WORD_PATTERN.fullmatch(error) or not WORD_PATTERN.fullmatch(fix):
+            return False
+        if error.lower() == fix.lower():
+            return False  # Maiúsculas dependem da posição na frase
+        if not any(t in (corr_type or '').lower() for t in CONTEXT_FREE_TYPES):
+            return False
+        if TextRevisor.edit_distance(error.lower(), fix.lower()) > self.max_distance:
+            return False
+        if self.lexicon is not None:
+            # O erro não pode ser palavra válida ("esta" → "está" depende do contexto)
+            if error.lower() in self.lexicon:
+                return False
+        return True
+
+    def learn(self, corrections: List[Dict]):
+        """Registra correções aplicadas pela API"""
+        changed = False
+        for corr in corrections:
+            error = corr.get('error', '').strip()
+            fix = corr.get('correction', '').strip()
+            if error in self.conflicts or not self._is_context_free(error, fix, corr.get('type', '')):
+                continue
+
+            entry = self.candidates.get(error)
+            if entry and entry['correction'] != fix:
+                # Mesma palavra corrigida de formas diferentes: não é confiável
+                self.conflicts.add(error)
+                del self.candidates[error]
+                changed = True
+                continue
+
+            if not entry:
+                entry = self.candidates[error] = {'correction': fix, 'type': corr.get('type', 'ortografia'),
+                                                  'count': 0}
+            entry['count'] += 1
+            changed = changed or entry['count'] == self.min_occurrences
+
+        if changed:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Recompila a busca com as trocas confiáveis"""
+        dictionary = {}
+        for error, entry in self.candidates.items():
+            if entry['count'] < self.min_occurrences:
+                continue
+            dictionary[error] = entry
+            # Também cobre o erro no início de frase ("voce" → "Voce")
+            if error[0].islower():
+                dictionary.setdefault(error[0].upper() + error[1:], {
+                    'correction': entry['correction'][0].upper() + entry['correction'][1:],
+                    'type': entry['type'],
+                    'count': entry['count']
+                })
+
+        self._dictionary = dictionary
+        if dictionary:
+            keys = sorted(dictionary, key=len, reverse=True)
+            self._pattern = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(k) for k in keys) + r')(?!\w)')
+        else:
+            self._pattern = None
+
+    @property
+    def dictionary(self) -> Dict[str, str]:
+        """Trocas em uso (erro → correção)"""
+        return {error: entry['correction'] for error, entry in self._dictionary.items()}
+
+    def corrections_for(self, text: str) -> List[Dict]:
+        """Correções propagadas encontradas no texto (uma por ocorrência)"""
+        if not self._pattern or not text:
+            return []
+        found = []
+        for match in self._pattern.finditer(text):
+            entry = self._dictionary[match.group(0)]
+            found.append({
+                'error': match.group(0),
+                'correction': entry['correction'],
+                'type': entry['type'],
+                'source': 'propagated'
+            })
+        return found
@@ -0,0 +1,116 @@
+import os
+import re
+import time
+import zlib
+import logging
+from typing import List, Dict, Tuple
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "resources", "lexicon_pt_br.txt")
+
+WORD_PATTERN = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ]+")
+
+# Padrões locais que costumam indicar erro mesmo com palavras conhecidas
+SUSPICIOUS_PATTERNS = [
+    # Determinante plural seguido de palavra no singular ("os menino")
+    ('concordância', re.compile(
+        r"\b(?:os|as|dos|das|nos|nas|aos|pelos|pelas|esses|essas|estes|estas|"
+        r"aqueles|aquelas|meus|minhas|seus|suas|nossos|nossas|uns|umas)\s+"
+        r"(?![A-ZÀ-Ö])(?!(?:que|de|e|o|a|se)\b)[a-zà-öø-ÿ]{3,}(?<![sS])\b")),
+    # Palavra repetida ("o o", "de de")
+    ('repetição', re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE)),
+    # Crase antes de palavra masculina comum ou verbo no infinitivo
+    ('crase', re.compile(r"\bà\s+(?:o|os|um|ele|eles|este|esse|[a-zà-ÿ]+(?:ar|er|ir))\b")),
+    # Espaço antes de pontuação ou pontuação duplicada
+    ('pontuação', re.compile(r"\s[,.;:!?](?!\S*\d)|,,|\.\.(?!\.)|\s{2,}")),
+    # Minúscula no início de nova frase
+    ('maiúscula', re.compile(r"[.!?]\s+[a-zà-ÿ]")),
+]
+
+SENTENCE_END = ('.', '!', '?', ':', ';', '…', '"', '”', ')')
+
+
+def load_lexicon(path: str = None) -> frozenset:
+    """Carrega lista de palavras (uma por linha, '#' para comentários)"""
+    path = path or DEFAULT_LEXICON
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        words = frozenset(
+            line.strip().lower() for line in f
+            if line.strip() and not line.startswith('#')
+        )
+    logging.getLogger(__name__).info(f"Léxico carregado: {len(words)} palavras em "
+                                     f"{time.perf_counter() - start:.3f}s")
+    return words
+
+
+class SpellPreFilter:
+    """Pré-filtro ortográfico local: separa parágrafos suspeitos dos limpos
+
+    Apenas os suspeitos (palavras fora do léxico ou padrões comuns de erro) são
+    enviados à API; uma amostra determinística dos limpos também é enviada para
+    conferência.
+    """
+
+    def __init__(self, lexicon_path: str = None, sample_rate: float = 0.05,
+                 min_word_length: int = 2):
+        self.logger = logging.getLogger(__name__)
+        self.lexicon_path = lexicon_path or DEFAULT_LEXICON
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.min_word_length = min_word_length
+        self.lexicon = load_lexicon(self.lexicon_path)
+
+    @classmethod
+    def from_config(cls, settings: Dict):
+        """Cria o filtro a partir da seção "prefilter" do config (None se desativado)"""
+        if not settings or not settings.get("enabled"):
+            return None
+        return cls(settings.get("lexicon_path") or None,
+                   settings.get("sample_rate", 0.05))
+
+    def check(self, text: str) -> List[str]:
+        """Retorna motivos pelos quais o texto é suspeito (lista vazia = limpo)"""
+        reasons = []
+        lexicon = self.lexicon
+
+        unknown = [w for w in WORD_PATTERN.findall(text)
+                   if len(w) >= self.min_word_length
+                   and not w.isupper()
+                   and w.lower() not in lexicon]
+        if unknown:
+            reasons.append(f"desconhecidas: {', '.join(unknown[:5])}")
+
+        for name, pattern in SUSPICIOUS_PATTERNS:
+            if pattern.search(text):
+                reasons.append(name)
+
+        # Parágrafo longo sem pontuação final (o revisor adiciona ponto final)
+        stripped = text.rstrip()
+        if len(stripped) >= 100 and not stripped.endswith(SENTENCE_END):
+            reasons.append('ponto final')
+
+        return reasons
+
+    def _in_sample(self, text: str) -> bool:
+        """Amostragem determinística de parágrafos limpos"""
+        if self.sample_rate <= 0:
+            return False
+        return zlib.crc32(text.encode('utf-8')) % 10000 < self.sample_rate * 10000
+
+    def filter_paragraphs(self, paragraphs: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Separa parágrafos em (para_analisar, ignorados)"""
+        start = time.perf_counter()
+        selected = []
+        skipped = []
+
+        for para_data in paragraphs:
+            text = para_data['current_text']
+            if self.check(text) or self._in_sample(text):
+                selected.append(para_data)
+            else:
+                skipped.append(para_data)
+
+        self.logger.info(f"Pré-filtro: {len(selected)} parágrafos suspeitos, "
+                         f"{len(skipped)} limpos ignorados "
+                         f"({time.perf_counter() - start:.2f}s)")
+        return selected, skipped
@@ -1,71 +1,149 @@
 import re
+import difflib
 from typing import List, Tuple
 
+# Tokenizador único: URLs, marcações e e-mails em uma só varredura linear.
+# Em uma mesma posição a ordem das alternativas decide (URL > marcação > e-mail).
+PRESERVED_PATTERN = re.compile(
+    r'(?P<URL>https?://[^\s]+)'
+    r'|(?P<MARKUP>\[[^\]]+\])'
+    r'|(?P<EMAIL>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+)
+PLACEHOLDER_PATTERN = re.compile(r'__(?:URL|MARKUP|EMAIL)_\d+__')
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Limites da validação de correções: acima de MIN_EDIT_CEILING caracteres
+# alterados, a correção não pode mudar mais que MAX_EDIT_RATIO do trecho
+MAX_EDIT_RATIO = 0.4
+MIN_EDIT_CEILING = 3
+# Parágrafos curtos (títulos) não passam pela checagem de proporção de tamanho
+MIN_LENGTH_FOR_RATIO = 30
+
+# Alternativa de questão objetiva: a) b. (c) ...
+ALTERNATIVE_PATTERN = re.compile(r'^\s*(?:\(([a-eA-E])\)|([a-eA-E])[).])(?:\s|$)')
+# Enunciado que costuma anteceder alternativas
+QUESTION_STEM_PATTERN = re.compile(
+    r'[?:]\s*$|\b(?:assinale|marque|alternativa|correta|incorreta|indique|'
+    r'identifique|qual|quais|opção)\b',
+    re.IGNORECASE
+)
+
 class TextRevisor:
     """Classe para lógica de revisão de texto"""
     
     @staticmethod
-    def prepare_text_for_revision(text: str) -> Tuple[str, dict]:
-        """Prepara texto para revisão, preservando elementos especiais"""
-        preserved_elements = {}
-        counter = 0
+    def prepare_text_for_revision(text: str, start: int = 0) -> Tuple[str, dict]:
+        """Prepara texto para revisão, preservando elementos especiais
         
-        # Preserva URLs
-        url_pattern = r'(https?://[^\s]+)'
-        for match in re.finditer(url_pattern, text):
-            placeholder = f"__URL_{counter}__"
-            preserved_elements[placeholder] = match.group(0)
-            text = text.replace(match.group(0), placeholder)
-            counter += 1
-        
-        # Preserva marcações especiais
-        markup_pattern = r'(\[[^\]]+\])'
-        for match in re.finditer(markup_pattern, text):
-            placeholder = f"__MARKUP_{counter}__"
-            preserved_elements[placeholder] = match.group(0)
-            text = text.replace(match.group(0), placeholder)
-            counter += 1
+        start permite numerar os marcadores de forma única ao mascarar vários
+        textos de um mesmo bloco.
+        """
+        preserved_elements = {}
+        counter = start
         
-        # Preserva e-mails
-        email_pattern = r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-        for match in re.finditer(email_pattern, text):
-            placeholder = f"__EMAIL_{counter}__"
+        def mask(match):
+            nonlocal counter
+            placeholder = f"__{match.lastgroup}_{counter}__"
             preserved_elements[placeholder] = match.group(0)
-            text = text.replace(match.group(0), placeholder)
             counter += 1
+            return placeholder
         
-        return text, preserved_elements
+        return PRESERVED_PATTERN.sub(mask, text), preserved_elements
     
     @staticmethod
     def restore_preserved_elements(text: str, preserved_elements: dict) -> str:
         """Restaura elementos preservados após revisão"""
-        for placeholder, original in preserved_elements.items():
-            text = text.replace(placeholder, original)
-        return text
+        if not preserved_elements or '__' not in text:
+            return text
+        return PLACEHOLDER_PATTERN.sub(
+            lambda m: preserved_elements.get(m.group(0), m.group(0)), text
+        )
     
     @staticmethod
-    def validate_revision(original: str, revised: str) -> bool:
-        """Valida se a revisão manteve a estrutura essencial"""
+    def revision_issues(original: str, revised: str, min_length_for_ratio: int = 0) -> List[str]:
+        """Lista os problemas estruturais da revisão (vazia = revisão válida)"""
+        issues = []
+        
         # Verifica se manteve marcações especiais
         original_markups = re.findall(r'\[[^\]]+\]', original)
         revised_markups = re.findall(r'\[[^\]]+\]', revised)
         
         if set(original_markups) != set(revised_markups):
-            return False
+            issues.append('marcação alterada')
         
-        # Verifica se manteve URLs
+        # Verifica se manteve URLs e e-mails
         original_urls = re.findall(r'https?://[^\s]+', original)
         revised_urls = re.findall(r'https?://[^\s]+', revised)
         
         if set(original_urls) != set(revised_urls):
-            return False
+            issues.append('URL alterada')
+        
+        if set(EMAIL_PATTERN.findall(original)) != set(EMAIL_PATTERN.findall(revised)):
+            issues.append('e-mail alterado')
         
         # Verifica se não houve mudança drástica no tamanho
-        len_ratio = len(revised) / len(original) if len(original) > 0 else 1
-        if len_ratio < 0.7 or len_ratio > 1.3:  # Tolerância de 30%
-            return False
+        if len(original) >= min_length_for_ratio:
+            len_ratio = len(revised) / len(original) if len(original) > 0 else 1
+            if len_ratio < 0.7 or len_ratio > 1.3:  # Tolerância de 30%
+                issues.append(f'tamanho alterado ({len_ratio:.0%})')
+        
+        return issues
+    
+    @staticmethod
+    def validate_revision(original: str, revised: str) -> bool:
+        """Valida se a revisão manteve a estrutura essencial"""
+        return not TextRevisor.revision_issues(original, revised)
+    
+    @staticmethod
+    def edit_distance(a: str, b: str) -> int:
+        """Distância de edição aproximada (caracteres inseridos/removidos/trocados)"""
+        s = difflib.SequenceMatcher(None, a, b, autojunk=False)
+        return sum(max(i2 - i1, j2 - j1)
+                   for tag, i1, i2, j1, j2 in s.get_opcodes() if tag != 'equal')
+    
+    @staticmethod
+    def check_correction(text: str, error: str, fix: str,
+                         max_edit_ratio: float = MAX_EDIT_RATIO) -> str:
+        """Valida uma correção candidata contra o texto do parágrafo
+        
+        Retorna o motivo da rejeição ou '' se a correção pode ser aplicada.
+        """
+        if not error or not fix or error == fix:
+            return 'correção vazia'
+        
+        if PLACEHOLDER_PATTERN.search(fix):
+            return 'marcador de conteúdo preservado na correção'
+        
+        # Alterações de URL/marcação/e-mail dentro do próprio trecho
+        if PRESERVED_PATTERN.findall(error) != PRESERVED_PATTERN.findall(fix):
+            return 'altera URL, e-mail ou marcação'
+        
+        # Teto de distância de edição: correções pontuais, não reescritas
+        distance = TextRevisor.edit_distance(error, fix)
+        if distance > MIN_EDIT_CEILING and distance > max_edit_ratio * len(error):
+            return f'reescrita extensa ({distance} caracteres alterados)'
+        
+        position = text.find(error)
+        if position < 0:
+            return ''  # O aplicador ainda tenta estratégias flexíveis
+        
+        # Trecho dentro de um elemento preservado (ex.: parte de uma URL)
+        end = position + len(error)
+        for match in PRESERVED_PATTERN.finditer(text):
+            if match.start() < end and position < match.end():
+                return 'trecho dentro de URL, e-mail ou marcação'
         
-        return True
+        # Trecho dentro de uma alternativa listada no próprio parágrafo
+        line_start = text.rfind('\n', 0, position) + 1
+        line_end = text.find('\n', position)
+        line = text[line_start:line_end if line_end >= 0 else len(text)]
+        if '\n' in text and TextRevisor.alternative_letter(line):
+            return 'alteração dentro de alternativa'
+        
+        revised = text[:position] + fix + text[end:]
+        issues = TextRevisor.revision_issues(text, revised, min_length_for_ratio=MIN_LENGTH_FOR_RATIO)
+        return ', '.join(issues)
     
     @staticmethod
     def handle_multiple_choice_questions(text: str) -> Tuple[str, List[str]]:
@@ -108,4 +186,43 @@ class TextRevisor:
         
         question_text = '\n'.join(question_lines)
         
-        return question_text, options
\ No newline at end of file
+        return question_text, options
+    
+    @staticmethod
+    def alternative_letter(text: str) -> str:
+        """Retorna a letra da alternativa no início do texto (ou '')"""
+        match = ALTERNATIVE_PATTERN.match(text)
+        if not match:
+            return ''
+        return match.group(1) or match.group(2)
+    
+    @staticmethod
+    def find_alternative_runs(texts: List[str]) -> List[Tuple[int, int, int]]:
+        """Localiza questões de múltipla escolha em uma sequência de parágrafos
+        
+        Retorna tuplas (índice_enunciado, início, fim) onde texts[início:fim] são
+        as alternativas. Exige enunciado com cara de pergunta, letras em
+        sequência a partir de "a" e alternativas que não sejam perguntas
+        (itens "a) Qual...?" são subquestões e continuam sendo revisados).
+        """
+        runs = []
+        i = 1
+        while i < len(texts):
+            letter = TextRevisor.alternative_letter(texts[i])
+            if letter not in ('a', 'A') or not QUESTION_STEM_PATTERN.search(texts[i - 1]):
+                i += 1
+                continue
+            
+            end = i + 1
+            expected = chr(ord(letter) + 1)
+            while (end < len(texts) and expected in 'bcdeBCDE'
+                   and TextRevisor.alternative_letter(texts[end]) == expected):
+                end += 1
+                expected = chr(ord(expected) + 1)
+            
+            items = texts[i:end]
+            if len(items) >= 2 and not any(t.rstrip().endswith('?') for t in items):
+                runs.append((i - 1, i, end))
+            i = end
+        
+        return runs
@@ -0,0 +1,285 @@
+import os
+import json
+import html
+from typing import Dict, List
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox,
+                             QSpinBox, QLineEdit, QTableView, QTextBrowser, QSplitter, QHeaderView,
+                             QAbstractItemView, QShortcut)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+from PyQt5.QtGui import QKeySequence
+
+from ..core.diff_report import word_diff, diff_to_html
+
+ALL_TYPES = "Todos os tipos"
+
+# O rich text do Qt não conhece <del>/<ins>: viram spans com estilo
+_QT_TAGS = (
+    ("<del>", "<span style='color:#f44336; text-decoration:line-through'>"), ("</del>", "</span>"),
+    ("<ins>", "<span style='color:#4caf50; text-decoration:underline'>"), ("</ins>", "</span>"),
+)
+
+
+def _qt_html(text: str) -> str:
+    for tag, replacement in _QT_TAGS:
+        text = text.replace(tag, replacement)
+    return text
+
+
+def load_report(path: str) -> Dict:
+    """Lê o relatório completo (*_complete_report.json) ou o leve (*_diff.json)
+
+    Retorna {'summary': ..., 'changes': [...]} com as chaves das correções
+    normalizadas (o relatório leve não traz erro/correção isolados).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if 'all_corrections' in data:
+        return {'summary': data.get('summary', {}), 'changes': data['all_corrections']}
+    changes = data.get('changes', [])
+    for change in changes:
+        change.setdefault('error', '')
+        change.setdefault('correction', '')
+        change.setdefault('source', 'diff')
+    return {'summary': data.get('summary', {}), 'changes': changes}
+
+
+class ReportLoader(QThread):
+    """Lê o relatório em background para a janela abrir na hora"""
+
+    loaded = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    def run(self):
+        try:
+            self.loaded.emit(load_report(self.path))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class CorrectionTableModel(QAbstractTableModel):
+    """Modelo das alterações do relatório, com filtro por tipo, página e texto
+
+    Guarda só os campos exibidos na tabela; o texto completo do parágrafo e o
+    diff são montados quando a linha é selecionada (details()).
+    """
+
+    COLUMNS = ("Página", "Local", "Tipo", "Erro", "Correção", "Origem")
+
+    def __init__(self):
+        super().__init__()
+        self.changes: List[Dict] = []
+        self.rows = []      # (página, local, tipo, erro, correção, origem, índice em changes)
+        self.visible = []   # posições de self.rows que passam no filtro
+
+    def load(self, changes: List[Dict]):
+        self.beginResetModel()
+        self.changes = changes
+        self.rows = [
+            (c.get('page') or 0, str(c.get('location') or ''), str(c.get('type') or 'outros'),
+             str(c.get('error') or ''), str(c.get('correction') or ''), str(c.get('source') or ''), i)
+            for i, c in enumerate(changes)
+        ]
+        self.visible = list(range(len(self.rows)))
+        self.endResetModel()
+
+    def set_filter(self, change_type: str = None, page_from: int = 0, page_to: int = 0, text: str = ''):
+        """Aplica o filtro (None/0/'' = sem restrição)"""
+        text = text.strip().lower()
+        self.beginResetModel()
+        self.visible = [
+            pos for pos, row in enumerate(self.rows)
+            if (not change_type or row[2] == change_type)
+            and (not page_from or row[0] >= page_from)
+            and (not page_to or row[0] <= page_to)
+            and (not text or text in row[1].lower() or text in row[3].lower() or text in row[4].lower())
+        ]
+        self.endResetModel()
+
+    def type_counts(self) -> Dict[str, int]:
+        counts = {}
+        for row in self.rows:
+            counts[row[2]] = counts.get(row[2], 0) + 1
+        return counts
+
+    def max_page(self) -> int:
+        return max((row[0] for row in self.rows), default=0)
+
+    def details(self, row: int) -> Dict:
+        return self.changes[self.rows[self.visible[row]][6]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[self.visible[index.row()]]
+        if role == Qt.DisplayRole:
+            return row[index.column()]
+        if role == Qt.ToolTipRole and index.column() in (1, 3, 4):
+            return str(row[index.column()])
+        if role == Qt.TextAlignmentRole and index.column() == 0:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+
+class ComparisonViewer(QWidget):
+    """Janela de revisão das alterações dentro do aplicativo
+
+    Lê o relatório JSON em vez do .docx de comparação: abre na hora para
+    qualquer tamanho de documento e funciona fora do Windows.
+    """
+
+    def __init__(self, report_path: str, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.report_path = report_path
+        self.setWindowTitle(f"Alterações - {os.path.basename(report_path)}")
+        self.resize(1000, 700)
+        self.model = CorrectionTableModel()
+        self._init_ui()
+
+        self.loader = ReportLoader(report_path)
+        self.loader.loaded.connect(self._report_loaded)
+        self.loader.error.connect(lambda message: self.count_label.setText(f"Erro ao ler relatório: {message}"))
+        self.loader.start()
+
+    def _init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # Filtros
+        filter_layout = QHBoxLayout()
+        self.type_combo = QComboBox()
+        self.type_combo.addItem(ALL_TYPES)
+        self.type_combo.currentIndexChanged.connect(self._apply_filter)
+        self.page_from = QSpinBox()
+        self.page_to = QSpinBox()
+        for spin, label in ((self.page_from, "Página de"), (self.page_to, "até")):
+            spin.setMinimum(0)
+            spin.setSpecialValueText("-")
+            spin.valueChanged.connect(self._apply_filter)
+            filter_layout.addWidget(QLabel(label))
+            filter_layout.addWidget(spin)
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("🔍 Buscar local, erro ou correção...")
+        self.search.setClearButtonEnabled(True)
+        self.search.textChanged.connect(self._apply_filter)
+        filter_layout.insertWidget(0, self.type_combo)
+        filter_layout.addWidget(self.search, 1)
+        layout.addLayout(filter_layout)
+
+        # Tabela (virtualizada: linhas de altura fixa, só as visíveis são desenhadas)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        for column, width in enumerate((60, 220, 120, 180, 180)):
+            self.table.setColumnWidth(column, width)
+        self.table.selectionModel().currentRowChanged.connect(self._show_details)
+
+        # Contexto do parágrafo selecionado
+        self.details = QTextBrowser()
+        self.details.setOpenLinks(False)
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.table)
+        splitter.addWidget(self.details)
+        splitter.setSizes([450, 250])
+        layout.addWidget(splitter, 1)
+
+        # Navegação
+        nav_layout = QHBoxLayout()
+        self.count_label = QLabel("Carregando relatório...")
+        prev_btn = QPushButton("◀ Anterior")
+        prev_btn.clicked.connect(lambda: self._jump(-1))
+        next_btn = QPushButton("Próxima ▶")
+        next_btn.clicked.connect(lambda: self._jump(1))
+        nav_layout.addWidget(self.count_label)
+        nav_layout.addStretch()
+        nav_layout.addWidget(prev_btn)
+        nav_layout.addWidget(next_btn)
+        layout.addLayout(nav_layout)
+
+        QShortcut(QKeySequence("F3"), self, lambda: self._jump(1))
+        QShortcut(QKeySequence("Shift+F3"), self, lambda: self._jump(-1))
+
+    def _report_loaded(self, report: Dict):
+        self.model.load(report['changes'])
+        counts = self.model.type_counts()
+        self.type_combo.blockSignals(True)
+        for change_type, count in sorted(counts.items(), key=lambda x: x[1], reverse=True):
+            self.type_combo.addItem(f"{change_type} ({count})", change_type)
+        self.type_combo.blockSignals(False)
+        for spin in (self.page_from, self.page_to):
+            spin.setMaximum(self.model.max_page())
+        self._update_count()
+        if self.model.rowCount():
+            self.table.selectRow(0)
+
+    def _apply_filter(self):
+        self.model.set_filter(self.type_combo.currentData(), self.page_from.value(),
+                              self.page_to.value(), self.search.text())
+        self._update_count()
+        if self.model.rowCount():
+            self.table.selectRow(0)
+        else:
+            self.details.clear()
+
+    def _update_count(self):
+        self.count_label.setText(f"{self.model.rowCount()} de {len(self.model.rows)} alterações")
+
+    def _jump(self, step: int):
+        """Vai para a alteração seguinte (ou anterior), voltando ao início no fim"""
+        total = self.model.rowCount()
+        if not total:
+            return
+        current = self.table.currentIndex().row()
+        row = (current + step) % total if current >= 0 else 0
+        self.table.selectRow(row)
+        self.table.scrollTo(self.model.index(row, 0), QAbstractItemView.PositionAtCenter)
+
+    def _show_details(self, current: QModelIndex, previous: QModelIndex = None):
+        """Monta o contexto do parágrafo só para a linha selecionada"""
+        if not current.isValid():
+            self.details.clear()
+            return
+        change = self.model.details(current.row())
+        original = change.get('original_text', '')
+        corrected = change.get('corrected_text', '')
+        parts = [
+            f"<p><b>{html.escape(str(change.get('location', '')))}</b> "
+            f"(página {change.get('page', '-')}) - {html.escape(str(change.get('type', '')))}"
+            f" - origem: {html.escape(str(change.get('source', '')))}</p>"
+        ]
+        if change.get('error') or change.get('correction'):
+            parts.append(f"<p><del>{html.escape(change.get('error', ''))}</del> → "
+                         f"<ins>{html.escape(change.get('correction', ''))}</ins></p>")
+        ops = change.get('diff') or word_diff(original, corrected)
+        parts.append(f"<p style='line-height:150%'>{diff_to_html(ops)}</p>")
+        parts.append(f"<p style='color:#969696'><b>Original:</b> {html.escape(original)}</p>")
+        self.details.setHtml(_qt_html("".join(parts)))
+
+    def closeEvent(self, event):
+        # A leitura não é interrompível; espera terminar antes de destruir a thread
+        self.loader.wait()
+        super().closeEvent(event)
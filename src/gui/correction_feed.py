@@ -0,0 +1,186 @@
+import queue
+from datetime import datetime
+from typing import Dict, List
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QCheckBox,
+                             QTableView, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor
+
+from ..core.events import (EVENT_BLOCK_STARTED, EVENT_BLOCK_FINISHED, EVENT_CORRECTION_APPLIED,
+                           EVENT_CORRECTION_REJECTED)
+
+EVENT_LABELS = {
+    EVENT_BLOCK_STARTED: "Bloco iniciado",
+    EVENT_BLOCK_FINISHED: "Bloco concluído",
+    EVENT_CORRECTION_APPLIED: "Aplicada",
+    EVENT_CORRECTION_REJECTED: "Rejeitada",
+}
+
+EVENT_COLORS = {
+    EVENT_CORRECTION_APPLIED: QColor("#4caf50"),
+    EVENT_CORRECTION_REJECTED: QColor("#f44336"),
+    EVENT_BLOCK_STARTED: QColor("#969696"),
+    EVENT_BLOCK_FINISHED: QColor("#969696"),
+}
+
+
+class CorrectionFeedModel(QAbstractTableModel):
+    """Eventos do processamento, inseridos em lote
+
+    Cada lote vira um único beginInsertRows/endInsertRows; acima de max_rows
+    os eventos mais antigos são descartados para limitar a memória.
+    """
+
+    COLUMNS = ("Hora", "Documento", "Bloco", "Evento", "Local", "Erro", "Correção", "Tipo")
+
+    def __init__(self, max_rows: int = 20000):
+        super().__init__()
+        self.max_rows = max_rows
+        self.rows: List[tuple] = []
+        self.counts = {kind: 0 for kind in EVENT_LABELS}
+
+    @staticmethod
+    def _row(event: Dict) -> tuple:
+        kind = event['event']
+        if kind == EVENT_BLOCK_STARTED:
+            detail = f"Parágrafos {event['first_paragraph']}-{event['last_paragraph']}"
+            error = correction = change_type = ""
+        elif kind == EVENT_BLOCK_FINISHED:
+            detail = f"{event['applied']} aplicada(s) em {event['seconds']:.1f}s"
+            error = correction = change_type = ""
+        else:
+            detail = event.get('location', '')
+            error, correction = event.get('error', ''), event.get('correction', '')
+            change_type = event.get('reason') or event.get('type', '')
+        block = event.get('block', '')
+        if kind in (EVENT_BLOCK_STARTED, EVENT_BLOCK_FINISHED):
+            block = f"{block}/{event['blocks_total']}"
+        tooltip = event.get('corrected_text') or event.get('reason') or ''
+        return (datetime.fromtimestamp(event['time']).strftime("%H:%M:%S"), event.get('document', ''),
+                str(block), EVENT_LABELS.get(kind, kind), str(detail), str(error or ''),
+                str(correction or ''), str(change_type or ''), kind, tooltip)
+
+    def append_batch(self, events: List[Dict]):
+        if not events:
+            return
+        new_rows = [self._row(event) for event in events]
+        for event in events:
+            self.counts[event['event']] = self.counts.get(event['event'], 0) + 1
+
+        overflow = len(self.rows) + len(new_rows) - self.max_rows
+        if overflow > 0:
+            removed = min(overflow, len(self.rows))
+            if removed:
+                self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+                del self.rows[:removed]
+                self.endRemoveRows()
+            new_rows = new_rows[-self.max_rows:]
+
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_rows) - 1)
+        self.rows.extend(new_rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = []
+        self.counts = {kind: 0 for kind in EVENT_LABELS}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row[index.column()]
+        if role == Qt.ForegroundRole and index.column() == 3:
+            return EVENT_COLORS.get(row[8])
+        if role == Qt.ToolTipRole:
+            return row[9] or row[index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+
+class CorrectionFeedWidget(QWidget):
+    """Correções em tempo real durante o processamento
+
+    As threads só enfileiram eventos; um timer na thread da interface drena a
+    fila em lotes limitados, então milhares de eventos não travam a tela.
+    """
+
+    INTERVAL_MS = 200
+    MAX_BATCH = 500
+
+    def __init__(self, events: queue.SimpleQueue):
+        super().__init__()
+        self.events = events
+        self.model = CorrectionFeedModel()
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate((70, 140, 60, 110, 160, 110, 110)):
+            self.table.setColumnWidth(column, width)
+        layout.addWidget(self.table)
+
+        bottom = QHBoxLayout()
+        self.summary = QLabel()
+        self.follow = QCheckBox("Acompanhar")
+        self.follow.setChecked(True)
+        self.follow.setToolTip("Rola até o evento mais recente")
+        clear_btn = QPushButton("Limpar")
+        clear_btn.clicked.connect(self.clear)
+        bottom.addWidget(self.summary)
+        bottom.addStretch()
+        bottom.addWidget(self.follow)
+        bottom.addWidget(clear_btn)
+        layout.addLayout(bottom)
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.drain)
+        self.timer.start(self.INTERVAL_MS)
+        self._update_summary()
+
+    def drain(self):
+        """Move para o modelo os eventos enfileirados (no máximo MAX_BATCH por vez)"""
+        batch = []
+        try:
+            while len(batch) < self.MAX_BATCH:
+                batch.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        if not batch:
+            return
+        self.model.append_batch(batch)
+        self._update_summary()
+        if self.follow.isChecked():
+            self.table.scrollToBottom()
+
+    def clear(self):
+        self.model.clear()
+        self._update_summary()
+
+    def _update_summary(self):
+        counts = self.model.counts
+        self.summary.setText(f"{counts[EVENT_CORRECTION_APPLIED]} aplicada(s) · "
+                             f"{counts[EVENT_CORRECTION_REJECTED]} rejeitada(s) · "
+                             f"{counts[EVENT_BLOCK_FINISHED]} bloco(s) concluído(s)")
@@ -0,0 +1,447 @@
+import os
+import time
+import queue
+import itertools
+from datetime import datetime
+from typing import Callable, Dict, List
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from ..core.document_comparer import DocumentComparer
+from ..utils.processing_control import ProcessingControl
+
+# Estados de um documento na fila
+STATUS_QUEUED = "Na fila"
+STATUS_RUNNING = "Processando"
+STATUS_DONE = "Concluído"
+STATUS_ERROR = "Erro"
+STATUS_PAUSED = "Pausado"
+STATUS_CANCELLED = "Cancelado"
+
+# Estados finais (o documento não volta a ser processado)
+FINISHED_STATUSES = (STATUS_DONE, STATUS_ERROR, STATUS_CANCELLED)
+
+
+class PreflightThread(QThread):
+    """Pré-análise em background: lê o documento, monta os blocos e estima o custo"""
+
+    done = pyqtSignal(object, object)
+    error = pyqtSignal(str)
+
+    def __init__(self, processor, input_path: str, rates: Dict = None):
+        super().__init__()
+        self.processor = processor
+        self.input_path = input_path
+        self.rates = rates
+
+    def run(self):
+        try:
+            prepared = self.processor.prepare(self.input_path)
+            self.done.emit(prepared, self.processor.estimate(prepared, self.rates))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class ProcessingThread(QThread):
+    """Thread para processamento em background
+
+    pause(), resume() e cancel() são cooperativos: o processador para entre
+    blocos e, ao cancelar, abandona a resposta em espera e grava o resultado
+    parcial (sem gerar a comparação).
+    """
+
+    progress = pyqtSignal(int, int, str)
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, processor, input_path, output_path, report_formats=None,
+                 comparison_path=None, event_sink=None, prepared=None):
+        super().__init__()
+        self.processor = processor
+        self.input_path = input_path
+        self.output_path = output_path
+        self.report_formats = report_formats
+        # Comparação .docx gerada na própria thread (None = não gerar)
+        self.comparison_path = comparison_path
+        self.control = ProcessingControl()
+        # Recebe os eventos do processador (chamado nesta thread, deve ser thread-safe)
+        self.event_sink = event_sink
+        # Pré-análise do mesmo arquivo (None = lê o documento no início)
+        self.prepared = prepared
+
+    def _emit_event(self, event):
+        event['document'] = os.path.basename(self.input_path)
+        self.event_sink(event)
+
+    def pause(self):
+        self.control.pause()
+
+    def resume(self):
+        self.control.resume()
+
+    def cancel(self):
+        self.control.cancel()
+
+    def run(self):
+        try:
+            def callback(current, total, status):
+                self.progress.emit(current, total, status)
+
+            result = self.processor.process_document(
+                self.input_path,
+                self.output_path,
+                callback,
+                report_formats=self.report_formats,
+                control=self.control,
+                events=self._emit_event if self.event_sink else None,
+                prepared=self.prepared
+            )
+            self.prepared = None
+
+            if self.comparison_path and not self.control.cancelled:
+                self.progress.emit(1, 1, "Gerando comparação")
+                metrics = self.processor.metrics
+                with metrics.stage('compare'):
+                    DocumentComparer().compare_documents(self.input_path, result, self.comparison_path)
+                metrics.save()
+
+            self.finished.emit(result)
+
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class DocumentJob:
+    """Um documento da fila e seu andamento"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, input_path: str):
+        self.id = next(self._ids)
+        self.input_path = input_path
+        self.name = os.path.basename(input_path)
+        self.status = STATUS_QUEUED
+        self.message = ""
+        self.progress = 0
+        self.eta = None
+        self.output_path = None
+        self.comparison_path = None
+        self.started_at = None
+        self.finished_at = None
+        self.thread = None
+        self.live = None
+        # Pré-análise: processador que a fez, documento lido (se mantido) e estimativa
+        self.processor = None
+        self.prepared = None
+        self.estimate = None
+        self.preflight = None
+        self.preflight_failed = False
+        self.start_when_ready = False
+
+    @property
+    def active(self) -> bool:
+        return self.status in (STATUS_RUNNING, STATUS_PAUSED)
+
+    def update_progress(self, current: int, total: int, status: str):
+        """Atualiza percentual e estimativa de tempo restante"""
+        self.message = status
+        if total > 0:
+            fraction = min(current / total, 1.0)
+            self.progress = int(fraction * 100)
+            elapsed = time.monotonic() - self.started_at
+            self.eta = elapsed * (1 - fraction) / fraction if fraction > 0 else None
+
+    def update_live(self, live: Dict):
+        """Progresso e ETA pela vazão medida em caracteres (substitui a conta por blocos)"""
+        self.live = live
+        if live['total']:
+            self.progress = int(min(live['done'] / live['total'], 1.0) * 100)
+            self.eta = live['eta']
+
+
+class JobQueue(QObject):
+    """Fila de documentos processados por um conjunto de threads
+
+    Até max_workers documentos rodam ao mesmo tempo, cada um com seu próprio
+    DocumentProcessor (criado por processor_factory), pois o processador guarda
+    o estado da execução (métricas, custo).
+    """
+
+    jobAdded = pyqtSignal(object)
+    jobUpdated = pyqtSignal(object)
+    jobFinished = pyqtSignal(object)
+    queueFinished = pyqtSignal()
+
+    def __init__(self, config, processor_factory: Callable, max_workers: int = 2):
+        super().__init__()
+        self.config = config
+        self.processor_factory = processor_factory
+        self.max_workers = max(1, max_workers)
+        self.jobs: List[DocumentJob] = []
+        self.running = False
+        self.paused = False
+        # Eventos de todos os documentos, drenados pela interface em lotes
+        self.events = queue.SimpleQueue()
+        # Pré-análise: uma por vez, liberada quando o processador estiver configurado
+        self.preflight_settings = getattr(config, 'PREFLIGHT', {}) or {}
+        self.preflight_ready = False
+        self.rates = None
+        self._preflight_job = None
+
+    def add(self, input_path: str) -> DocumentJob:
+        """Adiciona documento à fila (começa logo se a fila estiver rodando)"""
+        job = DocumentJob(input_path)
+        self.jobs.append(job)
+        self.jobAdded.emit(job)
+        if self.running:
+            self._schedule()
+        self._preflight_next()
+        return job
+
+    def enable_preflight(self):
+        """Libera a pré-análise (o processador já pode ser criado com a configuração final)"""
+        self.preflight_ready = True
+        self._preflight_next()
+
+    def start(self):
+        """Inicia o processamento dos documentos em espera"""
+        self.running = True
+        self._schedule()
+
+    def clear(self):
+        """Remove da fila os documentos que não estão em processamento"""
+        for job in self.jobs:
+            if not job.active and job.processor:
+                job.processor.close()
+                job.processor = None
+        self.jobs = [job for job in self.jobs if job.active]
+
+    def reset_processors(self):
+        """Descarta os processadores criados pela pré-análise dos documentos que não começaram
+
+        Usado quando a API key ou a sessão mudam: o documento lido continua
+        valendo, mas o processador guardava a sessão antiga.
+        """
+        for job in self.jobs:
+            if job.thread is None and job.status not in FINISHED_STATUSES and job.processor:
+                job.processor.close()
+                job.processor = None
+
+    def pending(self) -> List[DocumentJob]:
+        return [job for job in self.jobs if job.status == STATUS_QUEUED]
+
+    def active_jobs(self) -> List[DocumentJob]:
+        return [job for job in self.jobs if job.active]
+
+    def overall_progress(self) -> int:
+        """Progresso médio dos documentos da fila"""
+        if not self.jobs:
+            return 0
+        return int(sum(100 if job.status in FINISHED_STATUSES else job.progress
+                       for job in self.jobs) / len(self.jobs))
+
+    def refresh(self) -> Dict:
+        """Atualiza o ETA dos documentos em processamento e soma as taxas ao vivo da fila
+
+        O ETA da fila é o do documento ativo que termina por último, mais o
+        tempo estimado dos que estão em espera.
+        """
+        totals = {'chars_per_second': 0.0, 'requests_per_minute': 0.0, 'retries': 0, 'eta': None}
+        pending_seconds = sum(job.estimate['seconds'] for job in self.pending() if job.estimate)
+        for job in self.active_jobs():
+            live = self._live(job)
+            if not live:
+                continue
+            if job.status == STATUS_RUNNING:
+                job.update_live(live)
+                self.jobUpdated.emit(job)
+            for key in ('chars_per_second', 'requests_per_minute', 'retries'):
+                totals[key] += live[key]
+            if live['eta'] is not None:
+                totals['eta'] = max(totals['eta'] or 0.0, live['eta'])
+        # Documentos em espera entram pela estimativa da pré-análise, divididos entre as vagas
+        if pending_seconds:
+            totals['eta'] = (totals['eta'] or 0.0) + pending_seconds / self.max_workers
+        return totals
+
+    def pause(self):
+        """Pausa os documentos em processamento (param no próximo bloco) e a fila"""
+        self.paused = True
+        for job in self.active_jobs():
+            if job.thread:
+                job.thread.pause()
+            job.status = STATUS_PAUSED
+            self.jobUpdated.emit(job)
+
+    def resume(self):
+        """Retoma os documentos pausados e o agendamento da fila"""
+        self.paused = False
+        for job in self.active_jobs():
+            if job.thread:
+                job.thread.resume()
+            job.status = STATUS_RUNNING
+            self.jobUpdated.emit(job)
+        if self.running:
+            self._schedule()
+
+    def cancel(self):
+        """Cancela a fila: os ativos gravam o resultado parcial, os em espera não rodam"""
+        self.paused = False
+        for job in self.pending():
+            self._on_finished(job, STATUS_CANCELLED, "Cancelado antes de iniciar", schedule=False)
+        for job in self.active_jobs():
+            if not job.thread:
+                # Ainda esperando a pré-análise: nada foi processado
+                job.start_when_ready = False
+                self._on_finished(job, STATUS_CANCELLED, "Cancelado antes de iniciar", schedule=False)
+                continue
+            job.status = STATUS_RUNNING
+            job.message = "Cancelando..."
+            job.thread.cancel()
+            self.jobUpdated.emit(job)
+        if self.running:
+            self._schedule()
+
+    def _schedule(self):
+        """Ocupa as vagas livres com os próximos documentos da fila"""
+        if self.paused:
+            return
+        free = self.max_workers - len(self.active_jobs())
+        for job in self.pending()[:max(free, 0)]:
+            self._launch(job)
+
+        if not self.active_jobs() and not self.pending():
+            self.running = False
+            self.queueFinished.emit()
+
+    def _launch(self, job: DocumentJob):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = os.path.splitext(job.name)[0]
+        # Id do job no nome: documentos homônimos iniciados no mesmo segundo não colidem
+        job.output_path = os.path.join(self.config.OUTPUT_PATHS["revised"],
+                                       f"{base_name}_revisado_{timestamp}_{job.id}.docx")
+        if 'docx' in self.config.COMPARISON_FORMATS:
+            job.comparison_path = os.path.join(self.config.OUTPUT_PATHS["comparisons"],
+                                               f"{base_name}_comparacao_{timestamp}_{job.id}.docx")
+        os.makedirs(os.path.dirname(job.output_path), exist_ok=True)
+
+        job.status = STATUS_RUNNING
+        job.started_at = time.monotonic()
+        if job.preflight:
+            # A pré-análise termina em instantes e o processamento aproveita o resultado
+            job.message = "Concluindo pré-análise..."
+            job.start_when_ready = True
+            self.jobUpdated.emit(job)
+            return
+        self._start_thread(job)
+
+    def _start_thread(self, job: DocumentJob):
+        job.message = "Iniciando revisão..."
+        processor = job.processor or self.processor_factory()
+        # Projeção do orçamento calibrada pelas revisões anteriores
+        processor.rates = self.rates
+        job.thread = ProcessingThread(
+            processor,
+            job.input_path,
+            job.output_path,
+            [f for f in self.config.COMPARISON_FORMATS if f != 'docx'],
+            job.comparison_path,
+            self.events.put,
+            job.prepared
+        )
+        job.prepared = None
+        if self.paused:
+            job.thread.pause()
+            job.status = STATUS_PAUSED
+        job.thread.progress.connect(lambda current, total, status, job=job: self._on_progress(job, current, total, status))
+        job.thread.finished.connect(lambda result, job=job: self._on_done(job))
+        job.thread.error.connect(lambda message, job=job: self._on_finished(job, STATUS_ERROR, message))
+        job.thread.start()
+        self.jobUpdated.emit(job)
+
+    def _preflight_next(self):
+        """Inicia a pré-análise do próximo documento em espera (uma por vez)
+
+        Além da estimativa, mantém lidos até keep_warm documentos; quando um
+        deles é processado, o próximo da fila é lido de novo para ficar pronto.
+        """
+        if (not self.preflight_ready or not self.preflight_settings.get("enabled", True)
+                or self._preflight_job is not None):
+            return
+        warm = sum(1 for job in self.jobs if job.prepared is not None)
+        for job in self.pending():
+            if job.preflight_failed:
+                continue
+            if job.estimate is None or (job.prepared is None and warm < self.preflight_settings.get("keep_warm", 4)):
+                break
+        else:
+            return
+
+        self._preflight_job = job
+        job.processor = job.processor or self.processor_factory()
+        job.preflight = PreflightThread(job.processor, job.input_path, self.rates)
+        job.preflight.done.connect(lambda prepared, estimate, job=job: self._on_preflight_done(job, prepared, estimate))
+        job.preflight.error.connect(lambda message, job=job: self._on_preflight_error(job, message))
+        if job.estimate is None:
+            job.message = "Pré-análise..."
+            self.jobUpdated.emit(job)
+        job.preflight.start()
+
+    def _on_preflight_done(self, job: DocumentJob, prepared, estimate: Dict):
+        job.estimate = estimate
+        warm = sum(1 for j in self.jobs if j.prepared is not None)
+        # Documento removido da fila ou acima do limite: fica só a estimativa
+        if job in self.jobs and (job.start_when_ready or warm < self.preflight_settings.get("keep_warm", 4)):
+            job.prepared = prepared
+        self._preflight_finished(job)
+
+    def _on_preflight_error(self, job: DocumentJob, message: str):
+        job.preflight_failed = True
+        job.message = f"Pré-análise falhou: {message}"
+        self._preflight_finished(job)
+
+    def _preflight_finished(self, job: DocumentJob):
+        job.preflight.wait()
+        job.preflight = None
+        self._preflight_job = None
+        if job.status == STATUS_QUEUED and not job.preflight_failed:
+            job.message = ""
+        self.jobUpdated.emit(job)
+        if job.start_when_ready:
+            job.start_when_ready = False
+            self._start_thread(job)
+        self._preflight_next()
+
+    @staticmethod
+    def _live(job: DocumentJob):
+        metrics = job.thread.processor.metrics if job.thread else None
+        return metrics.live() if metrics else None
+
+    def _on_progress(self, job: DocumentJob, current: int, total: int, status: str):
+        job.update_progress(current, total, status)
+        live = self._live(job)
+        if live:
+            job.update_live(live)
+        self.jobUpdated.emit(job)
+
+    def _on_done(self, job: DocumentJob):
+        if job.thread.control.cancelled:
+            self._on_finished(job, STATUS_CANCELLED, "Cancelado: resultado parcial salvo")
+        else:
+            self._on_finished(job, STATUS_DONE, "Revisão concluída")
+
+    def _on_finished(self, job: DocumentJob, status: str, message: str, schedule: bool = True):
+        job.status = status
+        job.message = message
+        job.progress = 100 if status == STATUS_DONE else job.progress
+        job.eta = None
+        job.finished_at = time.monotonic()
+        self.jobUpdated.emit(job)
+        self.jobFinished.emit(job)
+        # Resultados já lidos pela interface: libera conexões e threads do cliente da API
+        processor = job.thread.processor if job.thread else job.processor
+        if processor:
+            processor.close()
+        job.processor = None
+        if schedule:
+            self._schedule()
+        self._preflight_next()
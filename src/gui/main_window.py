@@ -1,47 +1,25 @@
 import os
+import time
 import logging
 from datetime import datetime
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QPushButton, QLabel, QFileDialog, QMessageBox,
-                            QGroupBox, QListWidget, QListWidgetItem, QSplitter,
+                            QGroupBox, QListWidget, QListWidgetItem, QSplitter, QLineEdit,
                             )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
 
-from .widgets import FileDropArea, AnimatedProgressBar, StatusWidget, APIKeyDialog
+from .widgets import FileDropArea, AnimatedProgressBar, StatusWidget, APIKeyDialog, JobQueueWidget
 from .styles import get_stylesheet
+from .comparison_viewer import ComparisonViewer
+from .correction_feed import CorrectionFeedWidget
+from .plan_dialog import PlanDialog
+from .job_queue import JobQueue, STATUS_DONE, STATUS_ERROR, STATUS_CANCELLED, FINISHED_STATUSES
 from ..core.document_processor import DocumentProcessor
-from ..core.document_comparer import DocumentComparer
+from ..core.spell_filter import SpellPreFilter
 from ..utils.config import Config
-
-class ProcessingThread(QThread):
-    """Thread para processamento em background"""
-    
-    progress = pyqtSignal(int, int, str)
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-    
-    def __init__(self, processor, input_path, output_path):
-        super().__init__()
-        self.processor = processor
-        self.input_path = input_path
-        self.output_path = output_path
-    
-    def run(self):
-        try:
-            def callback(current, total, status):
-                self.progress.emit(current, total, status)
-            
-            result = self.processor.process_document(
-                self.input_path, 
-                self.output_path,
-                callback
-            )
-            
-            self.finished.emit(result)
-            
-        except Exception as e:
-            self.error.emit(str(e))
+from ..utils.history import RevisionHistory
+from ..utils.api_client import ApiSession
 
 class MainWindow(QMainWindow):
     """Janela principal da aplicação"""
@@ -50,10 +28,26 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.config = Config()
         self.processor = None
-        self.current_file = None
-        self.processing_thread = None
+        self.spell_filter = None
+        self.api_session = None
         self.elapsed_timer = QTimer()
         self.elapsed_seconds = 0
+        self.batch_started = 0.0
+        
+        # Histórico em SQLite, carregado por páginas
+        self.history = RevisionHistory.from_config(self.config.HISTORY, self.config.OUTPUT_PATHS)
+        self.history_page_size = self.config.HISTORY.get("page_size", 50)
+        self.history_cursor = None
+        self.history_exhausted = False
+        
+        # Fila de documentos: cada um roda com seu próprio processador
+        self.job_queue = JobQueue(self.config, self._create_processor,
+                                  self.config.MAX_CONCURRENT_DOCUMENTS)
+        self.job_queue.jobUpdated.connect(self._job_updated)
+        self.job_queue.jobFinished.connect(self._job_finished)
+        self.job_queue.queueFinished.connect(self._queue_finished)
+        # Estimativas da pré-análise calibradas pelas revisões anteriores
+        self.job_queue.rates = self.history.usage_rates()
         
         self._init_ui()
         self._check_api_key()
@@ -104,17 +98,22 @@ class MainWindow(QMainWindow):
         left_panel.setLayout(left_layout)
         
         # Área de upload
-        upload_group = QGroupBox("Documento")
+        upload_group = QGroupBox("Documentos")
         upload_layout = QVBoxLayout()
         
         self.drop_area = FileDropArea()
-        self.drop_area.fileDropped.connect(self._load_file)
+        self.drop_area.filesDropped.connect(self._load_files)
         upload_layout.addWidget(self.drop_area)
         
+        # Fila de documentos
+        self.queue_table = JobQueueWidget()
+        self.job_queue.jobAdded.connect(self.queue_table.add_job)
+        upload_layout.addWidget(self.queue_table)
+        
         # Botões de arquivo
         file_btn_layout = QHBoxLayout()
         
-        select_btn = QPushButton("Selecionar Arquivo")
+        select_btn = QPushButton("Selecionar Arquivos")
         select_btn.clicked.connect(self._select_file)
         
         clear_btn = QPushButton("Limpar")
@@ -144,12 +143,38 @@ class MainWindow(QMainWindow):
         self.process_btn.setObjectName("primaryButton")
         self.process_btn.clicked.connect(self._start_processing)
         self.process_btn.setEnabled(False)
-        process_layout.addWidget(self.process_btn)
+        
+        # Simulação: blocos, tokens, custo e tempo previstos, sem chamar a API
+        plan_btn = QPushButton("📋 Planejar")
+        plan_btn.setToolTip("Estima blocos, tokens, custo e tempo dos documentos da fila sem chamar a API")
+        plan_btn.clicked.connect(self._plan_processing)
+        start_layout = QHBoxLayout()
+        start_layout.addWidget(self.process_btn, 1)
+        start_layout.addWidget(plan_btn)
+        process_layout.addLayout(start_layout)
+        
+        # Pausa e cancelamento (param entre blocos; cancelado grava o resultado parcial)
+        control_layout = QHBoxLayout()
+        self.pause_btn = QPushButton("⏸️ Pausar")
+        self.pause_btn.clicked.connect(self._toggle_pause)
+        self.pause_btn.setEnabled(False)
+        self.cancel_btn = QPushButton("⏹️ Cancelar")
+        self.cancel_btn.clicked.connect(self._cancel_processing)
+        self.cancel_btn.setEnabled(False)
+        control_layout.addWidget(self.pause_btn)
+        control_layout.addWidget(self.cancel_btn)
+        process_layout.addLayout(control_layout)
         
         process_group.setLayout(process_layout)
         left_layout.addWidget(process_group)
         
-        left_layout.addStretch()
+        # Correções chegando bloco a bloco, para revisar antes do fim do documento
+        feed_group = QGroupBox("Correções em tempo real")
+        feed_layout = QVBoxLayout()
+        self.correction_feed = CorrectionFeedWidget(self.job_queue.events)
+        feed_layout.addWidget(self.correction_feed)
+        feed_group.setLayout(feed_layout)
+        left_layout.addWidget(feed_group, 1)
 
         
         
@@ -161,10 +186,26 @@ class MainWindow(QMainWindow):
         history_group = QGroupBox("Histórico de Revisões")
         history_layout = QVBoxLayout()
         
+        # Busca com atraso: a consulta roda quando o usuário para de digitar
+        self.history_search = QLineEdit()
+        self.history_search.setPlaceholderText("🔍 Buscar no histórico...")
+        self.history_search.setClearButtonEnabled(True)
+        self.history_search_timer = QTimer()
+        self.history_search_timer.setSingleShot(True)
+        self.history_search_timer.setInterval(250)
+        self.history_search_timer.timeout.connect(self._load_history)
+        self.history_search.textChanged.connect(self.history_search_timer.start)
+        history_layout.addWidget(self.history_search)
+        
         self.history_list = QListWidget()
         self.history_list.itemDoubleClicked.connect(self._open_result)
+        # Próxima página ao chegar ao fim da lista
+        self.history_list.verticalScrollBar().valueChanged.connect(self._history_scrolled)
         history_layout.addWidget(self.history_list)
         
+        self.history_count = QLabel()
+        history_layout.addWidget(self.history_count)
+        
         # Botões do histórico
         history_btn_layout = QHBoxLayout()
         
@@ -174,8 +215,13 @@ class MainWindow(QMainWindow):
         compare_btn = QPushButton("Ver Comparação")
         compare_btn.clicked.connect(self._open_comparison)
         
+        review_btn = QPushButton("Revisar Alterações")
+        review_btn.setToolTip("Lista as alterações do relatório sem abrir o Word")
+        review_btn.clicked.connect(self._review_changes)
+        
         history_btn_layout.addWidget(open_btn)
         history_btn_layout.addWidget(compare_btn)
+        history_btn_layout.addWidget(review_btn)
         history_btn_layout.addStretch()
         
         history_layout.addLayout(history_btn_layout)
@@ -204,10 +250,33 @@ class MainWindow(QMainWindow):
     def _init_processor(self):
         """Inicializa processador com API key"""
         if self.config.API_KEY:
-            self.processor = DocumentProcessor(
-                self.config.API_KEY,
-                self.config.MODEL
-            )
+            # O léxico do pré-filtro é carregado uma vez e compartilhado (só leitura)
+            self.spell_filter = SpellPreFilter.from_config(self.config.PREFILTER)
+            # Uma sessão HTTP para todos os processadores, com uma conexão por documento simultâneo
+            if self.api_session:
+                self.api_session.close()
+            if self.processor:
+                self.processor.close()
+            self.api_session = ApiSession(self.config.API_KEY, self.config.API_BASE,
+                                          pool_size=self.config.MAX_CONCURRENT_DOCUMENTS)
+            # Processadores da pré-análise guardam a sessão (e a chave) anterior
+            self.job_queue.reset_processors()
+            self.processor = self._create_processor()
+            self.job_queue.enable_preflight()
+    
+    def _create_processor(self) -> DocumentProcessor:
+        """Cria um processador (um por documento em processamento)"""
+        return DocumentProcessor(
+            self.config.API_KEY,
+            self.config.MODEL,
+            spell_filter=self.spell_filter,
+            propagation=self.config.PROPAGATION,
+            near_duplicates=self.config.NEAR_DUPLICATES,
+            api_base=self.config.API_BASE,
+            metrics=self.config.METRICS,
+            cost=self.config.COST,
+            api_session=self.api_session
+        )
     
     def _show_api_key_dialog(self):
         """Mostra diálogo para configurar API key"""
@@ -226,19 +295,24 @@ class MainWindow(QMainWindow):
         self._show_api_key_dialog()
     
     def _select_file(self):
-        """Seleciona arquivo via diálogo"""
-        file_path, _ = QFileDialog.getOpenFileName(
+        """Seleciona arquivos via diálogo"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "Selecionar Documento Word",
+            "Selecionar Documentos Word",
             "",
             "Documentos Word (*.docx)"
         )
         
-        if file_path:
+        if file_paths:
+            self._load_files(file_paths)
+    
+    def _load_files(self, file_paths: list):
+        """Adiciona vários arquivos à fila"""
+        for file_path in file_paths:
             self._load_file(file_path)
     
     def _load_file(self, file_path: str):
-        """Carrega arquivo selecionado"""
+        """Adiciona arquivo à fila de processamento"""
         if not file_path.endswith('.docx'):
             QMessageBox.warning(
                 self,
@@ -247,23 +321,26 @@ class MainWindow(QMainWindow):
             )
             return
         
-        self.current_file = file_path
-        filename = os.path.basename(file_path)
-        self.drop_area.set_file(filename)
-        self.process_btn.setEnabled(True)
-        self.status_widget.set_ready()
+        self.job_queue.add(file_path)
+        pending = len(self.job_queue.pending())
+        self.drop_area.set_file(f"{pending} documento(s) na fila")
+        self.process_btn.setEnabled(not self.job_queue.running)
+        if not self.job_queue.running:
+            self.status_widget.set_ready()
     
     def _clear_file(self):
-        """Limpa arquivo selecionado"""
-        self.current_file = None
+        """Remove da fila os documentos que não estão em processamento"""
+        self.job_queue.clear()
+        self.queue_table.set_jobs(self.job_queue.jobs)
         self.drop_area.clear_file()
-        self.process_btn.setEnabled(False)
-        self.progress_bar.setValue(0)
-        self.status_widget.set_ready()
+        if not self.job_queue.running:
+            self.process_btn.setEnabled(False)
+            self.progress_bar.setValue(0)
+            self.status_widget.set_ready()
     
     def _start_processing(self):
-        """Inicia processamento do documento"""
-        if not self.current_file:
+        """Inicia processamento dos documentos da fila"""
+        if not self.job_queue.pending():
             return
         
         if not self.processor:
@@ -275,19 +352,8 @@ class MainWindow(QMainWindow):
             self._show_api_key_dialog()
             return
         
-        # Prepara caminhos de saída
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_name = os.path.splitext(os.path.basename(self.current_file))[0]
-        
-        output_name = f"{base_name}_revisado_{timestamp}.docx"
-        output_path = os.path.join(self.config.OUTPUT_PATHS["revised"], output_name)
-        
-        # Garante que diretório existe
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Desabilita controles
+        # Novos arquivos continuam entrando na fila durante o processamento
         self.process_btn.setEnabled(False)
-        self.drop_area.setEnabled(False)
         
         # Inicia animações
         self.progress_bar.setValue(0)
@@ -298,49 +364,122 @@ class MainWindow(QMainWindow):
         self.elapsed_seconds = 0
         self.elapsed_timer.start(1000)
         
-        # Cria e inicia thread
-        self.processing_thread = ProcessingThread(
-            self.processor,
-            self.current_file,
-            output_path
+        self.batch_started = time.monotonic()
+        self.pause_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+        self.job_queue.start()
+    
+    def _toggle_pause(self):
+        """Pausa ou retoma a fila"""
+        if self.job_queue.paused:
+            self.job_queue.resume()
+            self.pause_btn.setText("⏸️ Pausar")
+            self.elapsed_timer.start(1000)
+            self.status_widget.set_processing("Revisão retomada")
+        else:
+            self.job_queue.pause()
+            self.pause_btn.setText("▶️ Retomar")
+            self.elapsed_timer.stop()
+            self.status_widget.set_processing("Pausado (após o bloco em andamento)")
+    
+    def _cancel_processing(self):
+        """Cancela a fila; os documentos em andamento gravam o resultado parcial"""
+        reply = QMessageBox.question(
+            self,
+            "Cancelar Revisão",
+            "Cancelar a revisão?\nOs documentos em andamento serão salvos com as correções já aplicadas.",
+            QMessageBox.Yes | QMessageBox.No
         )
-        
-        self.processing_thread.progress.connect(self._update_progress)
-        self.processing_thread.finished.connect(self._processing_finished)
-        self.processing_thread.error.connect(self._processing_error)
-        
-        self.processing_thread.start()
+        if reply != QMessageBox.Yes:
+            return
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.setText("⏸️ Pausar")
+        self.cancel_btn.setEnabled(False)
+        self.status_widget.set_processing("Cancelando...")
+        self.job_queue.cancel()
     
-    def _update_progress(self, current: int, total: int, status: str):
-        """Atualiza progresso"""
-        if total > 0:
-            percent = int((current / total) * 100)
-            self.progress_bar.setValue(percent)
+    def _job_updated(self, job):
+        """Atualiza a linha do documento e o progresso geral"""
+        self.queue_table.update_job(job)
+        
+        percent = self.job_queue.overall_progress()
+        if percent > 0:
             self.progress_bar.stop_animation()
+        self.progress_bar.setValue(percent)
         
-        self.status_widget.set_processing(f"{status} ({current}/{total})")
+        active = self.job_queue.active_jobs()
+        done = sum(1 for j in self.job_queue.jobs if j.status in FINISHED_STATUSES)
+        if active and not self.job_queue.paused and self.cancel_btn.isEnabled():
+            self.status_widget.set_processing(
+                f"{done}/{len(self.job_queue.jobs)} concluídos - {len(active)} em processamento"
+            )
     
     def _update_elapsed_time(self):
-        """Atualiza tempo decorrido"""
+        """Atualiza tempo decorrido, tempo restante e taxas ao vivo"""
         self.elapsed_seconds += 1
+        self.status_widget.set_live(self.job_queue.refresh())
         self.status_widget.set_time(self.elapsed_seconds)
     
-    def _processing_finished(self, output_path: str):
-        """Processamento concluído com sucesso"""
+    def _job_finished(self, job):
+        """Documento concluído (com sucesso ou erro)"""
+        if job.status == STATUS_DONE:
+            self._add_to_history(job)
+            self.job_queue.rates = self.history.usage_rates()
+        elif job.status == STATUS_CANCELLED:
+            # Resultado parcial também vai para o histórico (se chegou a ser gravado)
+            if job.output_path and os.path.exists(job.output_path):
+                self._add_to_history(job)
+        else:
+            logging.error(f"Erro no processamento de {job.name}: {job.message}")
+    
+    def _queue_finished(self):
+        """Todos os documentos da fila foram processados"""
         self.elapsed_timer.stop()
+        self.status_widget.clear_live()
+        self.status_widget.set_time(self.elapsed_seconds)
         self.progress_bar.setValue(100)
         self.progress_bar.stop_animation()
-        self.status_widget.set_success("Revisão concluída!")
+        self.process_btn.setEnabled(bool(self.job_queue.pending()))
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.setText("⏸️ Pausar")
+        self.cancel_btn.setEnabled(False)
+        self.drop_area.clear_file()
         
-        # Reabilita controles
-        self.process_btn.setEnabled(True)
-        self.drop_area.setEnabled(True)
+        # Apenas os documentos desta rodada
+        batch = [j for j in self.job_queue.jobs if j.finished_at and j.finished_at >= self.batch_started]
+        done = [j for j in batch if j.status == STATUS_DONE]
+        failed = [j for j in batch if j.status == STATUS_ERROR]
+        cancelled = [j for j in batch if j.status == STATUS_CANCELLED]
         
-        # Gera comparação
-        self._generate_comparison(self.current_file, output_path)
+        if failed:
+            self.status_widget.set_error(f"{len(failed)} documento(s) com erro")
+            QMessageBox.critical(
+                self,
+                "Erro",
+                "Ocorreu um erro durante o processamento:\n\n" +
+                "\n".join(f"{j.name}: {j.message}" for j in failed)
+            )
+            return
         
-        # Atualiza histórico
-        self._add_to_history(self.current_file, output_path)
+        if cancelled:
+            self.status_widget.set_error("Revisão cancelada")
+            partial = [j for j in cancelled if j.started_at]
+            QMessageBox.information(
+                self,
+                "Revisão Cancelada",
+                f"{len(done)} documento(s) concluído(s), {len(partial)} salvo(s) parcialmente "
+                f"e {len(cancelled) - len(partial)} não iniciado(s).\nOs resultados estão no histórico."
+            )
+            return
+        
+        self.status_widget.set_success("Revisão concluída!")
+        if len(done) != 1:
+            QMessageBox.information(
+                self,
+                "Revisão Concluída",
+                f"{len(done)} documentos revisados com sucesso!\nOs resultados estão no histórico."
+            )
+            return
         
         # Pergunta se quer abrir
         reply = QMessageBox.question(
@@ -351,81 +490,78 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
-            os.startfile(output_path)
+            os.startfile(done[0].output_path)
     
-    def _processing_error(self, error_msg: str):
-        """Erro durante processamento"""
-        self.elapsed_timer.stop()
-        self.progress_bar.stop_animation()
-        self.status_widget.set_error("Erro no processamento")
-        
-        # Reabilita controles
-        self.process_btn.setEnabled(True)
-        self.drop_area.setEnabled(True)
-        
-        # Log do erro
-        logging.error(f"Erro no processamento: {error_msg}")
-        
-        # Mostra erro
-        QMessageBox.critical(
-            self,
-            "Erro",
-            f"Ocorreu um erro durante o processamento:\n\n{error_msg}"
-        )
-    
-    def _generate_comparison(self, original_path: str, revised_path: str):
-        """Gera documento de comparação"""
-        try:
-            comparer = DocumentComparer()
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_name = os.path.splitext(os.path.basename(original_path))[0]
-            
-            comparison_name = f"{base_name}_comparacao_{timestamp}.docx"
-            comparison_path = os.path.join(
-                self.config.OUTPUT_PATHS["comparisons"], 
-                comparison_name
-            )
-            
-            comparer.compare_documents(original_path, revised_path, comparison_path)
-            
-        except Exception as e:
-            logging.error(f"Erro ao gerar comparação: {str(e)}")
+    def _add_to_history(self, job):
+        """Registra a revisão no banco e a coloca no topo da lista"""
+        run = dict(job.thread.processor.last_run or {}) if job.thread else {}
+        comparison = job.comparison_path if job.comparison_path and os.path.exists(job.comparison_path) else None
+        revision_id = self.history.add(job.output_path, job.input_path, comparison_path=comparison, **run)
+        
+        # Com busca ativa, a lista só muda ao refazer a busca
+        if not self.history_search.text().strip():
+            self.history_list.insertItem(0, self._history_item(self.history.get(revision_id)))
+            self._update_history_count()
     
-    def _add_to_history(self, original_path: str, revised_path: str):
-        """Adiciona item ao histórico"""
-        timestamp = datetime.now().strftime("%d/%m/%Y %H:%M")
-        filename = os.path.basename(original_path)
-        
-        item = QListWidgetItem(f"{filename} - {timestamp}")
+    def _history_item(self, row: dict) -> QListWidgetItem:
+        """Item da lista para uma revisão do banco"""
+        timestamp = datetime.fromisoformat(row['created_at']).strftime("%d/%m/%Y %H:%M")
+        text = f"{row['name']} - {timestamp}"
+        if row['corrections'] is not None:
+            text += f" · {row['corrections']} " + ("correção" if row['corrections'] == 1 else "correções")
+        if row['cost']:
+            text += f" · {row['cost']:.4f} {row['currency'] or ''}".rstrip()
+        if row['status'] and row['status'] not in (STATUS_DONE, "Importado"):
+            text += f" · {row['status']}"
+        
+        item = QListWidgetItem(text)
+        item.setToolTip("\n".join(
+            f"{label}: {row[key]}" for label, key in (
+                ("Original", 'original_path'), ("Revisado", 'revised_path'),
+                ("Comparação", 'comparison_path'), ("Relatório", 'report_path'),
+                ("Tempo (s)", 'seconds'), ("Tokens de entrada", 'prompt_tokens'),
+                ("Tokens de saída", 'completion_tokens')
+            ) if row[key] is not None
+        ))
         item.setData(Qt.UserRole, {
-            'original': original_path,
-            'revised': revised_path,
+            'id': row['id'],
+            'original': row['original_path'],
+            'revised': row['revised_path'],
+            'comparison': row['comparison_path'],
+            'report': row['report_path'],
             'timestamp': timestamp
         })
-        
-        self.history_list.insertItem(0, item)
-        
-        # Salva histórico
-        self._save_history()
+        return item
     
     def _load_history(self):
-        """Carrega histórico de revisões"""
-        # Por enquanto, apenas lista arquivos na pasta de saída
-        revised_dir = self.config.OUTPUT_PATHS["revised"]
-        
-        if os.path.exists(revised_dir):
-            for file in sorted(os.listdir(revised_dir), reverse=True)[:20]:
-                if file.endswith('.docx'):
-                    item = QListWidgetItem(file)
-                    item.setData(Qt.UserRole, {
-                        'revised': os.path.join(revised_dir, file)
-                    })
-                    self.history_list.addItem(item)
+        """Recarrega o histórico (primeira página da busca atual)"""
+        self.history_list.clear()
+        self.history_cursor = None
+        self.history_exhausted = False
+        self._update_history_count()
+        self._load_more_history()
+    
+    def _load_more_history(self):
+        """Acrescenta a próxima página do histórico"""
+        while not self.history_exhausted:
+            rows = self.history.page(self.history_page_size, self.history_cursor,
+                                     self.history_search.text())
+            for row in rows:
+                self.history_list.addItem(self._history_item(row))
+            if rows:
+                self.history_cursor = rows[-1]['id']
+            self.history_exhausted = len(rows) < self.history_page_size
+            # Sem barra de rolagem não há como pedir a próxima página: carrega até preencher
+            if self.history_list.verticalScrollBar().maximum() > 0 or not self.history_list.isVisible():
+                break
     
-    def _save_history(self):
-        """Salva histórico (implementar persistência futura)"""
-        pass
+    def _history_scrolled(self, value: int):
+        if value >= self.history_list.verticalScrollBar().maximum():
+            self._load_more_history()
+    
+    def _update_history_count(self):
+        total = self.history.count(self.history_search.text())
+        self.history_count.setText(f"{total} revisões" if total != 1 else "1 revisão")
     
     def _open_selected(self):
         """Abre documento selecionado no histórico"""
@@ -441,12 +577,51 @@ class MainWindow(QMainWindow):
         if 'revised' in data:
             os.startfile(data['revised'])
     
+    def _plan_processing(self):
+        """Abre o planejamento dos documentos em espera (reaproveita as pré-análises prontas)"""
+        pending = self.job_queue.pending()
+        if not pending:
+            QMessageBox.information(self, "Planejamento", "Adicione documentos à fila para planejar a revisão.")
+            return
+        if self.spell_filter is None:
+            self.spell_filter = SpellPreFilter.from_config(self.config.PREFILTER)
+        PlanDialog(
+            self._create_processor(),
+            [job.input_path for job in pending],
+            self.job_queue.rates,
+            self.job_queue.max_workers,
+            {job.input_path: job.estimate for job in pending if job.estimate},
+            self
+        ).show()
+    
+    def _review_changes(self):
+        """Abre o relatório da revisão selecionada no visualizador interno"""
+        current = self.history_list.currentItem()
+        if not current:
+            return
+        data = current.data(Qt.UserRole)
+        candidates = [data.get('report')]
+        if data.get('revised'):
+            base = os.path.splitext(data['revised'])[0]
+            candidates += [f"{base}_complete_report.json", f"{base}_diff.json"]
+        report_path = next((path for path in candidates if path and os.path.exists(path)), None)
+        if not report_path:
+            QMessageBox.information(
+                self,
+                "Relatório não encontrado",
+                "O relatório de alterações desta revisão não foi encontrado."
+            )
+            return
+        ComparisonViewer(report_path, self).show()
+    
     def _open_comparison(self):
         """Abre documento de comparação"""
         current = self.history_list.currentItem()
         if current:
             data = current.data(Qt.UserRole)
-            if 'revised' in data:
+            if data.get('comparison') and os.path.exists(data['comparison']):
+                os.startfile(data['comparison'])
+            elif 'revised' in data:
                 # Tenta encontrar arquivo de comparação correspondente
                 revised_name = os.path.basename(data['revised'])
                 base_name = revised_name.replace('_revisado_', '_comparacao_')
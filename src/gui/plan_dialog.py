@@ -0,0 +1,136 @@
+import json
+from typing import Dict, List
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView, QFileDialog, QMessageBox)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+from ..core.planner import plan_documents
+from ..utils.metrics import format_seconds
+
+
+class PlanThread(QThread):
+    """Simulação em background (lê os documentos que ainda não têm estimativa)"""
+
+    progress = pyqtSignal(int, int, str)
+    planned = pyqtSignal(object)
+
+    def __init__(self, processor, paths: List[str], rates: Dict, concurrency: int, known: Dict[str, Dict]):
+        super().__init__()
+        self.processor = processor
+        self.paths = paths
+        self.rates = rates
+        self.concurrency = concurrency
+        self.known = known
+
+    def run(self):
+        plan = plan_documents(self.processor, self.paths, self.rates, self.concurrency,
+                              self.known, self.progress.emit)
+        self.processor.close()
+        self.planned.emit(plan)
+
+
+class PlanDialog(QWidget):
+    """Plano da revisão dos documentos da fila, sem chamar a API"""
+
+    COLUMNS = ("Documento", "Blocos", "Requisições", "Tokens enviados", "Tokens de resposta",
+               "Sem API", "Custo", "Tempo")
+
+    def __init__(self, processor, paths: List[str], rates: Dict = None, concurrency: int = 1,
+                 known: Dict[str, Dict] = None, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle("Planejamento da Revisão")
+        self.resize(900, 450)
+        self.plan = None
+        self._init_ui()
+
+        self.thread = PlanThread(processor, paths, rates, concurrency, known or {})
+        self.thread.progress.connect(
+            lambda current, total, status: self.summary.setText(f"Lendo documentos ({current}/{total}): {status}")
+        )
+        self.thread.planned.connect(self._show_plan)
+        self.thread.start()
+
+    def _init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table, 1)
+
+        self.summary = QLabel("Lendo documentos...")
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self.save_btn = QPushButton("Salvar JSON")
+        self.save_btn.clicked.connect(self._save_plan)
+        self.save_btn.setEnabled(False)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.close)
+        btn_layout.addWidget(self.save_btn)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+    def _show_plan(self, plan: Dict):
+        self.plan = plan
+        currency = plan['currency']
+        self.table.setRowCount(len(plan['documents']))
+        for row, doc in enumerate(plan['documents']):
+            name = QTableWidgetItem(doc['name'])
+            name.setToolTip(doc['path'])
+            self.table.setItem(row, 0, name)
+            if 'error' in doc:
+                error = QTableWidgetItem(f"Erro: {doc['error']}")
+                self.table.setItem(row, 1, error)
+                self.table.setSpan(row, 1, 1, len(self.COLUMNS) - 1)
+                continue
+            skipped = doc['skipped']
+            values = (doc['blocks'], doc['requests'], doc['prompt_tokens'], f"~{doc['completion_tokens']}",
+                      sum(skipped.values()), f"{doc['cost']:.4f} {currency}", f"~{format_seconds(doc['seconds'])}")
+            for column, value in enumerate(values, 1):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+            self.table.item(row, 5).setToolTip(
+                f"{skipped['prefilter']} pelo pré-filtro · {skipped['near_duplicates']} quase duplicados · "
+                f"{skipped['alternatives']} alternativas"
+            )
+
+        totals = plan['totals']
+        skipped = totals['skipped']
+        self.summary.setText(
+            f"<b>Total:</b> {totals['blocks']} blocos, {totals['requests']} requisições, "
+            f"~{(totals['prompt_tokens'] + totals['completion_tokens']) / 1000:.1f}k tokens, "
+            f"{totals['cost']:.4f} {currency}<br>"
+            f"<b>Sem requisição própria:</b> {skipped.get('prefilter', 0)} parágrafos pelo pré-filtro, "
+            f"{skipped.get('near_duplicates', 0)} quase duplicados (reaproveitam a correção do representante), "
+            f"{skipped.get('alternatives', 0)} alternativas<br>"
+            f"<b>Duração prevista:</b> ~{format_seconds(plan['projected_seconds'])} com "
+            f"{plan['concurrency']} documento(s) em paralelo"
+        )
+        self.save_btn.setEnabled(True)
+
+    def _save_plan(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar plano", "plano_revisao.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.plan, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível salvar o plano:\n{e}")
+
+    def closeEvent(self, event):
+        # A leitura dos documentos não é interrompível; espera terminar
+        self.thread.wait()
+        super().closeEvent(event)
@@ -1,12 +1,16 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QLabel, QProgressBar, QFrame, QTextEdit)
+                            QLabel, QProgressBar, QFrame, QTextEdit, QTableWidget,
+                            QTableWidgetItem, QHeaderView, QAbstractItemView)
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QPixmap, QPainter, QBrush, QPen, QColor
 
+from ..utils.metrics import format_seconds
+
 class FileDropArea(QFrame):
     """Área para arrastar e soltar arquivos"""
     
     fileDropped = pyqtSignal(str)
+    filesDropped = pyqtSignal(list)
     
     def __init__(self):
         super().__init__()
@@ -34,7 +38,7 @@ class FileDropArea(QFrame):
         self.icon_label.setAlignment(Qt.AlignCenter)
         
         # Texto
-        self.text_label = QLabel("Arraste um arquivo .docx aqui\nou clique para selecionar")
+        self.text_label = QLabel("Arraste arquivos .docx aqui\nou clique para selecionar")
         self.text_label.setAlignment(Qt.AlignCenter)
         self.text_label.setStyleSheet("background: transparent;")
         
@@ -65,8 +69,10 @@ class FileDropArea(QFrame):
     
     def dropEvent(self, event):
         files = [url.toLocalFile() for url in event.mimeData().urls()]
-        if files and files[0].endswith('.docx'):
+        files = [f for f in files if f.endswith('.docx')]
+        if files:
             self.fileDropped.emit(files[0])
+            self.filesDropped.emit(files)
         self.dragLeaveEvent(event)
     
     def set_file(self, filename: str):
@@ -84,7 +90,7 @@ class FileDropArea(QFrame):
     def clear_file(self):
         """Limpa seleção de arquivo"""
         self.icon_label.setText("📄")
-        self.text_label.setText("Arraste um arquivo .docx aqui\nou clique para selecionar")
+        self.text_label.setText("Arraste arquivos .docx aqui\nou clique para selecionar")
         self.setStyleSheet("""
             QFrame {
                 border: 2px dashed #007acc;
@@ -169,12 +175,17 @@ class StatusWidget(QWidget):
         # Texto de status
         self.status_text = QLabel("Pronto")
         
-        # Tempo decorrido
+        # Taxa de requisições e novas tentativas
+        self.rate_label = QLabel()
+        
+        # Tempo decorrido e restante
         self.time_label = QLabel()
+        self.eta_text = ""
         
         layout.addWidget(self.status_icon)
         layout.addWidget(self.status_text)
         layout.addStretch()
+        layout.addWidget(self.rate_label)
         layout.addWidget(self.time_label)
         
         self.set_ready()
@@ -184,6 +195,8 @@ class StatusWidget(QWidget):
         self.status_icon.setText("✅")
         self.status_text.setText("Pronto")
         self.time_label.clear()
+        self.rate_label.clear()
+        self.eta_text = ""
     
     def set_processing(self, text: str = "Processando..."):
         """Define status como processando"""
@@ -204,7 +217,94 @@ class StatusWidget(QWidget):
         """Atualiza tempo decorrido"""
         minutes = seconds // 60
         secs = seconds % 60
-        self.time_label.setText(f"Tempo: {minutes:02d}:{secs:02d}")
+        self.time_label.setText(f"Tempo: {minutes:02d}:{secs:02d}{self.eta_text}")
+    
+    def set_live(self, live: dict):
+        """Mostra vazão, requisições por minuto, novas tentativas e tempo restante"""
+        self.rate_label.setText(
+            f"{live['requests_per_minute']:.1f} req/min · {live['retries']} nova(s) tentativa(s) · "
+            f"{live['chars_per_second']:.0f} car/s  "
+        )
+        self.rate_label.setToolTip("Média móvel do último minuto")
+        self.eta_text = f" · Restante: ~{format_seconds(live['eta'])}" if live['eta'] is not None else ""
+    
+    def clear_live(self):
+        """Remove taxas e tempo restante (fim do processamento)"""
+        self.rate_label.clear()
+        self.eta_text = ""
+
+class JobQueueWidget(QTableWidget):
+    """Tabela da fila de documentos: estimativa, status, progresso e tempo restante"""
+    
+    COLUMNS = ("Arquivo", "Estimativa", "Status", "Progresso", "Restante")
+    
+    def __init__(self):
+        super().__init__(0, len(self.COLUMNS))
+        self.setHorizontalHeaderLabels(self.COLUMNS)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.verticalHeader().setVisible(False)
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self._rows = {}
+    
+    def add_job(self, job):
+        """Adiciona linha para o documento"""
+        row = self.rowCount()
+        self.insertRow(row)
+        self._rows[job.id] = row
+        
+        name = QTableWidgetItem(job.name)
+        name.setToolTip(job.input_path)
+        self.setItem(row, 0, name)
+        self.setItem(row, 1, QTableWidgetItem(""))
+        self.setItem(row, 2, QTableWidgetItem(job.status))
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        progress.setTextVisible(True)
+        self.setCellWidget(row, 3, progress)
+        self.setItem(row, 4, QTableWidgetItem(""))
+        self.update_job(job)
+    
+    def update_job(self, job):
+        """Atualiza a linha com o andamento do documento"""
+        row = self._rows.get(job.id)
+        if row is None:
+            return
+        self._update_estimate(self.item(row, 1), job)
+        self.item(row, 2).setText(job.status)
+        self.item(row, 2).setToolTip(job.message)
+        self.cellWidget(row, 3).setValue(job.progress)
+        if job.eta is not None:
+            self.item(row, 4).setText(format_seconds(job.eta))
+        else:
+            self.item(row, 4).setText("")
+    
+    @staticmethod
+    def _update_estimate(item, job):
+        """Blocos, tokens, custo e duração previstos pela pré-análise"""
+        estimate = job.estimate
+        if estimate is None:
+            item.setText("Analisando..." if job.preflight else "")
+            item.setToolTip(job.message if job.preflight_failed else "")
+            return
+        tokens = estimate['prompt_tokens'] + estimate['completion_tokens']
+        item.setText(f"{estimate['blocks']} blocos · ~{tokens / 1000:.1f}k tokens · "
+                     f"{estimate['cost']:.2f} {estimate['currency']} · ~{format_seconds(estimate['seconds'])}")
+        item.setToolTip(
+            f"{estimate['paragraphs_to_analyze']} de {estimate['paragraphs']} parágrafos enviados à API\n"
+            f"{estimate['requests']} requisições · {estimate['prompt_tokens']} tokens enviados · "
+            f"~{estimate['completion_tokens']} de resposta"
+        )
+    
+    def set_jobs(self, jobs):
+        """Redesenha a tabela com os documentos informados"""
+        self.setRowCount(0)
+        self._rows = {}
+        for job in jobs:
+            self.add_job(job)
 
 class APIKeyDialog(QWidget):
     """Diálogo para inserir chave da API"""
@@ -1,6 +1,5 @@
 import sys
 import os
-import logging
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
 
@@ -8,24 +7,8 @@ from PyQt5.QtCore import Qt
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.gui.main_window import MainWindow
-from src.utils.config import Config
-
-def setup_logging():
-    """Configura sistema de logging"""
-    config = Config()
-    log_dir = config.OUTPUT_PATHS.get("logs", "output/logs")
-    os.makedirs(log_dir, exist_ok=True)
-    
-    log_file = os.path.join(log_dir, "word_revisor.log")
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
+from src.utils.logging_setup import setup_logging
+from src.utils.profiling import setup_profiling
 
 def main():
     """Função principal"""
@@ -37,6 +20,7 @@ def main():
     
     # Configura logging
     setup_logging()
+    setup_profiling()
     
     # Cria aplicação
     app = QApplication(sys.argv)
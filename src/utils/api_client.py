@@ -1,19 +1,154 @@
 import openai
+import openai.error
+import openai.util
+import requests
 import time
 import logging
 import json
-import re
+import math
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
 from typing import List, Dict
+from .logging_setup import DETAIL_LOGGER
+from .processing_control import ProcessingCancelled
+
+DEFAULT_API_BASE = "https://api.openai.com/v1"
+
+class ApiSession:
+    """Sessão HTTP própria da API: credenciais, endpoint e conexões reaproveitadas
+    
+    Não usa o estado global do módulo openai (openai.api_key), então sessões
+    com chaves diferentes convivem no mesmo processo. As conexões ficam
+    abertas entre requisições (keep-alive) em um pool de pool_size conexões,
+    e a mesma instância pode ser usada por várias threads ao mesmo tempo.
+    """
+    
+    # Mesmo limite padrão da biblioteca openai
+    REQUEST_TIMEOUT = 600
+    
+    def __init__(self, api_key: str, api_base: str = None, pool_size: int = 2,
+                 timeout: float = REQUEST_TIMEOUT):
+        self.api_base = (api_base or DEFAULT_API_BASE).rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        })
+        # Sem novas tentativas no transporte: quem repete é identify_errors
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def chat_completion(self, request_timeout: float = None, **params):
+        """POST /chat/completions; retorna o mesmo objeto que openai.ChatCompletion.create"""
+        try:
+            response = self.session.post(f"{self.api_base}/chat/completions", json=params,
+                                         timeout=request_timeout or self.timeout)
+        except requests.exceptions.Timeout as e:
+            raise openai.error.Timeout(f"Tempo esgotado na requisição: {e}") from e
+        except requests.exceptions.RequestException as e:
+            raise openai.error.APIConnectionError(f"Falha de conexão com a API: {e}") from e
+        
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if response.status_code >= 400 or not isinstance(body, dict) or 'error' in body:
+            error = body.get('error') if isinstance(body, dict) else None
+            message = (error or {}).get('message') or f"Resposta inválida da API (HTTP {response.status_code})"
+            error_class = {401: openai.error.AuthenticationError,
+                           429: openai.error.RateLimitError}.get(response.status_code, openai.error.APIError)
+            raise error_class(message, response.text, response.status_code,
+                              body if isinstance(body, dict) else None, response.headers)
+        return openai.util.convert_to_openai_object(body)
+    
+    def close(self):
+        self.session.close()
 
 class OpenAIClient:
     """Cliente para interação com API OpenAI - Versão Eficiente"""
     
-    def __init__(self, api_key: str, model: str = "gpt-4.1"):
+    # Teto da espera pedida pelo servidor (Retry-After) entre tentativas
+    MAX_RETRY_AFTER = 60
+    # Limite de leitura das requisições canceláveis: uma requisição abandonada
+    # ocupa uma conexão do pool até a resposta chegar ou o tempo esgotar
+    CANCELLABLE_TIMEOUT = 120
+    
+    def __init__(self, api_key: str, model: str = "gpt-4.1", api_base: str = None,
+                 session: ApiSession = None):
         self.api_key = api_key  
-        openai.api_key = api_key
         self.model = model
+        # Endpoint alternativo (ex.: servidor simulado local); None usa o da OpenAI
+        self.api_base = api_base or None
+        # Sessão compartilhada entre processadores ou própria (duas conexões:
+        # a requisição em curso e uma abandonada por cancelamento)
+        self._owns_session = session is None
+        self.session = session or ApiSession(api_key, self.api_base)
+        # RunMetrics e CostLedger do documento atual (definidos pelo DocumentProcessor)
+        self.metrics = None
+        self.ledger = None
+        # ProcessingControl da execução atual (None = sem pausa/cancelamento)
+        self.control = None
         self.logger = logging.getLogger(__name__)
     
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        """Mensagem da API sem corpo e cabeçalhos HTTP (que mudam a cada tentativa)"""
+        info = getattr(error, 'error', None)
+        message = str((info.get('message') if isinstance(info, dict) else None) or error).strip()
+        return message.splitlines()[0] if message else type(error).__name__
+    
+    def close(self):
+        """Encerra a sessão própria (a compartilhada fica com o dono)"""
+        if self._owns_session:
+            self.session.close()
+    
+    @classmethod
+    def _retry_delay(cls, error: Exception, attempt: int) -> float:
+        """Espera antes da próxima tentativa: Retry-After da resposta (429/503) ou 1s, 2s, ..."""
+        value = (getattr(error, 'headers', None) or {}).get('Retry-After')
+        delay = None
+        if value:
+            try:
+                delay = float(value)
+            except ValueError:
+                try:
+                    # Também pode vir como data HTTP
+                    delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        # Valores inválidos (inf, nan) contam como ausentes
+        if delay is None or not math.isfinite(delay):
+            return 2 ** attempt
+        return min(max(0.0, delay), cls.MAX_RETRY_AFTER)
+    
+    def _create_completion(self, **kwargs):
+        """Chama a API; com controle, a requisição roda em uma thread daemon que pode ser abandonada
+        
+        A leitura HTTP bloqueante não é interrompida: ao cancelar, a espera
+        termina na hora e a thread da requisição, daemon e com limite de
+        leitura de CANCELLABLE_TIMEOUT, não segura o encerramento do programa.
+        """
+        if self.control is None:
+            return self.session.chat_completion(**kwargs)
+        self.control.check()
+        future = Future()
+        
+        def request():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self.session.chat_completion(request_timeout=self.CANCELLABLE_TIMEOUT,
+                                                               **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=request, name="openai-request", daemon=True).start()
+        return self.control.wait_for(future)
+    
     def create_revision_prompt(self) -> str:
         """Prompt para identificar APENAS erros"""
         return """Você é um revisor gramatical de material didático.
@@ -35,7 +170,7 @@ REGRAS CRÍTICAS:
 2. NUNCA corrija conteúdo de questões ou alternativas
 3. PRESERVE erros propositais em alternativas (são pedagógicos)
 4. NÃO adicione ponto final em títulos, entenda o contexto ao ler o material
-5. IGNORE marcações entre < > ou [ ]
+5. IGNORE marcações entre < > ou [ ] e os marcadores __URL_n__, __EMAIL_n__, __MARKUP_n__ (nunca os altere)
 6. line = número da linha aproximado onde está o erro
 
 IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
@@ -55,6 +190,8 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
                 corrections = self.identify_errors(text, i)
                 if corrections:
                     all_corrections.extend(corrections)
+            except ProcessingCancelled:
+                raise
             except Exception as e:
                 self.logger.error(f"Erro ao analisar texto {i + 1}: {str(e)}")
         
@@ -62,18 +199,23 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
     
     # No método identify_errors do api_client.py, corrija:
 
-    def identify_errors(self, text: str, text_index: int = 0) -> List[Dict]:
+    def identify_errors(self, text: str, text_index: int = 0, system_prompt: str = None,
+                        number_lines: bool = True) -> List[Dict]:
         """Identifica apenas os erros no texto"""
-        prompt = self.create_revision_prompt()
+        prompt = system_prompt or self.create_revision_prompt()
         
         # Adiciona números de linha para referência
-        lines = text.split('\n')
-        numbered_text = '\n'.join([f"{i+1}: {line}" for i, line in enumerate(lines)])
+        if number_lines:
+            lines = text.split('\n')
+            numbered_text = '\n'.join([f"{i+1}: {line}" for i, line in enumerate(lines)])
+        else:
+            numbered_text = text
         
         for attempt in range(3):
+            start = time.perf_counter()
             try:
                 # SEMPRE usa max_completion_tokens para gpt-4o-mini
-                response = openai.ChatCompletion.create(
+                response = self._create_completion(
                     model=self.model,
                     messages=[
                         {"role": "system", "content": prompt},
@@ -86,6 +228,15 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
                     presence_penalty=0
                 )
                 
+                usage = response.get('usage') or {}
+                if self.metrics:
+                    self.metrics.record_request(time.perf_counter() - start, True, attempt > 0,
+                                                usage.get('prompt_tokens', 0),
+                                                usage.get('completion_tokens', 0))
+                if self.ledger:
+                    self.ledger.record(text_index, usage.get('prompt_tokens', 0),
+                                       usage.get('completion_tokens', 0))
+                
                 result = response.choices[0].message.content.strip()
                 
                 # Parse JSON
@@ -101,12 +252,28 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
                     
                 except json.JSONDecodeError:
                     self.logger.error(f"Resposta não é JSON válido: {result}")
+                    if self.metrics:
+                        self.metrics.increment('invalid_json')
                     return []
                     
+            except ProcessingCancelled:
+                self.logger.info(f"Requisição abandonada (bloco {text_index + 1}): processamento cancelado")
+                raise
             except Exception as e:
-                self.logger.error(f"Tentativa {attempt + 1} falhou: {str(e)}")
+                if self.metrics:
+                    self.metrics.record_request(time.perf_counter() - start, False, attempt > 0)
+                # Mensagem curta no log principal; a exceção completa vai para o de depuração
+                self.logger.error(f"Tentativa {attempt + 1} falhou: {self._error_message(e)}")
+                logging.getLogger(DETAIL_LOGGER).debug("Tentativa %d falhou (bloco %s): %r",
+                                                       attempt + 1, text_index, e)
                 if attempt < 2:
-                    time.sleep(2 ** attempt)
+                    delay = self._retry_delay(e, attempt)
+                    if self.control:
+                        # Espera interrompível; pausado, não volta a chamar a API
+                        if not self.control.sleep(delay) or not self.control.wait_if_paused():
+                            raise ProcessingCancelled()
+                    else:
+                        time.sleep(delay)
                 else:
                     return []
         
@@ -115,10 +282,9 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
 
     # No api_client.py, adicione este método:
 
-    def identify_errors_precise(self, text: str, block_index: int = 0) -> List[Dict]:
-        """Identifica erros com MÁXIMA precisão - não deixa NADA passar"""
-        
-        prompt = """Você é um revisor EXTREMAMENTE MINUCIOSO. Sua missão é encontrar TODOS os erros gramaticais.
+    def create_precise_prompt(self) -> str:
+        """Prompt do revisor minucioso (blocos com ids "#<id><tipo>")"""
+        return """Você é um revisor EXTREMAMENTE MINUCIOSO. Sua missão é encontrar TODOS os erros gramaticais.
 
     ANALISE CADA PALAVRA, CADA VÍRGULA, CADA ACENTO!
 
@@ -131,7 +297,13 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
     6. TODA crase faltando ou sobrando
     7. TODA letra que deveria ser maiúscula
 
-    Para cada parágrafo marcado como [PARÁGRAFO X], examine PALAVRA POR PALAVRA.
+    FORMATO DO TEXTO:
+    Cada parágrafo começa em uma nova linha com #<id><tipo> seguido do texto.
+    Tipos: T = título/cabeçalho (não adicione ponto final), L = item de lista
+    (preserve a formatação), C = célula de tabela, N = parágrafo normal (DEVE
+    terminar com ponto final). Exemplo: "#3N o menino foi pra escola"
+
+    Examine CADA parágrafo PALAVRA POR PALAVRA.
 
     FORMATO DE RESPOSTA:
     {
@@ -142,7 +314,7 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
     }
 
     IMPORTANTE:
-    - O número do parágrafo é o X em [PARÁGRAFO X]
+    - "paragraph" é o id numérico de #<id><tipo>
     - Seja OBSESSIVO com detalhes
     - É melhor reportar demais do que de menos
     - Examine CADA palavra como se fosse a última
@@ -150,12 +322,12 @@ IMPORTANTE: Retorne APENAS o JSON, sem explicações."""
     - Verifique concordância de TODOS os sujeitos com verbos
     - Verifique TODA pontuação
 
-    [TIPO: TÍTULO/CABEÇALHO] = não adicione ponto final
-    [TIPO: ITEM DE LISTA] = preserve formatação de lista
-    [TIPO: CÉLULA DE TABELA] = texto de tabela
-    [TIPO: PARÁGRAFO NORMAL] = DEVE terminar com ponto final
+    __URL_n__, __EMAIL_n__, __MARKUP_n__ = marcadores de conteúdo preservado, NUNCA os altere
 
     Se não houver NENHUM erro: {"corrections": []}"""
-        
-        # Mesma lógica de chamada mas com prompt mais rigoroso
-        return self.identify_errors(text, block_index)
\ No newline at end of file
+    
+    def identify_errors_precise(self, text: str, block_index: int = 0) -> List[Dict]:
+        """Identifica erros com MÁXIMA precisão - não deixa NADA passar"""
+        # Mesma lógica de chamada mas com prompt mais rigoroso (o bloco já traz ids)
+        return self.identify_errors(text, block_index, system_prompt=self.create_precise_prompt(),
+                                    number_lines=False)
\ No newline at end of file
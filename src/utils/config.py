@@ -20,6 +20,63 @@ class Config:
         self.MODEL = config.get("model", "o4-mini")
         self.MAX_TOKENS_PER_CHUNK = config.get("max_tokens_per_chunk", 200000)  # Aumentado!
         self.MAX_RETRIES = config.get("max_retries", 3)
+        # Documentos processados ao mesmo tempo pela fila da interface
+        self.MAX_CONCURRENT_DOCUMENTS = config.get("max_concurrent_documents", 2)
+        # URL base da API de chat (vazio = OpenAI); aceita o servidor simulado local
+        self.API_BASE = config.get("api_base", "")
+        # Formatos da comparação: "docx" (completa), "html" e "json" (relatórios leves)
+        self.COMPARISON_FORMATS = config.get("comparison_formats", ["docx"])
+        # Pré-filtro ortográfico local (lexicon_path vazio = léxico embutido)
+        self.PREFILTER = config.get("prefilter", {
+            "enabled": False,
+            "lexicon_path": "",
+            "sample_rate": 0.05
+        })
+        # Propagação de correções recorrentes (mode: "apply" ou "flag")
+        self.PROPAGATION = config.get("propagation", {
+            "enabled": True,
+            "mode": "apply",
+            "min_occurrences": 2
+        })
+        # Parágrafos quase idênticos reaproveitam as correções do representante
+        self.NEAR_DUPLICATES = config.get("near_duplicates", {
+            "enabled": False,
+            "threshold": 0.9
+        })
+        # Métricas por execução (<saída>_metrics.json e, opcionalmente, arquivo do Prometheus)
+        self.METRICS = config.get("metrics", {
+            "enabled": True,
+            "prometheus_path": ""
+        })
+        # Preços por modelo (USD por 1M tokens, sobrescrevem os padrões) e orçamento (0 = sem limite)
+        self.COST = config.get("cost", {
+            "prices": {},
+            "max_tokens": 0,
+            "max_cost": 0.0
+        })
+        # Perfilamento (cProfile + tracemalloc em output/logs); também ligado por WORD_REVISOR_PROFILE=1
+        self.PROFILING = config.get("profiling", {
+            "enabled": False,
+            "top": 30
+        })
+        # Logs com rotação por tamanho; debug_log grava o detalhe por correção em arquivo separado
+        self.LOGGING = config.get("logging", {
+            "max_bytes": 5242880,
+            "backup_count": 5,
+            "debug_log": False,
+            "repeat_interval": 60
+        })
+        # Pré-análise ao adicionar o arquivo (blocos e estimativas); keep_warm = documentos
+        # mantidos já lidos na memória para o processamento começar direto pela análise
+        self.PREFLIGHT = config.get("preflight", {
+            "enabled": True,
+            "keep_warm": 4
+        })
+        # Histórico de revisões em SQLite (caminho do banco e itens por página na lista)
+        self.HISTORY = config.get("history", {
+            "db_path": "output/history.sqlite3",
+            "page_size": 50
+        })
         self.OUTPUT_PATHS = config.get("output_paths", {
             "revised": "output/revised",
             "comparisons": "output/comparisons",
@@ -32,6 +89,50 @@ class Config:
             "model": "o4-mini",  # GPT-4.1 como padrão
             "max_tokens_per_chunk": 200000,  # Para aproveitar a janela de 1M
             "max_retries": 3,
+            "max_concurrent_documents": 2,
+            "api_base": "",
+            "comparison_formats": ["docx"],
+            "prefilter": {
+                "enabled": False,
+                "lexicon_path": "",
+                "sample_rate": 0.05
+            },
+            "propagation": {
+                "enabled": True,
+                "mode": "apply",
+                "min_occurrences": 2
+            },
+            "near_duplicates": {
+                "enabled": False,
+                "threshold": 0.9
+            },
+            "metrics": {
+                "enabled": True,
+                "prometheus_path": ""
+            },
+            "cost": {
+                "prices": {},
+                "max_tokens": 0,
+                "max_cost": 0.0
+            },
+            "profiling": {
+                "enabled": False,
+                "top": 30
+            },
+            "logging": {
+                "max_bytes": 5242880,
+                "backup_count": 5,
+                "debug_log": False,
+                "repeat_interval": 60
+            },
+            "preflight": {
+                "enabled": True,
+                "keep_warm": 4
+            },
+            "history": {
+                "db_path": "output/history.sqlite3",
+                "page_size": 50
+            },
             "output_paths": {
                 "revised": "output/revised",
                 "comparisons": "output/comparisons",
@@ -0,0 +1,134 @@
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict
+
+# Preço em USD por 1 milhão de tokens (entrada, saída); config.json pode sobrescrever
+DEFAULT_PRICES = {
+    "gpt-4.1": {"prompt": 2.00, "completion": 8.00},
+    "gpt-4.1-mini": {"prompt": 0.40, "completion": 1.60},
+    "gpt-4.1-nano": {"prompt": 0.10, "completion": 0.40},
+    "gpt-4o": {"prompt": 2.50, "completion": 10.00},
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.60},
+    "o4-mini": {"prompt": 1.10, "completion": 4.40},
+    "gpt-3.5-turbo": {"prompt": 0.50, "completion": 1.50},
+}
+
+
+def _totals() -> Dict:
+    return {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0, 'corrections': 0}
+
+
+class CostLedger:
+    """Registro de tokens e custo estimado por bloco e por documento
+
+    O cliente da API registra o uso informado em response.usage a cada
+    resposta; o processador consulta exceeded() antes de cada bloco para
+    respeitar os limites de tokens e de custo (0 = sem limite).
+    """
+
+    def __init__(self, model: str, prices: Dict = None, max_tokens: int = 0, max_cost: float = 0.0,
+                 currency: str = "USD"):
+        self.logger = logging.getLogger(__name__)
+        self.model = model
+        table = dict(DEFAULT_PRICES)
+        table.update(prices or {})
+        self.price = table.get(model)
+        if self.price is None:
+            self.logger.warning(f"Sem tabela de preço para o modelo {model}: custo será 0")
+        self.max_tokens = max_tokens or 0
+        self.max_cost = max_cost or 0.0
+        self.currency = currency
+        self.blocks = {}
+        self.document = _totals()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, model: str, settings: Dict):
+        """Cria o registro a partir da seção "cost" do config"""
+        settings = settings or {}
+        return cls(model, settings.get("prices"), settings.get("max_tokens", 0),
+                   settings.get("max_cost", 0.0), settings.get("currency", "USD"))
+
+    def cost_of(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Custo estimado de uma quantidade de tokens"""
+        if not self.price:
+            return 0.0
+        return (prompt_tokens * self.price["prompt"] + completion_tokens * self.price["completion"]) / 1_000_000
+
+    def record(self, block, prompt_tokens: int, completion_tokens: int):
+        """Registra o uso de uma resposta da API"""
+        cost = self.cost_of(prompt_tokens, completion_tokens)
+        with self._lock:
+            for totals in (self.blocks.setdefault(block, _totals()), self.document):
+                totals['requests'] += 1
+                totals['prompt_tokens'] += prompt_tokens
+                totals['completion_tokens'] += completion_tokens
+                totals['cost'] += cost
+
+    def add_corrections(self, block, count: int):
+        """Associa ao bloco as correções aplicadas (custo por correção)"""
+        with self._lock:
+            self.blocks.setdefault(block, _totals())['corrections'] += count
+            self.document['corrections'] += count
+
+    @property
+    def limited(self) -> bool:
+        """Há limite de tokens ou de custo"""
+        return bool(self.max_tokens or self.max_cost)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.document['prompt_tokens'] + self.document['completion_tokens']
+
+    def exceeded(self, upcoming_prompt: int = 0, upcoming_completion: int = 0) -> str:
+        """Motivo de parada se o orçamento foi (ou seria) ultrapassado; '' caso contrário
+
+        upcoming_prompt/upcoming_completion: projeção do próximo envio (texto
+        mais prompt do sistema, e a resposta esperada). Depois da primeira
+        resposta, a proporção resposta/envio observada no documento e a média
+        por requisição valem quando forem maiores.
+        """
+        requests = self.document['requests']
+        if requests and self.document['prompt_tokens']:
+            ratio = self.document['completion_tokens'] / self.document['prompt_tokens']
+            upcoming_completion = max(upcoming_completion, int(upcoming_prompt * ratio))
+        upcoming_tokens = upcoming_prompt + upcoming_completion
+        upcoming_cost = self.cost_of(upcoming_prompt, upcoming_completion)
+        if requests:
+            upcoming_tokens = max(upcoming_tokens, self.total_tokens / requests)
+            upcoming_cost = max(upcoming_cost, self.document['cost'] / requests)
+
+        if self.max_tokens and self.total_tokens + upcoming_tokens > self.max_tokens:
+            return f"limite de tokens ({self.max_tokens})"
+        if self.max_cost and self.document['cost'] + upcoming_cost > self.max_cost:
+            return f"limite de custo ({self.max_cost:.2f} {self.currency})"
+        return ''
+
+    def summary(self) -> Dict:
+        """Totais do documento (sem o detalhamento por bloco)"""
+        document = dict(self.document)
+        document['cost'] = round(document['cost'], 6)
+        document['cost_per_correction'] = (round(document['cost'] / document['corrections'], 6)
+                                           if document['corrections'] else None)
+        return {
+            'model': self.model,
+            'currency': self.currency,
+            'price_per_million': self.price,
+            'budget': {'max_tokens': self.max_tokens, 'max_cost': self.max_cost},
+            'document': document
+        }
+
+    def save(self, path: str, run_totals: Dict = None):
+        """Grava o registro completo (blocos, documento e execução) em JSON"""
+        data = self.summary()
+        data['generated_at'] = datetime.now().isoformat(timespec='seconds')
+        # Blocos são registrados pelo índice (base 0) e gravados pelo número
+        data['blocks'] = [{'block': index + 1, **totals, 'cost': round(totals['cost'], 6)}
+                          for index, totals in sorted(self.blocks.items())]
+        if run_totals is not None:
+            data['run'] = run_totals
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return path
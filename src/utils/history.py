@@ -0,0 +1,173 @@
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+SCHEMA_VERSION = 1
+
+# Colunas gravadas por add() além de created_at e name
+FIELDS = ('original_path', 'revised_path', 'comparison_path', 'report_path', 'status', 'seconds',
+          'prompt_tokens', 'completion_tokens', 'cost', 'currency', 'corrections', 'api_corrections')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    name TEXT NOT NULL,
+    original_path TEXT,
+    revised_path TEXT NOT NULL,
+    comparison_path TEXT,
+    report_path TEXT,
+    status TEXT,
+    seconds REAL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    cost REAL,
+    currency TEXT,
+    corrections INTEGER,
+    api_corrections INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_revisions_created ON revisions(created_at);
+"""
+
+
+class RevisionHistory:
+    """Histórico de revisões em SQLite
+
+    A lista é paginada por id (keyset: cada página pede os registros
+    anteriores ao último exibido), então o custo de abrir o histórico não
+    cresce com o número de revisões. A busca compara o nome do documento e
+    os caminhos, sem diferenciar maiúsculas.
+    """
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Uma conexão compartilhada; o lock serializa o acesso entre threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.created = self._migrate()
+
+    @classmethod
+    def from_config(cls, settings: Dict, output_paths: Dict = None):
+        """Abre o banco da seção "history"; na criação importa os revisados já existentes"""
+        settings = settings or {}
+        history = cls(settings.get("db_path", "output/history.sqlite3"))
+        if history.created and output_paths:
+            history.import_directory(output_paths.get("revised", ""), output_paths.get("comparisons", ""))
+        return history
+
+    def _migrate(self) -> bool:
+        """Cria o esquema; retorna True se o banco acabou de ser criado"""
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            # WAL: a interface lê enquanto o modo linha de comando grava
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            if version < SCHEMA_VERSION:
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return version == 0
+
+    def add(self, revised_path: str, original_path: str = None, created_at: str = None, **fields) -> int:
+        """Registra uma revisão; retorna o id"""
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Campos desconhecidos no histórico: {', '.join(sorted(unknown))}")
+        fields.update(revised_path=revised_path, original_path=original_path)
+        columns = ['created_at', 'name'] + list(fields)
+        values = [created_at or datetime.now().isoformat(timespec='seconds'),
+                  os.path.basename(original_path or revised_path)] + list(fields.values())
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO revisions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                values
+            )
+        return cursor.lastrowid
+
+    def page(self, limit: int = 50, before_id: int = None, search: str = '') -> List[Dict]:
+        """Próxima página (mais recentes primeiro) anterior a before_id"""
+        where, params = self._filter(search)
+        if before_id is not None:
+            where.append("id < ?")
+            params.append(before_id)
+        sql = "SELECT * FROM revisions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, search: str = '') -> int:
+        where, params = self._filter(search)
+        sql = "SELECT COUNT(*) FROM revisions" + (" WHERE " + " AND ".join(where) if where else "")
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def get(self, revision_id: int) -> Dict:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM revisions WHERE id = ?", (revision_id,)).fetchone()
+        return dict(row) if row else None
+
+    def usage_rates(self, limit: int = 50) -> Dict:
+        """Taxas observadas nas últimas revisões concluídas, para calibrar estimativas
+
+        Retorna 'completion_ratio' (tokens de resposta por token enviado) e
+        'seconds_per_1k_tokens'; vazio se ainda não há revisões com uso registrado.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), SUM(prompt_tokens), SUM(completion_tokens), SUM(seconds) FROM "
+                "(SELECT prompt_tokens, completion_tokens, seconds FROM revisions "
+                " WHERE status = 'Concluído' AND prompt_tokens > 0 AND seconds > 0 "
+                " ORDER BY id DESC LIMIT ?)", (limit,)
+            ).fetchone()
+        samples, prompt, completion, seconds = row
+        if not samples:
+            return {}
+        return {
+            'completion_ratio': completion / prompt,
+            'seconds_per_1k_tokens': seconds / (prompt + completion) * 1000,
+            'samples': samples
+        }
+
+    @staticmethod
+    def _filter(search: str):
+        if not search or not search.strip():
+            return [], []
+        escaped = search.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f"%{escaped}%"
+        return (["(name LIKE ? ESCAPE '\\' OR original_path LIKE ? ESCAPE '\\' "
+                 "OR revised_path LIKE ? ESCAPE '\\')"], [pattern] * 3)
+
+    def import_directory(self, revised_dir: str, comparisons_dir: str = '') -> int:
+        """Importa os .docx de uma pasta de revisados (histórico anterior ao banco)"""
+        if not revised_dir or not os.path.isdir(revised_dir):
+            return 0
+        files = [f for f in os.listdir(revised_dir) if f.endswith('.docx')]
+        # Mais antigos primeiro: os ids seguem a ordem cronológica
+        files.sort(key=lambda f: os.path.getmtime(os.path.join(revised_dir, f)))
+        for file in files:
+            revised_path = os.path.join(revised_dir, file)
+            comparison_path = os.path.join(comparisons_dir, file.replace('_revisado_', '_comparacao_'))
+            report_path = revised_path.replace('.docx', '_complete_report.json')
+            self.add(
+                revised_path,
+                created_at=datetime.fromtimestamp(os.path.getmtime(revised_path)).isoformat(timespec='seconds'),
+                comparison_path=comparison_path if comparisons_dir and os.path.exists(comparison_path) else None,
+                report_path=report_path if os.path.exists(report_path) else None,
+                status="Importado"
+            )
+        if files:
+            self.logger.info(f"Histórico: {len(files)} revisões importadas de {revised_dir}")
+        return len(files)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
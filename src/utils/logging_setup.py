@@ -0,0 +1,98 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from .config import Config
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Logger dos detalhes por correção (nível DEBUG, gravados só no log de depuração)
+DETAIL_LOGGER = "word_revisor.detail"
+
+_listener = None
+
+
+class RepeatFilter(logging.Filter):
+    """Limita avisos e erros idênticos repetidos
+
+    A mesma mensagem (WARNING ou acima) passa no máximo uma vez por intervalo;
+    a próxima que passar informa quantas foram suprimidas.
+    """
+
+    def __init__(self, interval: float = 60.0):
+        super().__init__()
+        self.interval = interval
+        self._seen = {}  # (logger, nível, mensagem) -> [última emissão, suprimidas]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.interval <= 0:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry and now - entry[0] < self.interval:
+                entry[1] += 1
+                return False
+            suppressed = entry[1] if entry else 0
+            self._seen[key] = [now, 0]
+            if len(self._seen) > 10000:
+                self._seen.clear()
+        if suppressed:
+            record.msg = f"{record.getMessage()} (repetida {suppressed}x)"
+            record.args = None
+        return True
+
+
+def setup_logging():
+    """Configura logging assíncrono: a thread que loga só enfileira o registro
+
+    Um QueueListener grava em arquivo com rotação por tamanho, no console e,
+    se habilitado, em um log de depuração separado com o detalhe por correção.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    config = Config()
+    settings = config.LOGGING
+    log_dir = config.OUTPUT_PATHS.get("logs", "output/logs")
+    os.makedirs(log_dir, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+    max_bytes = settings.get("max_bytes", 5 * 1024 * 1024)
+    backup_count = settings.get("backup_count", 5)
+
+    file_handler = RotatingFileHandler(os.path.join(log_dir, "word_revisor.log"), maxBytes=max_bytes,
+                                       backupCount=backup_count, encoding='utf-8')
+    console_handler = logging.StreamHandler()
+    handlers = [file_handler, console_handler]
+    for handler in handlers:
+        handler.setLevel(logging.INFO)
+
+    if settings.get("debug_log", False):
+        debug_handler = RotatingFileHandler(os.path.join(log_dir, "word_revisor_debug.log"),
+                                            maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        debug_handler.setLevel(logging.DEBUG)
+        handlers.append(debug_handler)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RepeatFilter(settings.get("repeat_interval", 60)))
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+    # Sem log de depuração, o detalhe por correção nem chega a ser formatado
+    logging.getLogger(DETAIL_LOGGER).setLevel(
+        logging.DEBUG if settings.get("debug_log", False) else logging.INFO
+    )
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
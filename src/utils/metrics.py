@@ -0,0 +1,256 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+
+from .profiling import record_stage
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentil com interpolação linear (values já ordenados)"""
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def format_seconds(seconds: float) -> str:
+    """Duração em mm:ss (hh:mm:ss acima de uma hora)"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+class ThroughputMeter:
+    """Vazão em média móvel e tempo restante estimado
+
+    Mede unidades de trabalho (caracteres enviados à API) em vez de blocos,
+    que variam muito de tamanho. A vazão considera só as amostras da janela
+    (em segundos), acompanhando mudanças de latência da API.
+    """
+
+    def __init__(self, total: int = 0, window: float = 60.0):
+        self.total = total
+        self.done = 0
+        self.window = window
+        self._samples = deque()
+        self._lock = threading.Lock()
+
+    def start(self, total: int):
+        """Define o total e marca o início da medição"""
+        with self._lock:
+            self.total = total
+            self.done = 0
+            self._samples = deque([(time.perf_counter(), 0)])
+
+    def advance(self, amount: int):
+        """Registra trabalho concluído"""
+        now = time.perf_counter()
+        with self._lock:
+            self.done += amount
+            self._samples.append((now, self.done))
+            # Mantém ao menos duas amostras para sempre haver uma vazão
+            while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+                self._samples.popleft()
+
+    @property
+    def rate(self) -> float:
+        """Unidades por segundo na janela (0 antes da primeira amostra)"""
+        with self._lock:
+            if len(self._samples) < 2:
+                return 0.0
+            (first_time, first_done), (last_time, last_done) = self._samples[0], self._samples[-1]
+            elapsed = last_time - first_time
+            return (last_done - first_done) / elapsed if elapsed > 0 else 0.0
+
+    def eta(self):
+        """Segundos restantes (None sem vazão medida)"""
+        rate = self.rate
+        if not rate:
+            return None
+        with self._lock:
+            remaining = (self.total - self.done) / rate
+            # Desconta o tempo desde a última amostra: a contagem segue entre blocos
+            since_last = time.perf_counter() - self._samples[-1][0]
+        return max(remaining - since_last, 0.0)
+
+
+class RunMetrics:
+    """Métricas estruturadas de uma execução (etapas, requisições e tokens)
+
+    As etapas sequenciais são marcadas com lap(); trechos repetidos (como a
+    aplicação das correções de cada bloco) acumulam tempo com stage(). As
+    requisições são registradas pelo cliente da API, uma por tentativa HTTP.
+    """
+
+    def __init__(self, document: str = ''):
+        self.document = document
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages = {}
+        self.counters = {}
+        self.paragraphs = 0
+        self.latencies = []
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.throughput = ThroughputMeter()
+        self._request_times = deque()
+        self._start = time.perf_counter()
+        self._mark = self._start
+        self._lock = threading.Lock()
+        self._paths = (None, None)
+
+    def lap(self, name: str):
+        """Encerra a etapa sequencial atual (tempo desde a última marca)"""
+        now = time.perf_counter()
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + now - self._mark
+            self._mark = now
+        record_stage(name)
+
+    def mark(self):
+        """Reinicia a contagem da etapa sequencial (tempo já registrado por outro meio)"""
+        with self._lock:
+            self._mark = time.perf_counter()
+
+    def add_stage(self, name: str, seconds: float):
+        """Soma tempo a uma etapa"""
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        """Acumula o tempo do trecho na etapa"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_request(self, latency: float, ok: bool, retry: bool = False,
+                       prompt_tokens: int = 0, completion_tokens: int = 0):
+        """Registra uma tentativa de chamada à API"""
+        with self._lock:
+            self.requests += 1
+            self.latencies.append(latency)
+            self.failures += not ok
+            self.retries += retry
+            self.prompt_tokens += prompt_tokens or 0
+            self.completion_tokens += completion_tokens or 0
+            self._request_times.append(time.perf_counter())
+
+    def live(self) -> Dict:
+        """Andamento para exibição durante a execução (vazão, ETA, requisições)"""
+        meter = self.throughput
+        now = time.perf_counter()
+        with self._lock:
+            while self._request_times and now - self._request_times[0] > meter.window:
+                self._request_times.popleft()
+            window = min(meter.window, now - self._start)
+            return {
+                'done': meter.done,
+                'total': meter.total,
+                'chars_per_second': round(meter.rate, 1),
+                'eta': meter.eta(),
+                'requests_per_minute': round(len(self._request_times) * 60 / window, 1) if window > 0 else 0.0,
+                'requests': self.requests,
+                'retries': self.retries,
+                'failures': self.failures
+            }
+
+    def summary(self) -> Dict:
+        """Resumo serializável da execução"""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            total = time.perf_counter() - self._start
+            return {
+                'document': self.document,
+                'started_at': self.started_at,
+                'total_seconds': round(total, 4),
+                'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+                'paragraphs': self.paragraphs,
+                'paragraphs_per_second': round(self.paragraphs / total, 2) if total else 0.0,
+                'characters': self.throughput.done,
+                'characters_per_second': round(self.throughput.done / total, 1) if total else 0.0,
+                'requests': {
+                    'count': self.requests,
+                    'failures': self.failures,
+                    'retries': self.retries,
+                    'latency_p50': round(percentile(latencies, 0.5), 4),
+                    'latency_p95': round(percentile(latencies, 0.95), 4),
+                    'latency_max': round(latencies[-1], 4) if latencies else 0.0,
+                    'latency_total': round(sum(latencies), 4)
+                },
+                'tokens': {
+                    'prompt': self.prompt_tokens,
+                    'completion': self.completion_tokens,
+                    'total': self.prompt_tokens + self.completion_tokens
+                },
+                'counters': dict(self.counters)
+            }
+
+    def to_prometheus(self, summary: Dict = None) -> str:
+        """Resumo no formato texto do Prometheus (node_exporter textfile)"""
+        summary = summary or self.summary()
+        label = os.path.basename(summary['document']).replace('\\', '\\\\').replace('"', '\\"')
+        doc = f'document="{label}"'
+        requests = summary['requests']
+        lines = []
+
+        def metric(name, help_text, samples, kind='gauge'):
+            lines.append(f'# HELP word_revisor_{name} {help_text}')
+            lines.append(f'# TYPE word_revisor_{name} {kind}')
+            for labels, value in samples:
+                lines.append(f'word_revisor_{name}{{{doc}{labels}}} {value}')
+
+        metric('stage_seconds', 'Tempo por etapa do processamento',
+               [(f',stage="{name}"', seconds) for name, seconds in summary['stages'].items()])
+        metric('run_seconds', 'Tempo total da execução', [('', summary['total_seconds'])])
+        metric('paragraphs', 'Parágrafos do documento', [('', summary['paragraphs'])])
+        metric('paragraphs_per_second', 'Vazão em parágrafos por segundo',
+               [('', summary['paragraphs_per_second'])])
+        metric('requests_total', 'Tentativas de chamada à API', [('', requests['count'])], 'counter')
+        metric('request_failures_total', 'Tentativas com falha', [('', requests['failures'])], 'counter')
+        metric('request_retries_total', 'Novas tentativas após falha', [('', requests['retries'])], 'counter')
+        metric('request_latency_seconds', 'Latência das chamadas à API',
+               [(',quantile="0.5"', requests['latency_p50']), (',quantile="0.95"', requests['latency_p95'])])
+        metric('tokens_total', 'Tokens informados pela API',
+               [(',kind="prompt"', summary['tokens']['prompt']),
+                (',kind="completion"', summary['tokens']['completion'])], 'counter')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, json_path: str = None, prometheus_path: str = None):
+        """Grava o JSON da execução e, se indicado, o arquivo do Prometheus
+
+        Os caminhos ficam guardados: chamadas seguintes sem argumentos
+        regravam os mesmos arquivos (ex.: após a etapa de comparação).
+        """
+        json_path = json_path or self._paths[0]
+        prometheus_path = prometheus_path or self._paths[1]
+        self._paths = (json_path, prometheus_path)
+        summary = self.summary()
+
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        if prometheus_path:
+            # Escrita atômica: o coletor nunca lê um arquivo pela metade
+            directory = os.path.dirname(prometheus_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = prometheus_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus(summary))
+            os.replace(temp_path, prometheus_path)
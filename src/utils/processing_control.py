@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+
+class ProcessingCancelled(Exception):
+    """Processamento cancelado pelo usuário"""
+
+
+class ProcessingControl:
+    """Sinais cooperativos de pausa e cancelamento de um processamento
+
+    A interface (ou o modo linha de comando) chama pause(), resume() e
+    cancel(); o processador consulta o estado entre blocos e o cliente da API
+    enquanto espera respostas e novas tentativas.
+    """
+
+    # Intervalo com que esperas longas verificam o cancelamento
+    POLL_INTERVAL = 0.1
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()  # Libera quem estiver pausado
+
+    def pause(self):
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def check(self):
+        """Interrompe com ProcessingCancelled se houve cancelamento"""
+        if self._cancelled.is_set():
+            raise ProcessingCancelled()
+
+    def wait_if_paused(self) -> bool:
+        """Bloqueia enquanto pausado; retorna False se foi cancelado"""
+        self._running.wait()
+        return not self._cancelled.is_set()
+
+    def sleep(self, seconds: float) -> bool:
+        """Espera interrompível; retorna False se foi cancelado"""
+        return not self._cancelled.wait(seconds)
+
+    def wait_for(self, future: Future):
+        """Resultado do future, abandonando a espera se houver cancelamento"""
+        while True:
+            try:
+                return future.result(timeout=self.POLL_INTERVAL)
+            except FutureTimeout:
+                self.check()
@@ -0,0 +1,112 @@
+import os
+import io
+import pstats
+import logging
+import cProfile
+import functools
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Dict
+
+from .config import Config
+
+# Variável de ambiente que liga o perfilamento sem editar o config.json
+PROFILE_ENV = "WORD_REVISOR_PROFILE"
+
+_settings = None          # None = desligado (o decorador só testa este valor)
+_lock = threading.Lock()  # Um perfilamento por vez (cProfile não aceita sessões simultâneas)
+_stage_peaks = []
+
+
+def setup_profiling(settings: Dict = None, log_dir: str = None):
+    """Liga o perfilamento conforme a seção "profiling" do config ou a variável de ambiente"""
+    global _settings
+    config = Config()
+    settings = dict(settings if settings is not None else config.PROFILING)
+    if os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on"):
+        settings["enabled"] = True
+
+    if not settings.get("enabled"):
+        _settings = None
+        return
+
+    settings["log_dir"] = log_dir or config.OUTPUT_PATHS.get("logs", "output/logs")
+    os.makedirs(settings["log_dir"], exist_ok=True)
+    _settings = settings
+    logging.getLogger(__name__).info(f"Perfilamento ativo (resultados em {settings['log_dir']})")
+
+
+def record_stage(name: str):
+    """Registra o pico de memória da etapa que terminou (sem efeito se desligado)
+
+    Só lê o pico e o zera: um snapshot por etapa distorceria o cProfile.
+    """
+    if _settings is None or not _lock.locked() or not tracemalloc.is_tracing():
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    _stage_peaks.append((name, peak, current))
+    tracemalloc.reset_peak()
+
+
+def profiled(name: str):
+    """Decorador: com o perfilamento ligado, grava cProfile e tracemalloc da chamada
+
+    Desligado, o custo é apenas o teste de _settings a cada chamada.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _settings is None or not _lock.acquire(blocking=False):
+                return func(*args, **kwargs)
+            try:
+                return _run_profiled(name, func, args, kwargs)
+            finally:
+                _lock.release()
+        return wrapper
+    return decorator
+
+
+def _run_profiled(name: str, func, args, kwargs):
+    settings = _settings
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(settings.get("traceback_depth", 1))
+    tracemalloc.reset_peak()
+    _stage_peaks.clear()
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        # reset_peak a cada etapa: o pico da chamada é o maior entre as etapas
+        peak = max([tracemalloc.get_traced_memory()[1]] + [p for _, p, _ in _stage_peaks])
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+        _write_results(name, settings, profiler, peak, snapshot)
+
+
+def _write_results(name: str, settings: Dict, profiler: cProfile.Profile, peak: int, snapshot):
+    """Grava o .prof (para snakeviz/pstats) e o resumo em texto"""
+    base = os.path.join(settings["log_dir"], f"profile_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    profiler.dump_stats(f"{base}.prof")
+
+    top = settings.get("top", 30)
+    out = io.StringIO()
+    out.write(f"Perfil de {name}\n\n")
+    for sort_key in ("cumulative", "tottime"):
+        out.write(f"=== Top {top} por {sort_key} ===\n")
+        pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(sort_key).print_stats(top)
+
+    out.write(f"=== Memória (tracemalloc) ===\nPico total: {peak / 1024 / 1024:.1f} MB\n")
+    for stage, stage_peak, current in _stage_peaks:
+        out.write(f"Etapa {stage:<10} pico {stage_peak / 1024 / 1024:7.1f} MB   "
+                  f"ao final {current / 1024 / 1024:7.1f} MB\n")
+    out.write("\n-- Maiores alocações ao final\n")
+    for stat in snapshot.statistics('lineno')[:settings.get("memory_top", 10)]:
+        out.write(f"   {stat}\n")
+
+    with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+        f.write(out.getvalue())
+    logging.getLogger(__name__).info(f"Perfil de {name} salvo em {base}.prof / {base}.txt")
@@ -0,0 +1,31 @@
+import logging
+
+try:
+    import tiktoken
+except ImportError:  # Dependência opcional: sem ela usa estimativa por caracteres
+    tiktoken = None
+
+# Média aproximada de caracteres por token em português
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+
+def _get_encoding():
+    """Carrega o codificador do tiktoken uma única vez"""
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"tiktoken indisponível: {str(e)}")
+            _encoding = False
+    return _encoding or None
+
+def estimate_tokens(text: str) -> int:
+    """Estima quantidade de tokens de um texto"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)